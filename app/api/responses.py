@@ -0,0 +1,17 @@
+# app/api/responses.py
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+def json_response(adapter: TypeAdapter, content, status_code: int = 200) -> Response:
+    """
+    Serializes a response the service layer has already built and validated,
+    in one pass through pydantic-core.
+
+    A Response returned from a route is sent as-is, so FastAPI neither
+    re-validates the content against the route's response_model nor runs it
+    through jsonable_encoder. Keep response_model on the route for the
+    OpenAPI schema.
+    """
+    return Response(adapter.dump_json(content), status_code=status_code, media_type="application/json")
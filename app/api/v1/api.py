@@ -2,7 +2,7 @@
 
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import groups, candidates, voters, votes
+from app.api.v1.endpoints import groups, candidates, voters, votes, ivr
 
 api_router = APIRouter()
 
@@ -10,4 +10,5 @@ api_router = APIRouter()
 api_router.include_router(groups.router, prefix="/groups", tags=["Groups"])
 api_router.include_router(candidates.router, prefix="/candidates", tags=["Candidates"])
 api_router.include_router(voters.router, prefix="/voters", tags=["Voters"])
-api_router.include_router(votes.router, prefix="/votes", tags=["Votes"])
\ No newline at end of file
+api_router.include_router(votes.router, prefix="/votes", tags=["Votes"])
+api_router.include_router(ivr.router, prefix="/ivr", tags=["IVR"])
@@ -1,22 +1,47 @@
 # app/api/v1/endpoints/candidates.py
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.api.responses import json_response
+from app.schemas.adapters import type_adapter
+from app.db.session import get_async_db, get_async_read_db
 from app.schemas.candidate import CandidateCreate, CandidateRead
+from app.schemas.page import Page
 from app.services import candidate_service
+from app.services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter()
 
 @router.post("/", response_model=CandidateRead, status_code=201)
-def create_new_candidate(
+async def create_new_candidate(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     candidate_in: CandidateCreate
 ):
     """
     Create a new candidate.
     """
-    candidate = candidate_service.create_candidate(db=db, candidate=candidate_in)
-    return candidate
\ No newline at end of file
+    candidate = await candidate_service.create_candidate_async(db=db, candidate=candidate_in)
+    return candidate
+
+
+@router.get("/", response_model=Page[CandidateRead])
+async def list_candidates(
+    *,
+    db: AsyncSession = Depends(get_async_read_db),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    groups_id: int | None = None
+):
+    """
+    List candidates, one page at a time, optionally only those of one group.
+    - Pass the returned `next_cursor` as `cursor` to get the next page.
+    """
+    try:
+        page = await candidate_service.list_candidates_async(
+            db=db, limit=limit, cursor=cursor, groups_id=groups_id
+        )
+        return json_response(type_adapter(Page[CandidateRead]), page)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -1,22 +1,44 @@
 # app/api/v1/endpoints/groups.py
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.api.responses import json_response
+from app.schemas.adapters import type_adapter
+from app.db.session import get_async_db, get_async_read_db
 from app.schemas.group import GroupCreate, GroupRead
+from app.schemas.page import Page
 from app.services import group_service
+from app.services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter()
 
 @router.post("/", response_model=GroupRead, status_code=201)
-def create_new_group(
+async def create_new_group(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     group_in: GroupCreate
 ):
     """
     Create a new group.
     """
-    group = group_service.create_group(db=db, group=group_in)
-    return group
\ No newline at end of file
+    group = await group_service.create_group_async(db=db, group=group_in)
+    return group
+
+
+@router.get("/", response_model=Page[GroupRead])
+async def list_groups(
+    *,
+    db: AsyncSession = Depends(get_async_read_db),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None
+):
+    """
+    List groups, one page at a time.
+    - Pass the returned `next_cursor` as `cursor` to get the next page.
+    """
+    try:
+        page = await group_service.list_groups_async(db=db, limit=limit, cursor=cursor)
+        return json_response(type_adapter(Page[GroupRead]), page)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
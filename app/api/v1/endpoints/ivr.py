@@ -0,0 +1,50 @@
+# app/api/v1/endpoints/ivr.py
+
+import asyncio
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.db.session import get_async_db
+from app.services import ivr_service, vote_service
+from app.services.cast_buffer import cast_buffer, CastBufferFull
+from app.services.idempotency import IdempotencyKeyReused, cast_key, cast_once
+
+router = APIRouter()
+
+
+@router.api_route("/{vote_id}/", methods=["GET", "POST"], response_class=PlainTextResponse)
+async def yemot_webhook(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    vote_id: int,
+    request: Request
+):
+    """
+    Yemot IVR webhook for one voting event; point an API extension at it.
+    - Without a choice, plays the candidate menu to a registered caller.
+    - With the pressed choice, casts the caller's ballot and says whether it was recorded.
+    - Yemot's retries of a cast are answered from the idempotency store by ApiCallId.
+    """
+    params = request.query_params
+    if request.method == "POST":
+        params = {**params, **await request.form()}
+    if params.get("hangup") == "yes":
+        return ""
+
+    step = await db.run_sync(
+        ivr_service.call_step, vote_id, params.get("ApiPhone"), params.get(ivr_service.CHOICE_PARAM)
+    )
+    if isinstance(step, str):
+        return step
+
+    async def cast():
+        if settings.CAST_BUFFER_ENABLED:
+            return await asyncio.wrap_future(cast_buffer.submit(vote_id, step.vote_cast))
+        return await vote_service.cast_vote_async(db=db, vote_id=vote_id, vote_cast=step.vote_cast)
+
+    try:
+        await cast_once(cast_key(vote_id, None, params.get("ApiCallId")), step.vote_cast, cast)
+    except (ValueError, CastBufferFull, IdempotencyKeyReused) as e:
+        return ivr_service.cast_reply(step, e)
+    return ivr_service.cast_reply(step)
@@ -1,32 +1,41 @@
 # app/api/v1/endpoints/voters.py
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
-from app.schemas.voter import VoterCreate, VoterRead
+from app.schemas.page import Page
+from app.schemas.voter import VoterCreate, VoterRead, ImportJobRead
 
-from app.db.session import get_db
+from app.api.responses import json_response
+from app.schemas.adapters import type_adapter
+from app.db.session import get_async_db, get_async_read_db
 from app.services import voter_service
+from app.services.import_jobs import import_jobs
+from app.services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter()
 
 
 @router.post("/", response_model=VoterRead, status_code=201)
-def create_new_voter(
+async def create_new_voter(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     voter_in: VoterCreate
 ):
     """
     Create a single new voter.
     """
     try:
-        voter = voter_service.create_voter(db=db, voter=voter_in)
+        voter = await voter_service.create_voter_async(db=db, voter=voter_in)
         return voter
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except IntegrityError:
-        # This error occurs if the phone number is a duplicate
-        # or if the groups_id does not exist.
-        db.rollback()
+        # This error occurs if the phone number is a duplicate (in any
+        # formatting; phones are stored normalized) or if the groups_id
+        # does not exist.
+        await db.rollback()
         raise HTTPException(
             status_code=409,
             detail="Voter could not be created. The phone number may already exist or the group ID is invalid.",
@@ -37,25 +46,59 @@ def create_new_voter(
 
 
 
-@router.post("/upload-csv/", status_code=201)
-def upload_voters_csv(
+@router.post("/upload-csv/", response_model=ImportJobRead, status_code=202)
+async def upload_voters_csv(
     *,
-    db: Session = Depends(get_db),
     csv_file: UploadFile = File(...)
 ):
     """
-    Create new voters from an uploaded CSV file.
+    Create new voters from an uploaded CSV file, in the background.
     CSV format: voter_name,voter_phone,groups_id
+
+    The upload is spooled to disk and queued as an import job; poll
+    /voters/import-jobs/{job_id} for progress and the final report. Rows whose
+    phone is already registered are skipped and malformed rows are rejected
+    without failing the rest of the file.
     """
     if not csv_file.filename.endswith(".csv"):
         raise HTTPException(status_code=400, detail="Invalid file type. Please upload a CSV.")
 
+    # Spooling copies the whole upload, so keep it off the event loop
+    return await run_in_threadpool(import_jobs.submit, csv_file.file, csv_file.filename)
+
+
+@router.get("/import-jobs/{job_id}", response_model=ImportJobRead)
+async def get_import_job(
+    *,
+    job_id: str
+):
+    """
+    Get the progress of a CSV import job: rows processed, throughput, ETA and errors.
+    """
     try:
-        # The service expects a file-like object with bytes
-        created_count = voter_service.bulk_create_voters_from_csv(db=db, csv_file=csv_file.file)
-        return {"message": f"Successfully created {created_count} voters."}
-    except IntegrityError as e:
-        # This can happen if a group_id doesn't exist or a phone number is duplicated
-        raise HTTPException(status_code=409, detail=f"Database integrity error: {e.orig}")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {str(e)}")
\ No newline at end of file
+        return import_jobs.get(job_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.get("/", response_model=Page[VoterRead])
+async def list_voters(
+    *,
+    db: AsyncSession = Depends(get_async_read_db),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    groups_id: int | None = None,
+    phone_prefix: str | None = None
+):
+    """
+    List voters, one page at a time.
+    - Optionally only voters of one group, and/or whose phone starts with `phone_prefix`.
+    - Pass the returned `next_cursor` as `cursor` to get the next page.
+    """
+    try:
+        page = await voter_service.list_voters_async(
+            db=db, limit=limit, cursor=cursor, groups_id=groups_id, phone_prefix=phone_prefix
+        )
+        return json_response(type_adapter(Page[VoterRead]), page)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
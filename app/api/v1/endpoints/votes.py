@@ -1,71 +1,216 @@
 # app/api/v1/endpoints/votes.py
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+import asyncio
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from app.db.session import get_db
+from app.api.responses import json_response
+from app.schemas.adapters import (
+    candidate_list_adapter, type_adapter, vote_result_adapter, vote_result_matrix_adapter,
+)
+from app.core.config import settings
+from app.db.session import SessionLocal, get_async_db, get_async_read_db
 from app.schemas.vote import (
     VoteEventCreate, VoteEventRead, VoteCast, VoteCastRead, VoteResult, VoteCombineRequest,
+    VoteResultMatrix, VoteCastBatch, VoteCastBatchResult,
 )
-from app.services import vote_service
+from app.services import ballot_export, vote_service
+from app.services.ballot_export import ExportFormat
+from app.services.cast_buffer import cast_buffer, CastBufferFull
+from app.services.idempotency import IdempotencyKeyReused, cast_key, cast_once
+from app.services.results_stream import results_broadcaster
 from app.schemas.candidate import CandidateRead
+from app.schemas.page import Page
+from app.services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter()
 
+_EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson",
+}
+
 @router.post("/", response_model=VoteEventRead, status_code=201)
-def create_new_vote_event(
+async def create_new_vote_event(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     vote_in: VoteEventCreate
 ):
     """
     Create a new voting event.
     """
     try:
-        vote_event = vote_service.create_vote_event(db=db, vote_event=vote_in)
+        vote_event = await vote_service.create_vote_event_async(db=db, vote_event=vote_in)
         return vote_event
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 
+@router.get("/", response_model=Page[VoteEventRead])
+async def list_vote_events(
+    *,
+    db: AsyncSession = Depends(get_async_read_db),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None
+):
+    """
+    List voting events, one page at a time.
+    - Pass the returned `next_cursor` as `cursor` to get the next page.
+    """
+    try:
+        page = await vote_service.list_vote_events_async(db=db, limit=limit, cursor=cursor)
+        return json_response(type_adapter(Page[VoteEventRead]), page)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.post("/{vote_id}/cast/", response_model=VoteCastRead)
-def cast_new_vote(
+async def cast_new_vote(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     vote_id: int,
-    vote_cast_in: VoteCast
+    vote_cast_in: VoteCast,
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key"),
+    call_id: str | None = Query(None, alias="ApiCallId")
 ):
     """
     Cast a vote in a specific voting event.
+
+    With CAST_BUFFER_ENABLED the cast is group-committed with other concurrent
+    casts; the response is still only sent once the ballot is committed.
+
+    Retries are safe with an `Idempotency-Key` header, or the IVR's `ApiCallId`:
+    a repeat gets the original response, and one sent while the original is
+    still running waits for it.
     """
+    async def cast():
+        if settings.CAST_BUFFER_ENABLED:
+            return await asyncio.wrap_future(cast_buffer.submit(vote_id, vote_cast_in))
+        return await vote_service.cast_vote_async(db=db, vote_id=vote_id, vote_cast=vote_cast_in)
+
     try:
-        vote_record = vote_service.cast_vote(db=db, vote_id=vote_id, vote_cast=vote_cast_in)
-        return vote_record
+        return await cast_once(cast_key(vote_id, idempotency_key, call_id), vote_cast_in, cast)
+    except IdempotencyKeyReused as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except CastBufferFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except ValueError as e:
         # This handles "Voter not found" or "already voted" errors
         raise HTTPException(status_code=400, detail=str(e))
 
 
 
+@router.post("/{vote_id}/cast/batch/", response_model=VoteCastBatchResult)
+async def cast_vote_batch(
+    *,
+    vote_id: int,
+    batch_in: VoteCastBatch
+):
+    """
+    Cast many ballots in a voting event at once (paper-ballot scans, IVR replays).
+    - Each item gets its own status: accepted, duplicate, unknown_voter or invalid.
+    - Accepted ballots are written in multi-row inserts and one transaction.
+    """
+    def cast_batch():
+        with SessionLocal() as db:
+            return vote_service.cast_vote_batch(db=db, vote_id=vote_id, casts=batch_in.items)
+
+    try:
+        # A large batch is seconds of CPU work, so keep it off the event loop
+        return await run_in_threadpool(cast_batch)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
 @router.get("/{vote_id}/results/", response_model=VoteResult)
-def get_results_for_event(
+async def get_results_for_event(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     vote_id: int,
 ):
     """
     Get the tallied results for a single voting event.
     """
     try:
-        return vote_service.get_vote_results(db=db, vote_id=vote_id)
+        result = await vote_service.get_vote_results_async(db=db, vote_id=vote_id)
+        return json_response(vote_result_adapter, result)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.get("/{vote_id}/results/stream")
+async def stream_results_for_event(
+    *,
+    db: AsyncSession = Depends(get_async_read_db),
+    vote_id: int,
+    group_id: int | None = None # Optional query parameter
+):
+    """
+    Stream live results for a voting event as Server-Sent Events.
+    - The first `snapshot` event carries the full VoteResult.
+    - Each `delta` event lists only the candidates whose counts changed.
+    - Optionally filter the results by a group_id.
+    """
+    try:
+        initial = await vote_service.get_vote_results_async(db=db, vote_id=vote_id, group_id=group_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    # The stream outlives the request handler; give the connection back now
+    await db.close()
+
+    async def events():
+        async for message in results_broadcaster.subscribe((vote_id, group_id or None), initial):
+            if message is None:
+                yield ": keep-alive\n\n"
+            else:
+                event = "snapshot" if isinstance(message, VoteResult) else "delta"
+                yield f"event: {event}\ndata: {message.model_dump_json()}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/{vote_id}/ballots.{export_format}")
+async def export_ballots_for_event(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    vote_id: int,
+    export_format: ExportFormat,
+    gzip: bool = False
+):
+    """
+    Export every ballot of a voting event for auditing, as a streamed download.
+    - `ballots.csv` has a header row; `ballots.jsonl` has one JSON object per line.
+    - Each ballot carries the voter's name, phone and group, and the candidate's name.
+    - With `gzip=true` the file is gzip-compressed.
+    """
+    try:
+        chunks = await ballot_export.export_ballots_async(
+            db=db, vote_id=vote_id, export_format=export_format, compress=gzip
+        )
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    # The export reads on its own connection; give this one back now
+    await db.close()
+
+    filename = f"ballots-{vote_id}.{export_format}" + (".gz" if gzip else "")
+    media_type = "application/gzip" if gzip else _EXPORT_MEDIA_TYPES[export_format]
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @router.get("/{vote_id}/results/by-group/{group_id}/", response_model=VoteResult)
-def get_results_for_event_by_group(
+async def get_results_for_event_by_group(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     vote_id: int,
     group_id: int
 ):
@@ -74,15 +219,50 @@ def get_results_for_event_by_group(
     """
     try:
         # We reuse the same service function
-        return vote_service.get_vote_results(db=db, vote_id=vote_id, group_id=group_id)
+        result = await vote_service.get_vote_results_async(db=db, vote_id=vote_id, group_id=group_id)
+        return json_response(vote_result_adapter, result)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 
+@router.get("/{vote_id}/results/matrix/", response_model=VoteResultMatrix)
+async def get_results_matrix_for_event(
+    *,
+    db: AsyncSession = Depends(get_async_read_db),
+    vote_id: int,
+):
+    """
+    Get the results of a voting event for every group at once.
+    - Each row is a candidate, each column a group, with row and column totals.
+    """
+    try:
+        matrix = await vote_service.get_results_matrix_async(db=db, vote_ids=[vote_id])
+        return json_response(vote_result_matrix_adapter, matrix)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.post("/results/matrix/", response_model=VoteResultMatrix)
+async def get_combined_results_matrix(
+    *,
+    db: AsyncSession = Depends(get_async_read_db),
+    payload: VoteCombineRequest,
+):
+    """
+    Get the candidates x groups results of several vote events combined.
+    - Unlike /results/combine/, the events may have different candidates.
+    """
+    try:
+        matrix = await vote_service.get_results_matrix_async(db=db, vote_ids=payload.vote_ids)
+        return json_response(vote_result_matrix_adapter, matrix)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.post("/results/combine/", response_model=VoteResult)
-def get_combined_results(
+async def get_combined_results(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     payload: VoteCombineRequest,
     group_id: int | None = None # Optional query parameter
 ):
@@ -92,9 +272,10 @@ def get_combined_results(
     - Optionally filter the combined results by a group_id.
     """
     try:
-        return vote_service.combine_vote_results(
+        result = await vote_service.combine_vote_results_async(
             db=db, vote_ids=payload.vote_ids, group_id=group_id
         )
+        return json_response(vote_result_adapter, result)
     except ValueError as e:
         # This will catch validation errors like mismatched candidates
         raise HTTPException(status_code=400, detail=str(e))
@@ -102,16 +283,16 @@ def get_combined_results(
 
 
 @router.get("/{vote_id}/candidates/", response_model=List[CandidateRead])
-def get_candidates_in_event(
+async def get_candidates_in_event(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     vote_id: int
 ):
     """
     Get a list of all candidates participating in a specific vote event.
     """
     try:
-        candidates = vote_service.get_candidates_for_vote(db=db, vote_id=vote_id)
-        return candidates
+        candidates = await vote_service.get_candidates_for_vote_async(db=db, vote_id=vote_id)
+        return json_response(candidate_list_adapter, candidates)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
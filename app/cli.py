@@ -0,0 +1,41 @@
+# app/cli.py
+
+"""
+Maintenance commands.
+
+Usage:
+    python -m app.cli rebuild-tallies [--vote-id ID]
+"""
+
+import argparse
+
+from app.db.session import SessionLocal
+from app.services import tally_service
+
+
+def rebuild_tallies(args: argparse.Namespace) -> None:
+    db = SessionLocal()
+    try:
+        written = tally_service.rebuild_vote_tallies(db, vote_id=args.vote_id)
+    finally:
+        db.close()
+    scope = f"vote {args.vote_id}" if args.vote_id is not None else "all votes"
+    print(f"Rebuilt {written} tally rows for {scope}.")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = commands.add_parser(
+        "rebuild-tallies", help="Recompute vote_tallies from voters_votes."
+    )
+    rebuild.add_argument("--vote-id", type=int, default=None, help="Only rebuild this vote event.")
+    rebuild.set_defaults(handler=rebuild_tallies)
+
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
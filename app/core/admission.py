@@ -0,0 +1,145 @@
+# app/core/admission.py
+
+import asyncio
+import re
+import time
+from collections import deque
+
+from starlette.responses import JSONResponse
+
+from app.core import metrics
+
+CAST_LANE = "cast"
+GENERAL_LANE = "general"
+
+_CAST_PATH = re.compile(r"^/api/v1/votes/[^/]+/cast/(batch/)?$")
+# Every step of an IVR call is part of casting
+_IVR_PATH = re.compile(r"^/api/v1/ivr/")
+# Live results streams and ballot exports stay open for as long as the client
+# keeps reading; they would hold a slot the whole time
+_UNLIMITED_PATH = re.compile(r"/(results/stream|ballots\.[a-z]+)/?$")
+
+
+def lane_of(method: str, path: str) -> str | None:
+    """
+    The lane a request is admitted through, or None if it isn't limited.
+    """
+    if not path.startswith("/api/v1/") or _UNLIMITED_PATH.search(path):
+        return None
+    if (method == "POST" and _CAST_PATH.match(path)) or _IVR_PATH.match(path):
+        return CAST_LANE
+    return GENERAL_LANE
+
+
+class Lane:
+    """
+    At most `limit` requests at a time, and at most `queue_size` waiting for
+    one of them to finish, each for at most `max_wait` seconds.
+
+    Only used from the event loop, so no locking is needed. Slots are handed
+    to waiters in arrival order.
+    """
+
+    def __init__(self, name: str, limit: int, queue_size: int, max_wait: float):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.max_wait = max_wait
+        self.active = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> str | None:
+        """
+        Takes a slot, waiting if need be. Returns None once admitted, or why
+        the request was shed: "queue_full" or "timeout".
+        """
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return None
+        if len(self._waiters) >= self.queue_size:
+            return "queue_full"
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.max_wait)
+        except TimeoutError:
+            if waiter.done():
+                # The slot was handed over just as the wait ran out
+                return None
+            waiter.cancel()
+            self._remove(waiter)
+            return "timeout"
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                waiter.cancel()
+                self._remove(waiter)
+            raise
+        finally:
+            metrics.ADMISSION_WAIT.labels(self.name).observe(time.perf_counter() - started)
+        return None
+
+    def release(self) -> None:
+        # Hand the slot straight to the next waiter, so a new arrival can't take it first
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def _remove(self, waiter: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+
+class AdmissionMiddleware:
+    """
+    Sheds load before it reaches the database pool.
+
+    Casts and IVR calls go through one lane and all other /api/v1 traffic
+    (results, listings, admin) through another, so a results refresh storm
+    can't crowd out casting and a cast spike can't lock out the dashboards.
+    A request that finds its lane full, or waits longer than the lane allows,
+    gets an immediate 503 with Retry-After instead of queueing until every
+    request times out together. Long-lived streams (live results, ballot
+    exports) are not limited.
+    """
+
+    def __init__(self, app, lanes: dict[str, Lane], retry_after_seconds: int):
+        self.app = app
+        self.lanes = lanes
+        self.retry_after = str(retry_after_seconds)
+        metrics.instrument_admission(lanes.values())
+
+    async def __call__(self, scope, receive, send):
+        lane = None
+        if scope["type"] == "http":
+            lane = self.lanes.get(lane_of(scope["method"], scope["path"]))
+        if lane is None:
+            await self.app(scope, receive, send)
+            return
+
+        shed = await lane.acquire()
+        if shed is not None:
+            metrics.ADMISSION_SHED.labels(lane.name, shed).inc()
+            response = JSONResponse(
+                {"detail": "The server is busy, please retry shortly"},
+                status_code=503,
+                headers={"Retry-After": self.retry_after},
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            lane.release()
@@ -1,5 +1,5 @@
 # app/core/config.py
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from dotenv import load_dotenv
 
 
@@ -14,11 +14,83 @@ class Settings(BaseSettings):
     
     Pydantic's BaseSettings will automatically read from the environment variables.
     Since we already loaded the .env file, Pydantic will find the variables.
+    Optional settings are unset with the value "null", e.g. SLOW_QUERY_LOG_MS=null.
     """
+    model_config = SettingsConfigDict(env_parse_none_str="null")
+
     DATABASE_URL: str
+    # Read replicas for the results and listing endpoints, as a JSON list of
+    # URLs, e.g. DATABASE_REPLICA_URLS='["postgresql://replica-1/vote"]'.
+    # Unreachable replicas are skipped for DATABASE_REPLICA_COOLDOWN_SECONDS.
+    # Results read from a replica are never put in the in-process results
+    # cache, so a replica's lag isn't served on after the replica catches up.
+    DATABASE_REPLICA_URLS: list[str] = []
+    DATABASE_REPLICA_COOLDOWN_SECONDS: float = 5.0
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Group-commit ingestion for /votes/{vote_id}/cast/.
+    # When enabled, casts are queued and written in multi-row batches that are
+    # flushed every CAST_BUFFER_MAX_LATENCY_MS or CAST_BUFFER_BATCH_SIZE rows.
+    CAST_BUFFER_ENABLED: bool = False
+    CAST_BUFFER_BATCH_SIZE: int = 500
+    CAST_BUFFER_MAX_LATENCY_MS: int = 10
+    CAST_BUFFER_QUEUE_DEPTH: int = 10000
+
+    # Number of counter rows each (vote, group, candidate) tally is split across
+    VOTE_TALLY_SLOTS: int = 8
+
+    # Idempotent casts: a repeat of /votes/{vote_id}/cast/ with the same
+    # Idempotency-Key header (or IVR ApiCallId) within the TTL gets the original
+    # response without touching the database.
+    IDEMPOTENCY_TTL_SECONDS: float = 600.0
+    IDEMPOTENCY_MAX_KEYS: int = 100_000
+
+    # In-process results cache. Entries are dropped as soon as a ballot for one
+    # of their events is cast in this process; the TTL bounds staleness from
+    # ballots cast by other worker processes. Set it to null (no limit) only
+    # when a single worker process serves every request.
+    RESULTS_CACHE_MAX_ENTRIES: int = 1024
+    RESULTS_CACHE_TTL_SECONDS: float | None = 2.0
+
+    # Live results streams: updates are coalesced to at most one per interval,
+    # and results are re-read at least this often to catch other workers' ballots.
+    RESULTS_STREAM_INTERVAL_MS: int = 500
+    RESULTS_STREAM_REFRESH_SECONDS: float = 5.0
+
+    # Background CSV voter imports. Each running job holds one connection of the
+    # sync engine's pool, so the cap also bounds what imports can take from casting.
+    IMPORT_MAX_CONCURRENT_JOBS: int = 2
+    IMPORT_SPOOL_DIR: str | None = None  # defaults to the system temp directory
+    IMPORT_JOB_HISTORY: int = 100  # finished jobs kept for status polling
+
+    # In-process phone -> voter index used by casts. Warming reads the whole
+    # voter roll; without warm-up at startup the first cast pays for it.
+    PHONE_INDEX_WARM_ON_STARTUP: bool = True
+    PHONE_INDEX_OVERLAY_LIMIT: int = 10000  # min. new voters buffered before a merge
+
+    # Per-route latency and per-request SQL metrics (GET /metrics). The engine
+    # and pool metrics and the ballot counters are always collected.
+    METRICS_ENABLED: bool = True
+
+    # Admission control for /api/v1. Casts and all other requests each have a
+    # lane of at most CONCURRENCY running requests and QUEUE waiting ones; a
+    # request that finds the queue full or waits ADMISSION_MAX_WAIT_MS gets a
+    # 503 with Retry-After. Keep the cast concurrency near the DB pool size.
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_CAST_CONCURRENCY: int = 32
+    ADMISSION_CAST_QUEUE: int = 256
+    ADMISSION_GENERAL_CONCURRENCY: int = 16
+    ADMISSION_GENERAL_QUEUE: int = 64
+    ADMISSION_MAX_WAIT_MS: int = 500
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
+
+    # Slow-query log (unset = off). Statements slower than the threshold are
+    # logged with their parameters, caller and request; the plans of the first
+    # SLOW_QUERY_EXPLAIN_LIMIT occurrences of each statement are logged too.
+    SLOW_QUERY_LOG_MS: float | None = None
+    SLOW_QUERY_EXPLAIN_LIMIT: int = 3
+
 # Create a single, globally accessible instance of the settings.
 settings = Settings()
\ No newline at end of file
@@ -1,7 +1,11 @@
 # app/core/logging_config.py
 import logging
+import logging.config
 from typing import Any
 
+# Parent of every logger returned by get_logger, and the one LOGGING_CONFIG sets up
+APP_LOGGER_NAME = "yemot_vote"
+
 # This is the configuration dictionary for Python's logging module.
 LOGGING_CONFIG: dict[str, Any] = {
     "version": 1,
@@ -27,7 +31,7 @@ LOGGING_CONFIG: dict[str, Any] = {
     
     # Define the loggers themselves
     "loggers": {
-        "hapitron_riddle_api": { # The name of our application's logger
+        APP_LOGGER_NAME: { # The name of our application's logger
             "handlers": ["default"],
             "level": "INFO", # The minimum level of message to handle
             "propagate": False,
@@ -44,6 +48,14 @@ LOGGING_CONFIG: dict[str, Any] = {
     },
 }
 
+def configure_logging() -> None:
+    """
+    Applies LOGGING_CONFIG. Called once when the app is created, since the
+    server is started without a --log-config of its own.
+    """
+    logging.config.dictConfig(LOGGING_CONFIG)
+
+
 # A simple function to get our application's logger
 def get_logger(name: str) -> logging.Logger:
     """
@@ -55,4 +67,4 @@ def get_logger(name: str) -> logging.Logger:
     Returns:
         logging.Logger: The logger instance.
     """
-    return logging.getLogger(f"yemoy-vote.{name}")
\ No newline at end of file
+    return logging.getLogger(f"{APP_LOGGER_NAME}.{name}")
@@ -0,0 +1,307 @@
+# app/core/metrics.py
+
+import os
+import time
+from contextvars import ContextVar
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+)
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.multiprocess import MultiProcessCollector
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+# --- Metrics ---
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time until the response headers were sent, per route template.",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DB_STATEMENTS = Histogram(
+    "http_request_db_statements",
+    "SQL statements executed while serving one request.",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50, 100, 250),
+)
+HTTP_REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds",
+    "Time spent executing SQL statements while serving one request.",
+    ["method", "route"],
+)
+DB_STATEMENT_DURATION = Histogram(
+    "db_statement_duration_seconds",
+    "SQL statement execution time, by the statement's leading keyword.",
+    ["operation"],
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection.",
+    ["engine"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+BALLOTS_CAST = Counter(
+    "ballots_cast_total",
+    "Ballots stored, per vote event.",
+    ["vote_id"],
+)
+BALLOTS_REJECTED = Counter(
+    "ballots_rejected_total",
+    "Casts that stored nothing, by reason.",
+    ["reason"],
+)
+ADMISSION_SHED = Counter(
+    "admission_shed_total",
+    "Requests refused with a 503 by admission control, by lane and reason.",
+    ["lane", "reason"],
+)
+ADMISSION_WAIT = Histogram(
+    "admission_wait_seconds",
+    "Time queued for admission, for requests that had to wait.",
+    ["lane"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+IDEMPOTENT_REPLAYS = Counter(
+    "idempotent_replays_total",
+    "Repeated casts answered without running again: replayed or coalesced.",
+    ["outcome"],
+)
+
+# Label for requests that didn't match any route, so stray paths can't grow
+# the number of series
+UNMATCHED_ROUTE = "unmatched"
+
+
+# --- Per-request SQL accounting ---
+
+class _RequestStats:
+    __slots__ = ("statements", "seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.seconds = 0.0
+
+
+# Set by MetricsMiddleware for the duration of a request. Threadpool calls
+# and AsyncSession greenlets run in a copy of the request's context, so their
+# statements are counted against it; background work isn't counted.
+_request_stats: ContextVar[_RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    DB_STATEMENT_DURATION.labels(_operation(statement)).observe(elapsed)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.seconds += elapsed
+
+
+def _handle_error(exception_context):
+    # after_cursor_execute isn't called for a failed statement
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start_time"):
+        conn.info["query_start_time"].pop()
+
+
+def _operation(statement: str) -> str:
+    keyword = statement[:16].lstrip().split(None, 1)
+    return keyword[0].upper() if keyword else "OTHER"
+
+
+# --- Connection pools ---
+
+_timed_pool_classes: dict[tuple[type, str], type] = {}
+
+
+def _timed_pool_class(pool_class: type[QueuePool], engine_name: str) -> type[QueuePool]:
+    key = (pool_class, engine_name)
+    if key not in _timed_pool_classes:
+        wait = DB_POOL_CHECKOUT_WAIT.labels(engine_name)
+
+        class TimedPool(pool_class):
+            # The pool has no "before checkout" event, so the wait is measured
+            # around the call that blocks until a connection is free
+            def _do_get(self):
+                start = time.perf_counter()
+                try:
+                    return super()._do_get()
+                finally:
+                    wait.observe(time.perf_counter() - start)
+
+        TimedPool.__name__ = f"Timed{pool_class.__name__}"
+        _timed_pool_classes[key] = TimedPool
+    return _timed_pool_classes[key]
+
+
+class _PoolCollector:
+    """
+    Reports the size and usage of each instrumented engine's pool at scrape time.
+    """
+
+    def __init__(self):
+        self._engines: dict[str, Engine] = {}
+
+    def add(self, name: str, engine: Engine) -> None:
+        self._engines[name] = engine
+
+    def collect(self):
+        size = GaugeMetricFamily("db_pool_size", "Connections the pool keeps open.", labels=["engine"])
+        checked_out = GaugeMetricFamily(
+            "db_pool_checked_out", "Connections currently in use.", labels=["engine"]
+        )
+        overflow = GaugeMetricFamily(
+            "db_pool_overflow", "Connections open beyond the pool size.", labels=["engine"]
+        )
+        for name, engine in self._engines.items():
+            pool = engine.pool
+            if isinstance(pool, QueuePool):
+                size.add_metric([name], pool.size())
+                checked_out.add_metric([name], pool.checkedout())
+                overflow.add_metric([name], max(pool.overflow(), 0))
+        yield size
+        yield checked_out
+        yield overflow
+
+
+_pool_collector = _PoolCollector()
+REGISTRY.register(_pool_collector)
+
+
+class _AdmissionCollector:
+    """
+    Reports the requests running and queued in each admission lane at scrape time.
+    """
+
+    def __init__(self):
+        self._lanes = {}
+
+    def add(self, lane) -> None:
+        self._lanes[lane.name] = lane
+
+    def collect(self):
+        in_flight = GaugeMetricFamily(
+            "admission_in_flight", "Requests admitted and not yet finished.", labels=["lane"]
+        )
+        queue_depth = GaugeMetricFamily(
+            "admission_queue_depth", "Requests waiting for admission.", labels=["lane"]
+        )
+        for name, lane in self._lanes.items():
+            in_flight.add_metric([name], lane.active)
+            queue_depth.add_metric([name], lane.waiting)
+        yield in_flight
+        yield queue_depth
+
+
+_admission_collector = _AdmissionCollector()
+REGISTRY.register(_admission_collector)
+
+
+def instrument_admission(lanes) -> None:
+    """
+    Reports the in-flight and queued requests of these admission lanes.
+    """
+    for lane in lanes:
+        _admission_collector.add(lane)
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """
+    Times the engine's SQL statements and pool checkouts. For an AsyncEngine,
+    pass its `sync_engine`.
+
+    The cost per statement is two clock reads and a histogram update, small
+    enough to leave on in production.
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+    pool = engine.pool
+    if isinstance(pool, QueuePool):
+        # Swapping the class keeps it across dispose(), which recreates the
+        # pool with type(pool)
+        pool.__class__ = _timed_pool_class(type(pool), name)
+        _pool_collector.add(name, engine)
+
+
+# --- ASGI middleware and exposition ---
+
+class MetricsMiddleware:
+    """
+    Records latency, and SQL statements and time, per route template.
+
+    A plain ASGI middleware rather than BaseHTTPMiddleware, so streamed
+    responses pass through untouched. Latency is measured until the response
+    headers are sent; for a streamed export or a live results stream that is
+    the time to first byte, not the length of the stream.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = _RequestStats()
+        token = _request_stats.set(stats)
+        start = time.perf_counter()
+        method = scope["method"]
+
+        started = False
+
+        def observe_latency(status: int) -> None:
+            HTTP_REQUEST_DURATION.labels(method, _route_of(scope), str(status)).observe(
+                time.perf_counter() - start
+            )
+
+        async def send_wrapper(message):
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+                observe_latency(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            # The 500 is sent by Starlette's outermost error middleware
+            if not started:
+                observe_latency(500)
+            raise
+        finally:
+            _request_stats.reset(token)
+            route = _route_of(scope)
+            HTTP_REQUEST_DB_STATEMENTS.labels(method, route).observe(stats.statements)
+            HTTP_REQUEST_DB_SECONDS.labels(method, route).observe(stats.seconds)
+
+
+def _route_of(scope) -> str:
+    # FastAPI's router stores the matched route in the scope
+    route = scope.get("route")
+    return getattr(route, "path_format", None) or UNMATCHED_ROUTE
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """
+    Returns the exposition payload and its content type. Under a multi-process
+    server with PROMETHEUS_MULTIPROC_DIR set, the metrics of all workers are
+    aggregated.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
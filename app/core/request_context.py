@@ -0,0 +1,27 @@
+# app/core/request_context.py
+
+from contextvars import ContextVar
+
+# "METHOD /path" of the request being served, for log lines written below the
+# API layer. Threadpool calls and AsyncSession greenlets see the request's
+# value; background work sees None.
+current_request: ContextVar[str | None] = ContextVar("current_request", default=None)
+
+
+class RequestContextMiddleware:
+    """
+    Sets `current_request` for the duration of each HTTP request.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = current_request.set(f"{scope['method']} {scope['path']}")
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_request.reset(token)
@@ -0,0 +1,35 @@
+# app/db/dialects.py
+
+import json
+
+from sqlalchemy import Integer, any_, bindparam, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+# insert() constructs of the backends that support INSERT ... ON CONFLICT
+_UPSERT_INSERT_BY_DIALECT = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def upsert_insert(dialect_name: str):
+    """
+    Returns the dialect's insert() construct, which has on_conflict_do_nothing()
+    and on_conflict_do_update(), or None if the backend has no ON CONFLICT.
+    """
+    return _UPSERT_INSERT_BY_DIALECT.get(dialect_name)
+
+
+def in_id_list(dialect_name: str, column, ids: list[int]):
+    """
+    Builds `column IN ids` with the list bound as a single parameter, so the
+    statement text doesn't grow with the list and large lists stay under the
+    bound-parameter limits: `= ANY(array)` on PostgreSQL, json_each() on
+    SQLite, and a regular expanding IN elsewhere.
+    """
+    if dialect_name == "postgresql":
+        return column == any_(bindparam(None, list(ids), type_=postgresql.ARRAY(Integer)))
+    if dialect_name == "sqlite":
+        values = func.json_each(json.dumps(list(ids))).table_valued("value")
+        return column.in_(select(values.c.value))
+    return column.in_(ids)
@@ -0,0 +1,98 @@
+# app/db/replicas.py
+
+import itertools
+import threading
+import time
+from typing import Callable
+
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.core.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Request header that sends a request's reads to the primary, so a client
+# sees its own writes immediately
+READ_YOUR_WRITES_HEADER = "X-Read-Your-Writes"
+
+_TRUTHY = frozenset({"1", "true", "yes"})
+
+
+def wants_read_your_writes(header_value: str | None) -> bool:
+    return header_value is not None and header_value.strip().lower() in _TRUTHY
+
+
+# Session.info key set on sessions opened on a replica. What they read may lag
+# the primary, so it must not be cached as the current state.
+REPLICA_SESSION_INFO = "reads_replica"
+
+
+def reads_replica(db) -> bool:
+    """
+    Whether a (sync or async) session reads from a replica.
+    """
+    return db.info.get(REPLICA_SESSION_INFO, False)
+
+
+class ReplicaRouter:
+    """
+    Picks the read replica for read-only requests.
+
+    Replicas are taken in round-robin order. A replica that can't hand out a
+    connection is skipped for `cooldown_seconds` and the next one is tried;
+    when none is available the session is opened on the primary. Only opening
+    the connection is retried: a replica failing mid-query fails that request.
+    Sessions opened on a replica are marked (see reads_replica).
+    """
+
+    def __init__(self, engines: list[AsyncEngine], cooldown_seconds: float = 5.0):
+        self._engines = list(engines)
+        self._cooldown = cooldown_seconds
+        self._turn = itertools.count()
+        self._down_until: dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._engines)
+
+    def available(self) -> list[AsyncEngine]:
+        """
+        The replicas not in cool-down, starting with the one whose turn it is.
+        """
+        if not self._engines:
+            return []
+        start = next(self._turn) % len(self._engines)
+        now = time.monotonic()
+        ordered = self._engines[start:] + self._engines[:start]
+        return [engine for engine in ordered if self._down_until.get(id(engine), 0) <= now]
+
+    def mark_down(self, engine: AsyncEngine) -> None:
+        with self._lock:
+            self._down_until[id(engine)] = time.monotonic() + self._cooldown
+
+    async def open_session(self, session_factory: Callable[..., AsyncSession]) -> AsyncSession:
+        """
+        Returns a session with a connection already checked out from a
+        replica, or a session on the primary if no replica is reachable.
+        """
+        for engine in self.available():
+            session = session_factory(bind=engine)
+            try:
+                await session.connection()
+                session.info[REPLICA_SESSION_INFO] = True
+                return session
+            except (DBAPIError, OSError):
+                await session.close()
+                self.mark_down(engine)
+                logger.warning(
+                    "Read replica %s is unavailable; skipping it for %.0fs",
+                    engine.url.render_as_string(hide_password=True),
+                    self._cooldown,
+                    exc_info=True,
+                )
+        return session_factory()
+
+    async def dispose(self) -> None:
+        for engine in self._engines:
+            await engine.dispose()
@@ -1,15 +1,66 @@
 # app/db/session.py
 
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.metrics import instrument_engine
+from app.db.replicas import READ_YOUR_WRITES_HEADER, ReplicaRouter, wants_read_your_writes
+from app.db.slow_query_log import SlowQueryLog
 
 # This part remains the same. It sets up the connection engine.
 engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+instrument_engine(engine, "sync")
 
 # This also remains the same. It's our session factory.
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async drivers for the database backends we run on
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+psycopg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def make_async_url(url: str) -> str:
+    """
+    Maps a DATABASE_URL onto the async driver of the same backend,
+    e.g. postgresql:// -> postgresql+psycopg:// and sqlite:// -> sqlite+aiosqlite://.
+    """
+    parsed = make_url(url)
+    driver = _ASYNC_DRIVERS.get(parsed.get_backend_name(), parsed.drivername)
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+# The request path runs on the async engine, so in-flight requests wait on the
+# event loop instead of each holding a threadpool slot. The sync engine above
+# stays for background work (cast buffer flusher, CLI commands).
+async_engine = create_async_engine(make_async_url(settings.DATABASE_URL), pool_pre_ping=True)
+instrument_engine(async_engine.sync_engine, "async")
+
+# Read-only endpoints are served from these when configured (get_async_read_db)
+replica_engines = [
+    create_async_engine(make_async_url(url), pool_pre_ping=True)
+    for url in settings.DATABASE_REPLICA_URLS
+]
+for number, replica_engine in enumerate(replica_engines):
+    instrument_engine(replica_engine.sync_engine, f"replica-{number}")
+replica_router = ReplicaRouter(replica_engines, settings.DATABASE_REPLICA_COOLDOWN_SECONDS)
+
+if settings.SLOW_QUERY_LOG_MS is not None:
+    slow_query_log = SlowQueryLog(settings.SLOW_QUERY_LOG_MS, settings.SLOW_QUERY_EXPLAIN_LIMIT)
+    slow_query_log.install(engine)
+    for logged_engine in (async_engine, *replica_engines):
+        slow_query_log.install(logged_engine.sync_engine)
+
+# expire_on_commit=False: returned ORM objects are read after the commit,
+# outside of any greenlet, so they must not need a reload.
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
 # This dependency is perfect. We'll use it in our endpoints later.
 def get_db():
     """
@@ -19,4 +70,32 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    """
+    FastAPI dependency to provide an async database session per request.
+
+    The services' *_async functions behave like their sync counterparts: each
+    runs the sync function on the AsyncSession's underlying Session through
+    run_sync, so SQL I/O happens on the event loop and both APIs share one
+    implementation.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db(request: Request):
+    """
+    FastAPI dependency for read-only endpoints: an async session on a read
+    replica, round-robin, falling back to the primary when none is reachable
+    or configured. Requests sent with `X-Read-Your-Writes: true` read
+    from the primary, so they see writes that haven't replicated yet.
+    """
+    if wants_read_your_writes(request.headers.get(READ_YOUR_WRITES_HEADER)):
+        db = AsyncSessionLocal()
+    else:
+        db = await replica_router.open_session(AsyncSessionLocal)
+    async with db:
+        yield db
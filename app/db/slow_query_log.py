@@ -0,0 +1,154 @@
+# app/db/slow_query_log.py
+
+import hashlib
+import re
+import sys
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.logging_config import get_logger
+from app.core.request_context import current_request
+
+logger = get_logger(__name__)
+
+# Plan-only EXPLAIN per backend; none of them runs the statement
+_EXPLAIN_PREFIX = {
+    "postgresql": "EXPLAIN (ANALYZE off) ",
+    "sqlite": "EXPLAIN QUERY PLAN ",
+}
+
+# Statements EXPLAIN accepts
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+# Services whose functions are reported as the caller of a statement
+_SERVICE_PACKAGE = "app.services."
+
+# Longest repr of the bound parameters that is logged
+_MAX_PARAMETERS_LENGTH = 2000
+
+_PLACEHOLDERS = re.compile(r"%\(\w+\)s|\$\d+|:\w+|\?|%s")
+_PLACEHOLDER_LISTS = re.compile(r"\?(?:\s*,\s*\?)+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """
+    Identifies a statement independently of its bound values, the length of
+    its expanded IN lists and its whitespace.
+    """
+    normalized = _PLACEHOLDERS.sub("?", statement)
+    normalized = _PLACEHOLDER_LISTS.sub("?", normalized)
+    normalized = _WHITESPACE.sub(" ", normalized).strip()
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:12]
+
+
+def _calling_service() -> str | None:
+    # Outermost service function on the stack (the one the endpoint called),
+    # and the innermost one (which issued the statement) if it is another
+    outer = inner = None
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith(_SERVICE_PACKAGE):
+            outer = f"{module.rsplit('.', 1)[-1]}.{frame.f_code.co_name}"
+            inner = inner or outer
+        frame = frame.f_back
+    if outer is None or outer == inner:
+        return outer
+    return f"{outer} (via {inner})"
+
+
+class SlowQueryLog:
+    """
+    Logs statements slower than a threshold, with their bound parameters, the
+    calling service function and the request being served.
+
+    For the first `explain_limit` slow occurrences of each statement
+    fingerprint, the plan is captured with a plan-only EXPLAIN on the same
+    connection and logged too, so a plan regression can be seen without
+    reproducing the load. On PostgreSQL the EXPLAIN runs inside a savepoint,
+    so a failure can't abort the caller's transaction.
+
+    Statements under the threshold cost two clock reads.
+    """
+
+    def __init__(self, threshold_ms: float, explain_limit: int = 3):
+        self.threshold = threshold_ms / 1000
+        self.explain_limit = explain_limit
+        self._explained: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def install(self, engine: Engine) -> None:
+        """
+        Hooks the log into an engine. For an AsyncEngine, pass its `sync_engine`.
+        """
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    @staticmethod
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._slow_query_start = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._slow_query_start
+        if elapsed < self.threshold:
+            return
+
+        key = fingerprint(statement)
+        parameters_repr = repr(parameters)
+        if len(parameters_repr) > _MAX_PARAMETERS_LENGTH:
+            parameters_repr = parameters_repr[:_MAX_PARAMETERS_LENGTH] + "..."
+        logger.warning(
+            "Slow query %s (%.1f ms) in %s during %s: %s -- parameters: %s",
+            key,
+            elapsed * 1000,
+            _calling_service() or "-",
+            current_request.get() or "-",
+            statement,
+            parameters_repr,
+        )
+
+        if not executemany and self._should_explain(key, conn.dialect.name, statement):
+            plan = self._explain(conn, statement, parameters)
+            if plan is not None:
+                logger.warning("Plan of slow query %s:\n%s", key, plan)
+
+    def _should_explain(self, key: str, dialect_name: str, statement: str) -> bool:
+        if dialect_name not in _EXPLAIN_PREFIX:
+            return False
+        if not statement.lstrip()[:6].upper().startswith(_EXPLAINABLE):
+            return False
+        with self._lock:
+            count = self._explained.get(key, 0)
+            if count >= self.explain_limit:
+                return False
+            self._explained[key] = count + 1
+        return True
+
+    @staticmethod
+    def _explain(conn, statement: str, parameters) -> str | None:
+        # On the DBAPI connection, so the EXPLAIN doesn't go through these events
+        dialect_name = conn.dialect.name
+        dbapi_connection = conn.connection.dbapi_connection
+        savepoint = dialect_name == "postgresql" and not getattr(dbapi_connection, "autocommit", False)
+        cursor = dbapi_connection.cursor()
+        try:
+            if savepoint:
+                cursor.execute("SAVEPOINT slow_query_explain")
+            try:
+                cursor.execute(_EXPLAIN_PREFIX[dialect_name] + statement, parameters)
+                rows = cursor.fetchall()
+            except Exception:
+                if savepoint:
+                    cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+                logger.exception("Couldn't explain slow query")
+                return None
+            finally:
+                if savepoint:
+                    cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+        finally:
+            cursor.close()
+        return "\n".join(" | ".join(str(value) for value in row) for row in rows)
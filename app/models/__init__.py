@@ -6,4 +6,5 @@ from .group import Group
 from .candidate import Candidate
 from .voter import Voter
 from .vote import Vote
-from .voter_vote import VoterVote
\ No newline at end of file
+from .voter_vote import VoterVote
+from .vote_tally import VoteTally
\ No newline at end of file
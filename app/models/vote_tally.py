@@ -0,0 +1,27 @@
+# app/models/vote_tally.py
+
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from .base import Base
+
+class VoteTally(Base):
+    """
+    Running ballot counts per (vote event, voter group, candidate).
+
+    Each key is spread over several `slot` rows so concurrent casts for the
+    same candidate update different rows instead of queueing on one lock.
+    The count for a key is the SUM over its slots.
+    """
+    __tablename__ = "vote_tallies"
+
+    votes_id: Mapped[int] = mapped_column(ForeignKey("votes.votes_id"), primary_key=True)
+    groups_id: Mapped[int] = mapped_column(ForeignKey("groups.groups_id"), primary_key=True)
+    candidates_id: Mapped[int] = mapped_column(ForeignKey("candidates.candidates_id"), primary_key=True)
+    slot: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    vote_count: Mapped[int] = mapped_column(default=0)
+
+    def __repr__(self) -> str:
+        return (
+            f"<VoteTally(vote_id={self.votes_id}, group_id={self.groups_id}, "
+            f"candidate_id={self.candidates_id}, slot={self.slot}, count={self.vote_count})>"
+        )
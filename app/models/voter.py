@@ -1,11 +1,13 @@
 # app/models/voter.py
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from .base import Base
 
 class Voter(Base):
     __tablename__ = "voters"
+    # Voters of one group in id order (listings, joins from ballots to groups)
+    __table_args__ = (Index("ix_voters_groups_id_voters_id", "groups_id", "voters_id"),)
 
     voters_id: Mapped[int] = mapped_column(primary_key=True)
     voter_name: Mapped[str | None]
@@ -2,5 +2,6 @@
 
 from .group import GroupCreate, GroupRead
 from .candidate import CandidateCreate, CandidateRead
-from .voter import VoterCreate, VoterRead
-from .vote import VoteEventCreate, VoteEventRead, VoteCast, VoteCastRead
\ No newline at end of file
+from .voter import VoterCreate, VoterRead, VoterImportReport
+from .vote import VoteEventCreate, VoteEventRead, VoteCast, VoteCastRead
+from .page import Page
@@ -0,0 +1,25 @@
+# app/schemas/adapters.py
+
+from functools import lru_cache
+
+from pydantic import TypeAdapter
+
+from .candidate import CandidateRead
+from .vote import VoteCastRead, VoteResult, VoteResultMatrix
+
+
+@lru_cache(maxsize=None)
+def type_adapter(tp) -> TypeAdapter:
+    """
+    Returns the TypeAdapter of a type, built once per type.
+    """
+    return TypeAdapter(tp)
+
+
+# Prebuilt adapters for the hot paths. Validating a whole result from plain
+# dicts is a single pydantic-core call, much cheaper than building one model
+# per row in Python (model_construct included).
+vote_result_adapter = type_adapter(VoteResult)
+vote_result_matrix_adapter = type_adapter(VoteResultMatrix)
+vote_cast_reads_adapter = type_adapter(list[VoteCastRead])
+candidate_list_adapter = type_adapter(list[CandidateRead])
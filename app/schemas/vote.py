@@ -1,7 +1,7 @@
 # app/schemas/vote.py
 
-from typing import List
-from pydantic import BaseModel, ConfigDict
+from typing import List, Literal
+from pydantic import BaseModel, ConfigDict, Field
 
 # --- Schemas for the Voting EVENT ---
 class VoteEventCreate(BaseModel):
@@ -27,6 +27,27 @@ class VoteCastRead(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+# --- Schemas for BATCH casting ---
+
+# Largest batch accepted by /votes/{vote_id}/cast/batch
+MAX_CAST_BATCH_SIZE = 100_000
+
+class VoteCastBatch(BaseModel):
+    items: list[VoteCast] = Field(max_length=MAX_CAST_BATCH_SIZE)
+
+class VoteCastBatchItem(BaseModel):
+    """Outcome of one ballot of a batch, in submission order."""
+    status: Literal["accepted", "duplicate", "unknown_voter", "invalid"]
+    voters_votes_id: int | None = None  # set when accepted
+    detail: str | None = None           # set when not accepted
+
+class VoteCastBatchResult(BaseModel):
+    accepted: int
+    duplicates: int
+    unknown_voters: int
+    invalid: int
+    results: list[VoteCastBatchItem]
+
 
 
 class CandidateResult(BaseModel):
@@ -42,6 +63,33 @@ class VoteResult(BaseModel):
     total_votes: int
     breakdown: list[CandidateResult]
 
+class VoteResultDelta(BaseModel):
+    """Candidates whose counts changed since the previous streamed result."""
+    vote_id: int
+    total_votes: int
+    changed: list[CandidateResult]
+
+class ResultMatrixGroup(BaseModel):
+    """A column of the results matrix."""
+    group_id: int
+    group_name: str | None
+
+class ResultMatrixRow(BaseModel):
+    """One candidate's votes per group, aligned with VoteResultMatrix.groups."""
+    candidate_id: int
+    candidate_name: str
+    counts: list[int]
+    total: int
+
+class VoteResultMatrix(BaseModel):
+    """Candidates x groups vote counts for one or more voting events."""
+    vote_ids: list[int]
+    vote_title: str
+    groups: list[ResultMatrixGroup]
+    rows: list[ResultMatrixRow]
+    group_totals: list[int]
+    total_votes: int
+
 # --- Schemas for COMBINING VOTES ---
 
 class VoteCombineRequest(BaseModel):
@@ -1,5 +1,7 @@
 # app/schemas/voter.py
 
+import datetime
+from typing import Literal
 from pydantic import BaseModel, ConfigDict
 
 class VoterBase(BaseModel):
@@ -13,4 +15,33 @@ class VoterCreate(VoterBase):
 class VoterRead(VoterBase):
     voters_id: int
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+# --- Schemas for CSV imports ---
+
+class VoterImportReject(BaseModel):
+    """A CSV row that could not be imported."""
+    line: int
+    reason: str
+
+class VoterImportReport(BaseModel):
+    """Outcome of a CSV voter import."""
+    inserted: int = 0
+    skipped: int = 0   # phone already on the roll or repeated in the file
+    rejected: int = 0  # malformed rows, unknown group ids
+    rejects: list[VoterImportReject] = []  # the first MAX_REPORTED_REJECTS rejected rows
+
+class ImportJobRead(BaseModel):
+    """Status of a background CSV import job."""
+    job_id: str
+    filename: str | None
+    status: Literal["queued", "running", "completed", "failed"]
+    rows_processed: int
+    rows_per_second: float | None
+    eta_seconds: float | None
+    created_at: datetime.datetime
+    started_at: datetime.datetime | None
+    finished_at: datetime.datetime | None
+    error: str | None
+    report: VoterImportReport
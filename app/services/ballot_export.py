@@ -0,0 +1,139 @@
+# app/services/ballot_export.py
+
+import csv
+import io
+import json
+import zlib
+from typing import AsyncIterator, Callable, Literal
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import AsyncSessionLocal
+from app.models import Candidate, Group, Voter, VoterVote
+from app.services.vote_registry import vote_registry
+from app.services.vote_service import VOTE_NOT_FOUND
+
+ExportFormat = Literal["csv", "jsonl"]
+
+# Columns of every exported ballot, in order
+EXPORT_COLUMNS = (
+    "voters_votes_id",
+    "vote_time",
+    "voter_name",
+    "voter_phone",
+    "group_name",
+    "candidate_name",
+)
+
+# Rows fetched from the server-side cursor, and written out, per chunk
+_PARTITION_SIZE = 1000
+
+
+def ballots_query(vote_id: int):
+    """
+    One row per ballot of the event with the voter, group and candidate names,
+    in the order the ballots were stored.
+    """
+    return (
+        select(
+            VoterVote.voters_votes_id,
+            VoterVote.vote_time,
+            Voter.voter_name,
+            Voter.voter_phone,
+            Group.group_name,
+            Candidate.candidate_name,
+        )
+        .outerjoin(Voter, Voter.voters_id == VoterVote.voters_id)
+        .outerjoin(Group, Group.groups_id == Voter.groups_id)
+        .outerjoin(Candidate, Candidate.candidates_id == VoterVote.candidates_id)
+        .where(VoterVote.votes_id == vote_id)
+        .order_by(VoterVote.voters_votes_id)
+    )
+
+
+async def _partitions(session_factory: Callable[[], AsyncSession], vote_id: int):
+    # stream() + yield_per reads through a server-side cursor, so only one
+    # partition of rows is in memory at a time
+    async with session_factory() as db:
+        result = await db.stream(
+            ballots_query(vote_id).execution_options(yield_per=_PARTITION_SIZE)
+        )
+        async for rows in result.partitions():
+            yield [
+                (
+                    row.voters_votes_id,
+                    row.vote_time.isoformat() if row.vote_time else None,
+                    row.voter_name,
+                    row.voter_phone,
+                    row.group_name,
+                    row.candidate_name,
+                )
+                for row in rows
+            ]
+
+
+async def _csv_chunks(session_factory: Callable[[], AsyncSession], vote_id: int) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    async for rows in _partitions(session_factory, vote_id):
+        writer.writerows(rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():  # header of an event without ballots
+        yield buffer.getvalue().encode("utf-8")
+
+
+async def _jsonl_chunks(session_factory: Callable[[], AsyncSession], vote_id: int) -> AsyncIterator[bytes]:
+    async for rows in _partitions(session_factory, vote_id):
+        yield "".join(
+            json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False) + "\n"
+            for row in rows
+        ).encode("utf-8")
+
+
+async def _gzip(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(wbits=31)  # 31: gzip container
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+_EXPORTERS = {
+    "csv": _csv_chunks,
+    "jsonl": _jsonl_chunks,
+}
+
+
+async def export_ballots_async(
+    db: AsyncSession,
+    vote_id: int,
+    export_format: ExportFormat,
+    compress: bool = False,
+    session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+) -> AsyncIterator[bytes]:
+    """
+    Checks the event exists and returns its ballots as a stream of bytes.
+
+    The rows are read with a server-side cursor on a session of their own
+    (from `session_factory`), opened when the stream is first iterated, so
+    `db` can be closed before the response body is sent. Memory use doesn't
+    grow with the number of ballots.
+
+    Args:
+        db: The request's session, used only to check the event.
+        vote_id: The ID of the vote event.
+        export_format: "csv" (with a header row) or "jsonl" (one object per line).
+        compress: Gzip the stream.
+
+    Raises:
+        ValueError: If the vote event is not found.
+    """
+    if await db.run_sync(vote_registry.get, vote_id) is None:
+        raise ValueError(VOTE_NOT_FOUND)
+    chunks = _EXPORTERS[export_format](session_factory, vote_id)
+    return _gzip(chunks) if compress else chunks
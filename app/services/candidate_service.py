@@ -1,8 +1,12 @@
 # app/services/candidate_service.py
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.candidate import Candidate
-from app.schemas.candidate import CandidateCreate
+from app.schemas.candidate import CandidateCreate, CandidateRead
+from app.schemas.page import Page
+from app.services.pagination import DEFAULT_PAGE_SIZE, keyset_page
 
 def create_candidate(db: Session, candidate: CandidateCreate) -> Candidate:
     """
@@ -15,5 +19,44 @@ def create_candidate(db: Session, candidate: CandidateCreate) -> Candidate:
     )
     db.add(db_candidate)
     db.commit()
-    db.refresh(db_candidate)
-    return db_candidate
\ No newline at end of file
+    return db_candidate
+
+
+def list_candidates(
+    db: Session,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+    groups_id: int | None = None,
+) -> Page[CandidateRead]:
+    """
+    Lists candidates by id, optionally only those of one group, one keyset
+    page at a time.
+
+    Raises:
+        ValueError: If the cursor is invalid.
+    """
+    stmt = select(Candidate.candidates_id, Candidate.candidate_name, Candidate.groups_id)
+    if groups_id is not None:
+        stmt = stmt.where(Candidate.groups_id == groups_id)
+    return keyset_page(db, stmt, Candidate.candidates_id, CandidateRead, limit, cursor)
+
+
+# --- Async API ---
+
+async def create_candidate_async(db: AsyncSession, candidate: CandidateCreate) -> Candidate:
+    """
+    Async variant of create_candidate.
+    """
+    return await db.run_sync(create_candidate, candidate)
+
+
+async def list_candidates_async(
+    db: AsyncSession,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+    groups_id: int | None = None,
+) -> Page[CandidateRead]:
+    """
+    Async variant of list_candidates.
+    """
+    return await db.run_sync(list_candidates, limit, cursor, groups_id)
@@ -0,0 +1,167 @@
+# app/services/cast_buffer.py
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+from app.db.session import SessionLocal
+from app.schemas.vote import VoteCast, VoteCastRead
+from app.services import vote_service
+
+logger = get_logger(__name__)
+
+
+class CastBufferFull(Exception):
+    """Raised when the ingestion queue is at capacity."""
+
+
+# Pushed onto the queue by stop() to wake the flusher and make it exit
+_STOP = object()
+
+
+class CastBuffer:
+    """
+    Write-behind buffer that group-commits ballots.
+
+    Callers submit a cast and get a Future back. A single flusher thread drains
+    the queue and writes everything it collected with vote_service.cast_votes_many,
+    i.e. one multi-row INSERT and one commit per batch. A batch is flushed when
+    it reaches `batch_size` casts or when its oldest cast has waited
+    `max_latency_ms`, whichever comes first.
+
+    Futures are resolved only after the batch commits, so an acknowledged cast
+    is durable. Per-row failures (unknown phone, already voted) are set as the
+    ValueError on that caller's future only; an unexpected error fails the
+    whole batch. A cast whose future was cancelled before its batch was
+    written is dropped, not cast.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        batch_size: int,
+        max_latency_ms: int,
+        queue_depth: int,
+    ):
+        self._session_factory = session_factory
+        self._batch_size = batch_size
+        self._max_latency = max_latency_ms / 1000
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_depth)
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """
+        Starts the flusher thread. Calling it on a running buffer is a no-op.
+        """
+        if self.running:
+            return
+        self._thread = threading.Thread(target=self._run, name="cast-buffer-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """
+        Flushes everything already queued, then stops the flusher thread.
+        """
+        if not self.running:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def submit(self, vote_id: int, vote_cast: VoteCast) -> "Future[VoteCastRead]":
+        """
+        Queues a cast for the next batch.
+
+        Returns:
+            A Future resolved with the VoteCastRead once the batch has committed.
+
+        Raises:
+            CastBufferFull: If the queue already holds `queue_depth` casts.
+        """
+        future: Future[VoteCastRead] = Future()
+        try:
+            self._queue.put_nowait((vote_id, vote_cast, future))
+        except queue.Full:
+            raise CastBufferFull("The ballot queue is full. Please retry shortly.")
+        return future
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+
+            # 1. Collect until the batch is full or the first cast hits its deadline
+            batch = [item]
+            deadline = time.monotonic() + self._max_latency
+            stopping = False
+            while len(batch) < self._batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            # 2. Write and commit the batch, then wake the callers. Whatever goes
+            # wrong with one batch, the flusher has to keep serving the next ones
+            try:
+                self._flush(batch)
+            except Exception as e:
+                logger.exception("Unexpected error in the cast buffer flusher")
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            if stopping:
+                return
+
+    def _flush(self, batch: list[tuple[int, VoteCast, Future]]) -> None:
+        # Drop the casts whose caller already gave up (disconnected, timed out);
+        # the rest are marked running and can no longer be cancelled
+        batch = [entry for entry in batch if entry[2].set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        casts = [(vote_id, vote_cast) for vote_id, vote_cast, _ in batch]
+        db = self._session_factory()
+        try:
+            results = vote_service.cast_votes_many(db, casts)
+        except Exception as e:
+            db.rollback()
+            logger.exception("Failed to flush a batch of %d casts", len(batch))
+            for _, _, future in batch:
+                future.set_exception(e)
+            return
+        finally:
+            db.close()
+
+        for (_, _, future), result in zip(batch, results):
+            if isinstance(result, ValueError):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+# The buffer used by the cast endpoint when CAST_BUFFER_ENABLED is set.
+# It is started and stopped by the application lifespan in main.py.
+cast_buffer = CastBuffer(
+    session_factory=SessionLocal,
+    batch_size=settings.CAST_BUFFER_BATCH_SIZE,
+    max_latency_ms=settings.CAST_BUFFER_MAX_LATENCY_MS,
+    queue_depth=settings.CAST_BUFFER_QUEUE_DEPTH,
+)
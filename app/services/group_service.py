@@ -1,8 +1,12 @@
 # app/services/group_service.py
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.group import Group
-from app.schemas.group import GroupCreate
+from app.schemas.group import GroupCreate, GroupRead
+from app.schemas.page import Page
+from app.services.pagination import DEFAULT_PAGE_SIZE, keyset_page
 
 def create_group(db: Session, group: GroupCreate) -> Group:
     """
@@ -21,10 +25,41 @@ def create_group(db: Session, group: GroupCreate) -> Group:
     # Add the instance to the session
     db.add(db_group)
     
-    # Commit the transaction to the database
+    # Commit the transaction to the database. No refresh: the API's async
+    # session doesn't expire on commit, so the ID set by the flush is returned
+    # without a SELECT. A sync SessionLocal (tests, CLI) expires on commit and
+    # reloads the row when an attribute is first read.
     db.commit()
     
-    # Refresh the instance to get the new ID from the database
-    db.refresh(db_group)
-    
-    return db_group
\ No newline at end of file
+    return db_group
+
+
+def list_groups(
+    db: Session, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None
+) -> Page[GroupRead]:
+    """
+    Lists groups by id, one keyset page at a time.
+
+    Raises:
+        ValueError: If the cursor is invalid.
+    """
+    stmt = select(Group.groups_id, Group.group_name)
+    return keyset_page(db, stmt, Group.groups_id, GroupRead, limit, cursor)
+
+
+# --- Async API ---
+
+async def create_group_async(db: AsyncSession, group: GroupCreate) -> Group:
+    """
+    Async variant of create_group.
+    """
+    return await db.run_sync(create_group, group)
+
+
+async def list_groups_async(
+    db: AsyncSession, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None
+) -> Page[GroupRead]:
+    """
+    Async variant of list_groups.
+    """
+    return await db.run_sync(list_groups, limit, cursor)
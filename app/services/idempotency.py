@@ -0,0 +1,160 @@
+# app/services/idempotency.py
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Hashable
+
+from app.core import metrics
+from app.core.config import settings
+from app.schemas.vote import VoteCast, VoteCastRead
+
+
+class IdempotencyKeyReused(Exception):
+    """Raised when a key is sent again with a different request."""
+
+
+class _Abandoned(Exception):
+    """Set on a key's future when the request running it was cancelled."""
+
+
+class IdempotencyStore:
+    """
+    In-process store of the responses to idempotent requests, by key.
+
+    The first request with a key runs; a repeat within `ttl_seconds` gets the
+    stored response without running again, and a repeat that arrives while
+    the first is still running waits for its outcome. Only successful
+    responses are stored: after an error the next repeat runs again.
+
+    Each key remembers a fingerprint of its request, and a repeat with a
+    different fingerprint is refused, so a reused key can't return another
+    caller's response. Keys are per process: a retry routed to another worker
+    runs again and is rejected by the database as a duplicate.
+    """
+
+    def __init__(self, max_keys: int, ttl_seconds: float):
+        self._max_keys = max_keys
+        self._ttl = ttl_seconds
+        # key -> (fingerprint, future, completed at; None while running)
+        self._entries: OrderedDict[Hashable, tuple[Hashable, Future, float | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def claim(self, key: Hashable, fingerprint: Hashable) -> tuple[Future, bool]:
+        """
+        Returns the key's future, and whether the caller must run the request
+        and then call complete() or fail() with it.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_fingerprint, future, completed_at = entry
+                if completed_at is None or time.monotonic() - completed_at < self._ttl:
+                    if stored_fingerprint != fingerprint:
+                        raise IdempotencyKeyReused(
+                            "This idempotency key was already used for a different request"
+                        )
+                    return future, False
+            future = Future()
+            self._entries[key] = (fingerprint, future, None)
+            self._entries.move_to_end(key)
+            self._evict()
+            return future, True
+
+    def complete(self, key: Hashable, future: Future, result) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] is future:
+                self._entries[key] = (entry[0], future, time.monotonic())
+        future.set_result(result)
+
+    def fail(self, key: Hashable, future: Future, error: BaseException) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] is future:
+                del self._entries[key]
+        future.set_exception(error)
+
+    async def run(
+        self, key: Hashable, fingerprint: Hashable, request: Callable[[], Awaitable]
+    ):
+        """
+        Runs `request` once per key and returns its result to every caller.
+        """
+        while True:
+            future, owner = self.claim(key, fingerprint)
+            if owner:
+                break
+            outcome = "replayed" if future.done() else "coalesced"
+            try:
+                # Shielded: a waiter that disconnects must not cancel the
+                # request it is waiting on
+                result = await asyncio.shield(asyncio.wrap_future(future))
+            except _Abandoned:
+                continue  # The request was cancelled; run it here instead
+            metrics.IDEMPOTENT_REPLAYS.labels(outcome).inc()
+            return result
+
+        try:
+            result = await request()
+        except asyncio.CancelledError:
+            self.fail(key, future, _Abandoned())
+            raise
+        except BaseException as e:
+            self.fail(key, future, e)
+            raise
+        self.complete(key, future, result)
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _evict(self) -> None:
+        # Oldest first, skipping running requests so their waiters still find them
+        excess = len(self._entries) - self._max_keys
+        if excess <= 0:
+            return
+        for key, (_, _, completed_at) in list(self._entries.items()):
+            if excess == 0:
+                break
+            if completed_at is not None:
+                del self._entries[key]
+                excess -= 1
+
+
+cast_idempotency = IdempotencyStore(
+    max_keys=settings.IDEMPOTENCY_MAX_KEYS,
+    ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS,
+)
+
+
+def cast_key(vote_id: int, idempotency_key: str | None, call_id: str | None) -> tuple | None:
+    """
+    The store key of a cast: the Idempotency-Key header, else the IVR call id.
+    """
+    if idempotency_key:
+        return (vote_id, "key", idempotency_key)
+    if call_id:
+        return (vote_id, "call", call_id)
+    return None
+
+
+def cast_fingerprint(vote_cast: VoteCast) -> tuple[str, int]:
+    return (vote_cast.voter_phone, vote_cast.candidate_id)
+
+
+async def cast_once(
+    key: tuple | None, vote_cast: VoteCast, cast: Callable[[], Awaitable[VoteCastRead]]
+) -> VoteCastRead:
+    """
+    Runs `cast` unless a cast with the same key already ran or is running.
+    """
+    if key is None:
+        return await cast()
+    return await cast_idempotency.run(key, cast_fingerprint(vote_cast), cast)
@@ -0,0 +1,183 @@
+# app/services/import_jobs.py
+
+import datetime
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Callable
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+from app.db.session import SessionLocal
+from app.schemas.voter import ImportJobRead, VoterImportReport
+from app.services import voter_service
+
+logger = get_logger(__name__)
+
+
+class ImportJob:
+    """
+    Mutable state of one import; read it through ImportJobManager.get().
+    """
+
+    def __init__(self, job_id: str, filename: str | None, path: str, size: int):
+        self.job_id = job_id
+        self.filename = filename
+        self.path = path
+        self.size = size
+        self.status = "queued"
+        self.report = VoterImportReport()
+        self.bytes_read = 0
+        self.created_at = datetime.datetime.now(datetime.UTC)
+        self.started_at: datetime.datetime | None = None
+        self.finished_at: datetime.datetime | None = None
+        self.error: str | None = None
+        self._started = 0.0
+        self._elapsed: float | None = None
+
+    def to_read(self) -> ImportJobRead:
+        report = self.report.model_copy(deep=True)
+        rows = report.inserted + report.skipped + report.rejected
+
+        elapsed = self._elapsed
+        if elapsed is None and self._started:
+            elapsed = time.monotonic() - self._started
+        rate = rows / elapsed if elapsed and rows else None
+
+        # ETA from the share of the file consumed so far
+        eta = None
+        if self.status == "running" and elapsed and self.bytes_read and self.size:
+            done = min(self.bytes_read / self.size, 1.0)
+            eta = elapsed * (1 - done) / done
+
+        return ImportJobRead(
+            job_id=self.job_id,
+            filename=self.filename,
+            status=self.status,
+            rows_processed=rows,
+            rows_per_second=rate,
+            eta_seconds=eta,
+            created_at=self.created_at,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+            error=self.error,
+            report=report,
+        )
+
+
+class ImportJobManager:
+    """
+    Runs CSV voter imports in the background on a bounded thread pool.
+
+    submit() spools the upload to local disk and returns at once; at most
+    `max_workers` imports run concurrently and the rest wait in the pool's
+    queue. Each import uses its own sync Session, i.e. one pooled connection.
+    The last `history` finished jobs are kept for status polling.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        max_workers: int,
+        spool_dir: str | None = None,
+        history: int = 100,
+    ):
+        self._session_factory = session_factory
+        self._spool_dir = spool_dir or os.path.join(tempfile.gettempdir(), "yemot-vote-imports")
+        self._history = history
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="voter-import")
+        self._jobs: OrderedDict[str, ImportJob] = OrderedDict()
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def submit(self, source: BinaryIO, filename: str | None = None) -> ImportJobRead:
+        """
+        Spools `source` to disk and queues its import.
+
+        This copies the whole upload, so call it from a worker thread
+        (e.g. run_in_threadpool) rather than on the event loop.
+        """
+        os.makedirs(self._spool_dir, exist_ok=True)
+        job_id = uuid.uuid4().hex
+        path = os.path.join(self._spool_dir, f"{job_id}.csv")
+        with open(path, "wb") as spool:
+            shutil.copyfileobj(source, spool, length=1024 * 1024)
+
+        job = ImportJob(job_id, filename, path, os.path.getsize(path))
+        with self._lock:
+            self._jobs[job_id] = job
+            self._futures[job_id] = self._executor.submit(self._run, job)
+            self._prune()
+        return job.to_read()
+
+    def get(self, job_id: str) -> ImportJobRead:
+        """
+        Raises:
+            ValueError: If there is no such job (or it was pruned from history).
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                raise ValueError("Import job not found.")
+            return job.to_read()
+
+    def wait(self, job_id: str, timeout: float | None = None) -> ImportJobRead:
+        """
+        Blocks until the job has finished and returns its final status.
+        """
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None:
+            future.result(timeout)
+        return self.get(job_id)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job: ImportJob) -> None:
+        job.status = "running"
+        job.started_at = datetime.datetime.now(datetime.UTC)
+        job._started = time.monotonic()
+        db = self._session_factory()
+        try:
+            with open(job.path, "rb") as csv_file:
+                def progress(report: VoterImportReport) -> None:
+                    job.report = report.model_copy(deep=True)
+                    job.bytes_read = csv_file.tell()
+
+                job.report = voter_service.import_voters_from_csv(db, csv_file, progress=progress)
+            job.status = "completed"
+        except Exception as e:
+            db.rollback()
+            logger.exception("Import job %s failed", job.job_id)
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            db.close()
+            job._elapsed = time.monotonic() - job._started
+            job.finished_at = datetime.datetime.now(datetime.UTC)
+            os.remove(job.path)
+
+    def _prune(self) -> None:
+        finished = [
+            job_id for job_id, job in self._jobs.items()
+            if job.status in ("completed", "failed")
+        ]
+        for job_id in finished[:max(0, len(finished) - self._history)]:
+            del self._jobs[job_id]
+            self._futures.pop(job_id, None)
+
+
+import_jobs = ImportJobManager(
+    session_factory=SessionLocal,
+    max_workers=settings.IMPORT_MAX_CONCURRENT_JOBS,
+    spool_dir=settings.IMPORT_SPOOL_DIR,
+    history=settings.IMPORT_JOB_HISTORY,
+)
@@ -0,0 +1,156 @@
+# app/services/ivr_service.py
+
+"""
+Call flow of the Yemot IVR webhook (see app/api/v1/endpoints/ivr.py).
+
+Each step of a call is one request from Yemot carrying the caller's phone
+(ApiPhone) and, once they pressed a choice, its digits. The reply is Yemot's
+plain-text command format, e.g. "read=t-<prompt>=candidate,no,1,1,7,No,yes,no"
+to play the menu and collect a digit, or "id_list_message=t-<text>&go_to_folder=hangup".
+
+The menu of a vote event is rendered once and kept with the registry entry it
+was built from, so answering a call is a phone index lookup and a dict lookup:
+no queries and no ORM objects once both are warm.
+"""
+
+import re
+import threading
+from dataclasses import dataclass
+
+from sqlalchemy.orm import Session
+
+from app.schemas.candidate import CandidateRead
+from app.schemas.vote import VoteCast
+from app.services.phone_index import phone_index
+from app.services.vote_registry import VoteEntry, vote_registry
+from app.services.vote_service import ALREADY_VOTED
+
+# Name of the request parameter Yemot sends the pressed digits in
+CHOICE_PARAM = "candidate"
+# Seconds Yemot waits for the caller to press a choice
+_CHOICE_TIMEOUT_SECONDS = 7
+
+# Prompts, read by Yemot's text-to-speech
+PROMPT_CHOICE = "לבחירה ב{name} הקישו {digits}"
+PROMPT_INVALID_CHOICE = "הבחירה אינה חוקית"
+PROMPT_VOTE_NOT_FOUND = "ההצבעה אינה קיימת"
+PROMPT_NOT_REGISTERED = "מספר הטלפון אינו רשום כבוחר"
+PROMPT_ALREADY_VOTED = "כבר הצבעתם בהצבעה זו"
+PROMPT_ACCEPTED = "הצבעתכם עבור {name} נקלטה, תודה"
+PROMPT_FAILED = "אירעה תקלה, נסו שוב מאוחר יותר"
+
+# Characters that delimit commands, parameters or speech segments in a reply
+_REPLY_SEPARATORS = re.compile(r"[.,\-=&\"'\r\n]+")
+
+
+def _speech(text: str) -> str:
+    return "t-" + " ".join(_REPLY_SEPARATORS.sub(" ", text).split())
+
+
+def message_reply(text: str) -> str:
+    """
+    Plays `text` and ends the call.
+    """
+    return f"id_list_message={_speech(text)}&go_to_folder=hangup"
+
+
+@dataclass(frozen=True)
+class IvrMenu:
+    """The rendered candidate menu of a vote event."""
+    entry: VoteEntry
+    choices: dict[int, CandidateRead]  # pressed number -> candidate
+    read_reply: str
+    invalid_choice_reply: str
+
+
+def _render_menu(entry: VoteEntry) -> IvrMenu:
+    choices = dict(enumerate(entry.candidates, 1))
+    max_digits = len(str(len(choices))) if choices else 1
+    prompts = [entry.vote_title] + [
+        PROMPT_CHOICE.format(name=candidate.candidate_name, digits=number)
+        for number, candidate in choices.items()
+    ]
+
+    def read(prompts: list[str]) -> str:
+        speech = ".".join(_speech(prompt) for prompt in prompts)
+        return (
+            f"read={speech}={CHOICE_PARAM},no,{max_digits},1,"
+            f"{_CHOICE_TIMEOUT_SECONDS},No,yes,no"
+        )
+
+    return IvrMenu(
+        entry=entry,
+        choices=choices,
+        read_reply=read(prompts),
+        invalid_choice_reply=read([PROMPT_INVALID_CHOICE, *prompts]),
+    )
+
+
+class IvrMenus:
+    """
+    Rendered menus by vote id. A menu is re-rendered when the vote registry
+    hands out a different entry for its event, i.e. after an invalidation.
+    """
+
+    def __init__(self):
+        self._menus: dict[int, IvrMenu] = {}
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, vote_id: int) -> IvrMenu | None:
+        entry = vote_registry.get(db, vote_id)
+        if entry is None:
+            return None
+        menu = self._menus.get(vote_id)
+        if menu is None or menu.entry is not entry:
+            menu = _render_menu(entry)
+            with self._lock:
+                self._menus[vote_id] = menu
+        return menu
+
+    def clear(self) -> None:
+        with self._lock:
+            self._menus.clear()
+
+
+ivr_menus = IvrMenus()
+
+
+@dataclass(frozen=True)
+class IvrCast:
+    """A valid choice from a registered caller, ready to be cast."""
+    vote_cast: VoteCast
+    candidate_name: str
+
+
+def call_step(db: Session, vote_id: int, phone: str | None, choice: str | None) -> str | IvrCast:
+    """
+    Answers one step of a call: the reply to send, or the cast to make when
+    the caller pressed a valid choice.
+    """
+    menu = ivr_menus.get(db, vote_id)
+    if menu is None:
+        return message_reply(PROMPT_VOTE_NOT_FOUND)
+    # A withheld number has no ApiPhone; don't look up an empty phone
+    if not phone or phone_index.lookup(db, phone) is None:
+        return message_reply(PROMPT_NOT_REGISTERED)
+    if choice is None:
+        return menu.read_reply
+
+    candidate = menu.choices.get(int(choice)) if choice.isascii() and choice.isdigit() else None
+    if candidate is None:
+        return menu.invalid_choice_reply
+    return IvrCast(
+        vote_cast=VoteCast(voter_phone=phone, candidate_id=candidate.candidates_id),
+        candidate_name=candidate.candidate_name,
+    )
+
+
+def cast_reply(cast: IvrCast, error: Exception | None = None) -> str:
+    """
+    The reply once the cast was stored, or was rejected with `error`.
+    """
+    if error is None:
+        return message_reply(PROMPT_ACCEPTED.format(name=cast.candidate_name))
+    if str(error) == ALREADY_VOTED:
+        return message_reply(PROMPT_ALREADY_VOTED)
+    return message_reply(PROMPT_FAILED)
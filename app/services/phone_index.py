@@ -0,0 +1,240 @@
+# app/services/phone_index.py
+
+import bisect
+import re
+import threading
+from array import array
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+from app.models import Voter
+
+logger = get_logger(__name__)
+
+# (voters_id, groups_id) of one voter
+VoterIds = tuple[int, int]
+
+_NON_DIGITS = re.compile(r"[^0-9]")
+
+# Phones longer than this can't be packed into a signed 64-bit key
+_MAX_PACKED_DIGITS = 17
+
+# The overlay may grow to 1/_OVERLAY_SHARE of the arrays before it is merged
+_OVERLAY_SHARE = 32
+
+
+def normalize_phone(phone: str | None) -> str:
+    """
+    Reduces a phone number to its digits, so "050-123 4567" and "0501234567"
+    are the same key.
+    """
+    if not phone:
+        return ""
+    if phone.isascii() and phone.isdigit():
+        return phone
+    return _NON_DIGITS.sub("", phone)
+
+
+def _pack(digits: str) -> int | None:
+    # A leading 1 keeps leading zeros: "050..." and "50..." stay distinct
+    if not digits or len(digits) > _MAX_PACKED_DIGITS:
+        return None
+    return int("1" + digits)
+
+
+class PhoneIndex:
+    """
+    In-process phone -> (voters_id, groups_id) index for the cast hot path.
+
+    The warmed roll is held as three parallel sorted int64 arrays (about 24
+    bytes per voter, so a few million voters fit in tens of MB) searched with
+    bisect. Voters added afterwards by create_voter or a CSV import go into a
+    small overlay dict, which is merged into the arrays once it holds
+    `overlay_limit` entries, or 1/32 of the arrays if that is more.
+
+    Keys are normalized phones (see normalize_phone). voter_service stores
+    phones normalized, so the unique constraint on voters.voter_phone keeps
+    keys unique and a lookup finds the same voter whatever the formatting.
+    A phone that isn't indexed falls back to one query on the normalized phone
+    and is indexed if found; misses are not remembered, so voters added by
+    another worker process are still found.
+    """
+
+    def __init__(self, overlay_limit: int = 10000):
+        self._overlay_limit = overlay_limit
+        self._table: tuple[array, array, array] = (array("q"), array("q"), array("q"))
+        self._overlay: dict[int, VoterIds] = {}
+        self._unpacked: dict[str, VoterIds] = {}  # phones too long to pack
+        self._warm = False
+        self._lock = threading.Lock()
+        self._warm_lock = threading.Lock()  # held while the roll is being loaded
+
+    def __len__(self) -> int:
+        return len(self._table[0]) + len(self._overlay) + len(self._unpacked)
+
+    def warm(self, db: Session) -> int:
+        """
+        Loads the whole voter roll, replacing what is indexed. Returns its size.
+        """
+        with self._warm_lock:
+            return self._load(db)
+
+    def _ensure_warm(self, db: Session) -> None:
+        # Concurrent first lookups wait for one load instead of each reading the roll
+        with self._warm_lock:
+            if not self._warm:
+                self._load(db)
+
+    def _load(self, db: Session) -> int:
+        entries: dict[int, VoterIds] = {}
+        unpacked: dict[str, VoterIds] = {}
+        rows = db.execute(
+            select(Voter.voter_phone, Voter.voters_id, Voter.groups_id)
+            .order_by(Voter.voters_id.desc())
+            .execution_options(yield_per=10000)
+        )
+        for phone, voters_id, groups_id in rows:
+            digits = normalize_phone(phone)
+            key = _pack(digits)
+            if key is not None:
+                entries[key] = (voters_id, groups_id)
+            elif digits:
+                unpacked[digits] = (voters_id, groups_id)
+
+        with self._lock:
+            # Keep voters indexed while the roll was being read
+            entries.update(self._overlay)
+            self._table = self._build(entries)
+            self._overlay = {}
+            self._unpacked = {**unpacked, **self._unpacked}
+            self._warm = True
+        logger.info("Phone index warmed with %d voters", len(self))
+        return len(self)
+
+    def lookup(self, db: Session, phone: str) -> VoterIds | None:
+        """
+        Returns (voters_id, groups_id) for a phone, or None if no voter has it.
+        Warms the index on first use.
+        """
+        return self.lookup_many(db, [phone]).get(phone)
+
+    def lookup_many(self, db: Session, phones: Iterable[str]) -> dict[str, VoterIds]:
+        """
+        Resolves several phones; those not in the index are fetched with one query.
+        Unknown phones are absent from the returned dict.
+        """
+        if not self._warm:
+            self._ensure_warm(db)
+
+        found: dict[str, VoterIds] = {}
+        missing = []
+        for phone in phones:
+            ids = self._get(normalize_phone(phone))
+            if ids is None:
+                missing.append(phone)
+            else:
+                found[phone] = ids
+
+        # Phones are stored normalized; a phone without digits can't match
+        missing_by_digits: dict[str, list[str]] = {}
+        for phone in missing:
+            digits = normalize_phone(phone)
+            if digits:
+                missing_by_digits.setdefault(digits, []).append(phone)
+        if missing_by_digits:
+            rows = db.execute(
+                select(Voter.voter_phone, Voter.voters_id, Voter.groups_id)
+                .where(Voter.voter_phone.in_(missing_by_digits))
+            ).all()
+            for stored_phone, voters_id, groups_id in rows:
+                for phone in missing_by_digits[stored_phone]:
+                    found[phone] = (voters_id, groups_id)
+            self.add_many(rows)
+        return found
+
+    def add(self, phone: str | None, voters_id: int, groups_id: int) -> None:
+        """
+        Indexes one newly created voter.
+        """
+        self.add_many([(phone, voters_id, groups_id)])
+
+    def add_many(self, voters: Iterable[tuple[str | None, int, int]]) -> None:
+        """
+        Indexes (voter_phone, voters_id, groups_id) rows of newly created voters.
+        """
+        with self._lock:
+            for phone, voters_id, groups_id in voters:
+                digits = normalize_phone(phone)
+                key = _pack(digits)
+                if key is not None:
+                    self._overlay[key] = (voters_id, groups_id)
+                elif digits:
+                    self._unpacked[digits] = (voters_id, groups_id)
+            # Merge less often as the roll grows, so the cost per added voter stays flat
+            limit = max(self._overlay_limit, len(self._table[0]) // _OVERLAY_SHARE)
+            if len(self._overlay) >= limit:
+                self._compact()
+
+    def clear(self) -> None:
+        """
+        Drops everything; the next lookup warms the index again.
+        """
+        with self._lock:
+            self._table = (array("q"), array("q"), array("q"))
+            self._overlay = {}
+            self._unpacked = {}
+            self._warm = False
+
+    def _get(self, digits: str) -> VoterIds | None:
+        key = _pack(digits)
+        if key is None:
+            return self._unpacked.get(digits)
+        ids = self._overlay.get(key)
+        if ids is not None:
+            return ids
+        keys, voter_ids, group_ids = self._table
+        i = bisect.bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            return voter_ids[i], group_ids[i]
+        return None
+
+    def _compact(self) -> None:
+        # Caller holds the lock; readers keep using the old arrays until the swap.
+        # The sorted overlay is spliced in between slices of the sorted arrays:
+        # slice copies run in C, so a merge costs a memcpy of the roll rather
+        # than rebuilding and re-sorting it.
+        keys, voter_ids, group_ids = self._table
+        merged = (array("q"), array("q"), array("q"))
+        start = 0
+        for key in sorted(self._overlay):
+            i = bisect.bisect_left(keys, key, start)
+            merged[0].extend(keys[start:i])
+            merged[1].extend(voter_ids[start:i])
+            merged[2].extend(group_ids[start:i])
+            voters_id, groups_id = self._overlay[key]
+            merged[0].append(key)
+            merged[1].append(voters_id)
+            merged[2].append(groups_id)
+            # An overlay entry replaces the indexed one with the same phone
+            start = i + 1 if i < len(keys) and keys[i] == key else i
+        merged[0].extend(keys[start:])
+        merged[1].extend(voter_ids[start:])
+        merged[2].extend(group_ids[start:])
+        self._table = merged
+        self._overlay = {}
+
+    @staticmethod
+    def _build(entries: dict[int, VoterIds]) -> tuple[array, array, array]:
+        keys = array("q", sorted(entries))
+        return (
+            keys,
+            array("q", (entries[key][0] for key in keys)),
+            array("q", (entries[key][1] for key in keys)),
+        )
+
+
+phone_index = PhoneIndex(overlay_limit=settings.PHONE_INDEX_OVERLAY_LIMIT)
@@ -0,0 +1,102 @@
+# app/services/results_cache.py
+
+import threading
+import time
+from collections import OrderedDict
+
+from app.core.config import settings
+from app.schemas.vote import VoteResult, VoteResultMatrix
+
+# (vote_ids, group_id) -> results; a single event is a 1-tuple. Views other
+# than VoteResult put their name in place of the group, e.g. "matrix".
+CacheKey = tuple[tuple[int, ...], int | str | None]
+CachedResult = VoteResult | VoteResultMatrix
+
+
+class ResultsCache:
+    """
+    In-process LRU cache of computed results, invalidated by version counters.
+
+    Every vote event has a version that cast_vote bumps after committing a
+    ballot. An entry remembers the versions of its events at the time it was
+    computed and is only served while they are unchanged, so a poll between
+    two ballots costs no SQL and a poll after a ballot always recomputes.
+
+    The versions are per process: a ballot committed by another worker is not
+    seen here. `ttl_seconds` bounds how stale an entry may get in that case.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float | None = None):
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._entries: OrderedDict[CacheKey, tuple[tuple[int, ...], float, CachedResult]] = OrderedDict()
+        self._versions: dict[int, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def versions(self, vote_ids: tuple[int, ...]) -> tuple[int, ...]:
+        """
+        Returns the current version of each event. Take this snapshot before
+        computing the results that will be passed to put().
+        """
+        return tuple(self._versions.get(vote_id, 0) for vote_id in vote_ids)
+
+    def bump(self, *vote_ids: int) -> None:
+        """
+        Marks the cached results of these events as outdated.
+        """
+        with self._lock:
+            for vote_id in vote_ids:
+                self._versions[vote_id] = self._versions.get(vote_id, 0) + 1
+
+    def get(self, key: CacheKey) -> CachedResult | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                versions, stored_at, result = entry
+                fresh = versions == self.versions(key[0]) and (
+                    self._ttl is None or time.monotonic() - stored_at < self._ttl
+                )
+                if fresh:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return result
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: CacheKey, versions: tuple[int, ...], result: CachedResult) -> None:
+        with self._lock:
+            self._entries[key] = (versions, time.monotonic(), result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_all(self) -> None:
+        """
+        Outdates every cached result, e.g. after the tallies were rebuilt.
+        """
+        with self._lock:
+            for vote_id in self._versions:
+                self._versions[vote_id] += 1
+            self._entries.clear()
+
+    def clear(self) -> None:
+        """
+        Drops all entries, versions and counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+results_cache = ResultsCache(
+    max_entries=settings.RESULTS_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.RESULTS_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,181 @@
+# app/services/results_stream.py
+
+import asyncio
+import time
+from typing import AsyncIterator, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logging_config import get_logger
+from app.db.session import AsyncSessionLocal
+from app.schemas.vote import VoteResult, VoteResultDelta
+from app.services import vote_service
+from app.services.results_cache import results_cache
+
+logger = get_logger(__name__)
+
+# (vote_id, group_id) of one stream
+StreamKey = tuple[int, int | None]
+
+# Messages buffered per subscriber before it is resynced with a snapshot
+_SUBSCRIBER_QUEUE_SIZE = 16
+
+# Failed updates double the producer's wait up to 2**this intervals
+_MAX_BACKOFF_DOUBLINGS = 5
+
+# Idle time after which subscribe() yields None, so the caller can send a keep-alive
+KEEPALIVE_SECONDS = 15
+
+
+def diff_results(previous: VoteResult, current: VoteResult) -> VoteResultDelta | None:
+    """
+    Returns the candidates whose counts changed, or None if nothing changed.
+    Counts only grow, so a candidate missing from `current` is not expressed
+    as a delta; check with needs_snapshot() first.
+    """
+    before = {c.candidate_id: c.vote_count for c in previous.breakdown}
+    changed = [c for c in current.breakdown if before.get(c.candidate_id) != c.vote_count]
+    if not changed:
+        return None
+    return VoteResultDelta(vote_id=current.vote_id, total_votes=current.total_votes, changed=changed)
+
+
+def needs_snapshot(previous: VoteResult, current: VoteResult) -> bool:
+    """
+    True if `current` can't be expressed as a delta on `previous`, e.g. after
+    the tallies were rebuilt and a candidate dropped out of the breakdown.
+    """
+    now = {c.candidate_id for c in current.breakdown}
+    return any(c.candidate_id not in now for c in previous.breakdown)
+
+
+class _Stream:
+    """One producer task and its subscribers."""
+
+    def __init__(self):
+        self.subscribers: set[asyncio.Queue] = set()
+        self.latest: VoteResult | None = None
+        self.task: asyncio.Task | None = None
+
+
+class ResultsBroadcaster:
+    """
+    Fans live results out to every viewer of a vote event.
+
+    There is one producer task per (vote_id, group_id) with at least one
+    subscriber. Every `interval_ms` it checks the event's version in the
+    results cache (no SQL) and only recomputes when a ballot has been cast,
+    or when `refresh_seconds` have passed (ballots cast by other worker
+    processes don't bump this process's versions). So however many viewers
+    there are, there is at most one results query per interval per stream.
+    A failed update is logged and retried with backoff; viewers keep the last
+    results they got until one succeeds.
+
+    Subscribers get a full snapshot first and deltas after that. A subscriber
+    that falls behind has its backlog replaced by a fresh snapshot.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        interval_ms: int,
+        refresh_seconds: float,
+    ):
+        self._session_factory = session_factory
+        self._interval = interval_ms / 1000
+        self._refresh = refresh_seconds
+        self._streams: dict[StreamKey, _Stream] = {}
+
+    async def subscribe(
+        self, key: StreamKey, initial: VoteResult
+    ) -> AsyncIterator[VoteResult | VoteResultDelta | None]:
+        """
+        Yields a snapshot, then a delta or snapshot whenever the results change,
+        and None after KEEPALIVE_SECONDS without any change.
+
+        Args:
+            key: (vote_id, group_id) to follow.
+            initial: The current results, used as the first snapshot if the
+                stream has none yet.
+        """
+        stream = self._streams.get(key)
+        if stream is None:
+            stream = self._streams[key] = _Stream()
+            stream.latest = initial
+            stream.task = asyncio.create_task(self._produce(key, stream))
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=_SUBSCRIBER_QUEUE_SIZE)
+        queue.put_nowait(stream.latest)
+        stream.subscribers.add(queue)
+        try:
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_SECONDS)
+                except TimeoutError:
+                    yield None
+        finally:
+            stream.subscribers.discard(queue)
+            if not stream.subscribers and self._streams.get(key) is stream:
+                del self._streams[key]
+                stream.task.cancel()
+
+    async def _produce(self, key: StreamKey, stream: _Stream) -> None:
+        seen = (results_cache.versions((key[0],)), time.monotonic())
+        failures = 0
+        while True:
+            # Back off while updates keep failing, e.g. while the database is down
+            await asyncio.sleep(self._interval * 2 ** min(failures, _MAX_BACKOFF_DOUBLINGS))
+            try:
+                seen = await self._update(key, stream, *seen)
+            except Exception:
+                failures += 1
+                logger.exception("Failed to update streamed results for %s", key)
+            else:
+                failures = 0
+
+    async def _update(
+        self, key: StreamKey, stream: _Stream, seen_version: tuple[int, ...], refreshed_at: float
+    ) -> tuple[tuple[int, ...], float]:
+        """
+        Publishes the results if they may have changed since `seen_version`.
+        Returns the version and refresh time to compare against next.
+        """
+        vote_id, group_id = key
+        version = results_cache.versions((vote_id,))
+        stale = time.monotonic() - refreshed_at >= self._refresh
+        if version == seen_version and not stale:
+            return seen_version, refreshed_at
+
+        async with self._session_factory() as db:
+            if stale:
+                current = await vote_service.refresh_vote_results_async(db, vote_id, group_id)
+            else:
+                current = await vote_service.get_vote_results_async(db, vote_id, group_id)
+
+        if needs_snapshot(stream.latest, current):
+            message = current
+        else:
+            message = diff_results(stream.latest, current)
+        stream.latest = current
+        if message is not None:
+            for queue in list(stream.subscribers):
+                self._offer(queue, message, current)
+        return version, time.monotonic()
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, message: VoteResult | VoteResultDelta, snapshot: VoteResult) -> None:
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Skipped deltas can't be applied later, so start the viewer over
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(snapshot)
+
+
+results_broadcaster = ResultsBroadcaster(
+    session_factory=AsyncSessionLocal,
+    interval_ms=settings.RESULTS_STREAM_INTERVAL_MS,
+    refresh_seconds=settings.RESULTS_STREAM_REFRESH_SECONDS,
+)
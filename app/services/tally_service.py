@@ -0,0 +1,149 @@
+# app/services/tally_service.py
+
+from collections import Counter
+from typing import Iterable
+
+from sqlalchemy import delete, func, insert, select, text, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.dialects import upsert_insert
+from app.models import Voter, VoterVote, VoteTally
+from app.services.results_cache import results_cache
+
+vote_tallies = VoteTally.__table__
+
+_TALLY_KEY = ["votes_id", "groups_id", "candidates_id", "slot"]
+
+def tally_slot(voters_id):
+    """
+    Picks the counter slot for a ballot.
+
+    Works on plain ints as well as SQL column expressions, so the Python and
+    the SQL side (rebuild, PostgreSQL cast CTE) always agree on the slot.
+    """
+    return voters_id % settings.VOTE_TALLY_SLOTS
+
+
+def tally_upsert(dialect_name: str, source):
+    """
+    Builds an INSERT into vote_tallies that adds to existing counters on conflict.
+
+    Args:
+        dialect_name: The dialect of the session's bind.
+        source: A list of row dicts, or a SELECT yielding
+            (votes_id, groups_id, candidates_id, slot, vote_count).
+
+    Returns:
+        The statement, or None for dialects without INSERT ... ON CONFLICT.
+    """
+    insert_factory = upsert_insert(dialect_name)
+    if insert_factory is None:
+        return None
+    stmt = insert_factory(vote_tallies)
+    if isinstance(source, list):
+        stmt = stmt.values(source)
+    else:
+        stmt = stmt.from_select([*_TALLY_KEY, "vote_count"], source)
+    return stmt.on_conflict_do_update(
+        index_elements=_TALLY_KEY,
+        set_={"vote_count": vote_tallies.c.vote_count + stmt.excluded.vote_count},
+    )
+
+
+def record_ballots(db: Session, ballots: Iterable[tuple[int, int, int, int]]) -> None:
+    """
+    Adds ballots to the tallies inside the caller's transaction.
+
+    Ballots that land on the same counter row are pre-aggregated, so a batch
+    becomes a single multi-row upsert. Does not commit.
+
+    Args:
+        db: The SQLAlchemy database session.
+        ballots: (votes_id, groups_id, candidates_id, voters_id) per stored ballot.
+    """
+    increments = Counter(
+        (votes_id, groups_id, candidates_id, tally_slot(voters_id))
+        for votes_id, groups_id, candidates_id, voters_id in ballots
+    )
+    if not increments:
+        return
+
+    rows = [
+        dict(zip(_TALLY_KEY, key), vote_count=count)
+        for key, count in increments.items()
+    ]
+    stmt = tally_upsert(db.get_bind().dialect.name, rows)
+    if stmt is not None:
+        db.execute(stmt)
+        return
+
+    # Portable fallback: bump the counter, create it if nothing was updated
+    for row in rows:
+        result = db.execute(
+            update(VoteTally)
+            .where(*(getattr(VoteTally, column) == row[column] for column in _TALLY_KEY))
+            .values(vote_count=VoteTally.vote_count + row["vote_count"])
+        )
+        if result.rowcount == 0:
+            db.execute(insert(VoteTally).values(**row))
+
+
+def rebuild_vote_tallies(db: Session, vote_id: int | None = None) -> int:
+    """
+    Recomputes the tallies from voters_votes and commits.
+
+    Use this after changing VOTE_TALLY_SLOTS, after restoring ballots from a
+    backup, or to create the table on a database that predates it.
+
+    Safe to run while ballots are being cast: casts wait for the rebuild to
+    commit instead of landing between the delete and the re-insert, where
+    they would be lost from the tallies. On PostgreSQL the table is locked
+    against writes for the rebuild; SQLite serializes writers anyway.
+
+    Args:
+        db: The SQLAlchemy database session.
+        vote_id: Only rebuild this vote event; all events when omitted.
+
+    Returns:
+        The number of tally rows written.
+    """
+    vote_tallies.create(bind=db.connection(), checkfirst=True)
+    if db.get_bind().dialect.name == "postgresql":
+        # Reads go on; casts' tally upserts wait until the commit below. A cast
+        # committed before the lock is in the source query's snapshot, and one
+        # still waiting isn't, so every ballot is counted exactly once.
+        db.execute(text("LOCK TABLE vote_tallies IN EXCLUSIVE MODE"))
+
+    clear = delete(VoteTally)
+    source = (
+        select(
+            VoterVote.votes_id,
+            Voter.groups_id,
+            VoterVote.candidates_id,
+            tally_slot(VoterVote.voters_id).label("slot"),
+            func.count().label("vote_count"),
+        )
+        .join(Voter, Voter.voters_id == VoterVote.voters_id)
+        .where(VoterVote.candidates_id.is_not(None))
+        .group_by(
+            VoterVote.votes_id,
+            Voter.groups_id,
+            VoterVote.candidates_id,
+            tally_slot(VoterVote.voters_id),
+        )
+    )
+    if vote_id is not None:
+        clear = clear.where(VoteTally.votes_id == vote_id)
+        source = source.where(VoterVote.votes_id == vote_id)
+
+    db.execute(clear)
+    result = db.execute(
+        insert(VoteTally).from_select([*_TALLY_KEY, "vote_count"], source)
+    )
+    db.commit()
+    if vote_id is not None:
+        results_cache.bump(vote_id)
+    else:
+        results_cache.invalidate_all()
+    return result.rowcount
@@ -0,0 +1,96 @@
+# app/services/vote_registry.py
+
+import threading
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import Candidate, Vote
+from app.models.vote import vote_candidates_association
+from app.schemas.candidate import CandidateRead
+
+
+@dataclass(frozen=True)
+class VoteEntry:
+    """A vote event and its candidates, as held by the registry."""
+    votes_id: int
+    vote_title: str
+    candidates: tuple[CandidateRead, ...]
+    candidate_ids: frozenset[int]
+
+
+class VoteRegistry:
+    """
+    In-process cache of vote events and their candidate sets.
+
+    An event is loaded with one query the first time it is needed and then
+    served from memory, so validating a cast against its event adds no round
+    trips. Vote events are never edited after creation; create_vote_event
+    still invalidates the id it created. Unknown ids are not cached, so an
+    event created by another worker process is found on its first use here.
+    """
+
+    def __init__(self):
+        self._entries: dict[int, VoteEntry] = {}
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, vote_id: int) -> VoteEntry | None:
+        """
+        Returns the event, loading it on a miss, or None if it doesn't exist.
+        """
+        entry = self._entries.get(vote_id)
+        if entry is None:
+            entry = self._load(db, vote_id)
+            if entry is not None:
+                with self._lock:
+                    self._entries[vote_id] = entry
+        return entry
+
+    def invalidate(self, vote_id: int | None = None) -> None:
+        """
+        Forgets one event, or all of them.
+        """
+        with self._lock:
+            if vote_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(vote_id, None)
+
+    @staticmethod
+    def _load(db: Session, vote_id: int) -> VoteEntry | None:
+        rows = db.execute(
+            select(
+                Vote.vote_title,
+                Candidate.candidates_id,
+                Candidate.candidate_name,
+                Candidate.groups_id,
+            )
+            .outerjoin(
+                vote_candidates_association,
+                vote_candidates_association.c.votes_id == Vote.votes_id,
+            )
+            .outerjoin(
+                Candidate,
+                Candidate.candidates_id == vote_candidates_association.c.candidates_id,
+            )
+            .where(Vote.votes_id == vote_id)
+            .order_by(vote_candidates_association.c.vote_candidates_id)
+        ).all()
+        if not rows:
+            return None
+
+        candidates = tuple(
+            CandidateRead(candidates_id=cid, candidate_name=name, groups_id=gid)
+            for _, cid, name, gid in rows
+            if cid is not None
+        )
+        return VoteEntry(
+            votes_id=vote_id,
+            vote_title=rows[0].vote_title,
+            candidates=candidates,
+            candidate_ids=frozenset(c.candidates_id for c in candidates),
+        )
+
+
+vote_registry = VoteRegistry()
@@ -1,11 +1,47 @@
 # app/services/vote_service.py
 
 import datetime
+from collections import Counter
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.models import Vote, Candidate, Voter, VoterVote, Group
-from app.schemas.vote import VoteEventCreate, VoteCast, VoteResult, CandidateResult
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, Integer, literal, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from app.core import metrics
+from app.db.dialects import in_id_list, upsert_insert
+from app.db.replicas import reads_replica
+from app.models.vote import vote_candidates_association
+from app.models import Vote, Candidate, VoterVote, Group, VoteTally
+from app.schemas.candidate import CandidateRead
+from app.schemas.adapters import vote_cast_reads_adapter, vote_result_adapter, vote_result_matrix_adapter
+from app.schemas.vote import (
+    VoteEventCreate, VoteEventRead, VoteCast, VoteCastRead, VoteResult,
+    VoteCastBatchItem, VoteCastBatchResult, VoteResultMatrix,
+)
+from app.schemas.page import Page
+from app.services import tally_service
+from app.services.pagination import DEFAULT_PAGE_SIZE, keyset_page
+from app.services.phone_index import phone_index
+from app.services.results_cache import results_cache
+from app.services.vote_registry import vote_registry
 from typing import List
+
+VOTER_NOT_FOUND = "Voter with this phone number not found."
+ALREADY_VOTED = "This voter has already voted in this event."
+VOTE_NOT_FOUND = "Vote event not found."
+CANDIDATE_NOT_IN_VOTE = "This candidate is not part of this vote event."
+
+voters_votes = VoterVote.__table__
+
+# Columns of VoteCastRead, returned straight from the INSERT
+_CAST_RETURNING = (
+    voters_votes.c.voters_votes_id,
+    voters_votes.c.votes_id,
+    voters_votes.c.voters_id,
+    voters_votes.c.candidates_id,
+)
+
+
 def create_vote_event(db: Session, vote_event: VoteEventCreate) -> Vote:
     """
     Creates a new voting event and associates candidates with it.
@@ -24,112 +60,452 @@ def create_vote_event(db: Session, vote_event: VoteEventCreate) -> Vote:
     
     db.add(db_vote_event)
     db.commit()
-    db.refresh(db_vote_event)
+    vote_registry.invalidate(db_vote_event.votes_id)
     
     return db_vote_event
 
-def cast_vote(db: Session, vote_id: int, vote_cast: VoteCast) -> VoterVote:
+
+def list_vote_events(
+    db: Session, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None
+) -> Page[VoteEventRead]:
     """
-    Allows a voter to cast their vote, with several validation checks.
+    Lists vote events by id, one keyset page at a time.
+
+    Raises:
+        ValueError: If the cursor is invalid.
+    """
+    stmt = select(Vote.votes_id, Vote.vote_title)
+    return keyset_page(db, stmt, Vote.votes_id, VoteEventRead, limit, cursor)
+
+
+def _validate_cast(db: Session, vote_id: int, candidate_id: int) -> None:
+    """
+    Checks the event exists and offers the candidate, from the vote registry;
+    no query once the event has been loaded.
+
+    Raises:
+        ValueError: If the event is unknown or the candidate isn't on its ballot.
     """
-    # 1. Find the voter by their phone number
-    voter = db.query(Voter).filter(Voter.voter_phone == vote_cast.voter_phone).first()
-    if not voter:
-        raise ValueError("Voter with this phone number not found.")
+    entry = vote_registry.get(db, vote_id)
+    if entry is None:
+        raise ValueError(VOTE_NOT_FOUND)
+    if candidate_id not in entry.candidate_ids:
+        raise ValueError(CANDIDATE_NOT_IN_VOTE)
+
+
+def _cast_vote_postgresql(
+    db: Session, vote_id: int, candidate_id: int, voter_id: int, group_id: int
+) -> VoteCastRead:
+    """
+    PostgreSQL fast path: insert, duplicate detection and tally in one statement.
+
+    The insert and the tally increment are chained as CTEs. No row back means
+    the (voters_id, votes_id) unique constraint swallowed the insert (and the
+    tally CTE then has nothing to count).
+    """
+    inserted = (
+        postgresql.insert(voters_votes)
+        .values(voters_id=voter_id, votes_id=vote_id, candidates_id=candidate_id)
+        .on_conflict_do_nothing(index_elements=["voters_id", "votes_id"])
+        .returning(*_CAST_RETURNING)
+        .cte("inserted")
+    )
+    tally = tally_service.tally_upsert(
+        "postgresql",
+        select(
+            inserted.c.votes_id,
+            literal(group_id, Integer),
+            inserted.c.candidates_id,
+            tally_service.tally_slot(inserted.c.voters_id),
+            literal(1, Integer),
+        ),
+    ).cte("tally")
+    stmt = select(*inserted.c).add_cte(tally)
+
+    row = db.execute(stmt).first()
+    if row is None:
+        db.rollback()
+        raise ValueError(ALREADY_VOTED)
 
-    # 2. Check if the voter has already voted in this event
+    db.commit()
+    return VoteCastRead.model_validate(row)
+
+
+def _cast_vote_sqlite(
+    db: Session, vote_id: int, candidate_id: int, voter_id: int, group_id: int
+) -> VoteCastRead:
+    """
+    SQLite fast path: INSERT ... ON CONFLICT DO NOTHING RETURNING.
+
+    SQLite can't chain data-modifying CTEs, so the tally increment is a
+    second statement in the same transaction.
+    """
+    stmt = (
+        sqlite.insert(voters_votes)
+        .values(voters_id=voter_id, votes_id=vote_id, candidates_id=candidate_id)
+        .on_conflict_do_nothing(index_elements=["voters_id", "votes_id"])
+        .returning(*_CAST_RETURNING)
+    )
+
+    row = db.execute(stmt).first()
+    if row is None:
+        db.rollback()
+        raise ValueError(ALREADY_VOTED)
+
+    tally_service.record_ballots(db, [(vote_id, group_id, candidate_id, voter_id)])
+    db.commit()
+    return VoteCastRead.model_validate(row)
+
+
+def _cast_vote_generic(
+    db: Session, vote_id: int, candidate_id: int, voter_id: int, group_id: int
+) -> VoteCastRead:
+    """
+    Portable ORM path for dialects without an INSERT ... ON CONFLICT fast path.
+    """
+    # 1. Check if the voter has already voted in this event
     existing_vote = db.query(VoterVote).filter(
-        VoterVote.voters_id == voter.voters_id,
+        VoterVote.voters_id == voter_id,
         VoterVote.votes_id == vote_id
     ).first()
     if existing_vote:
-        raise ValueError("This voter has already voted in this event.")
+        raise ValueError(ALREADY_VOTED)
 
-    # 3. Create the vote record
+    # 2. Create the vote record
     db_voter_vote = VoterVote(
-        voters_id=voter.voters_id,
+        voters_id=voter_id,
         votes_id=vote_id,
-        candidates_id=vote_cast.candidate_id,
+        candidates_id=candidate_id,
         # vote_time is handled by the database default
     )
-    
+
     db.add(db_voter_vote)
-    db.commit()
+    tally_service.record_ballots(db, [(vote_id, group_id, candidate_id, voter_id)])
+    try:
+        db.commit()
+    except IntegrityError:
+        # A concurrent cast won the race between the check and the insert
+        db.rollback()
+        raise ValueError(ALREADY_VOTED)
     db.refresh(db_voter_vote)
-    
-    return db_voter_vote
 
+    return VoteCastRead.model_validate(db_voter_vote)
+
+
+_CAST_VOTE_BY_DIALECT = {
+    "postgresql": _cast_vote_postgresql,
+    "sqlite": _cast_vote_sqlite,
+}
+
+
+def cast_vote(db: Session, vote_id: int, vote_cast: VoteCast) -> VoteCastRead:
+    """
+    Allows a voter to cast their vote, with several validation checks.
+
+    The phone is resolved by the in-process phone index and the event and
+    candidate are validated against the vote registry, so a mistyped digit
+    is rejected without a round trip. On PostgreSQL and SQLite the insert and
+    the duplicate check then run as a single statement; duplicates are
+    detected by the (voters_id, votes_id) unique constraint instead of a prior
+    SELECT, so concurrent retries can't slip past the check.
+
+    Raises:
+        ValueError: If the event is unknown, the candidate isn't on its ballot,
+            the phone number is unknown or the voter has already voted.
+    """
+    try:
+        _validate_cast(db, vote_id, vote_cast.candidate_id)
+        voter = phone_index.lookup(db, vote_cast.voter_phone)
+        if voter is None:
+            raise ValueError(VOTER_NOT_FOUND)
+        fast_path = _CAST_VOTE_BY_DIALECT.get(db.get_bind().dialect.name, _cast_vote_generic)
+        vote_record = fast_path(db, vote_id, vote_cast.candidate_id, *voter)
+    except ValueError as e:
+        _count_rejected([e])
+        raise
+    results_cache.bump(vote_id)
+    metrics.BALLOTS_CAST.labels(str(vote_id)).inc()
+    return vote_record
+
+
+# Rows per multi-row INSERT; keeps bound parameters under SQLite's limit
+_CAST_CHUNK_SIZE = 1000
+
+
+def cast_votes_many(
+    db: Session, casts: list[tuple[int, VoteCast]]
+) -> list[VoteCastRead | ValueError]:
+    """
+    Casts a batch of votes and commits them in a single transaction.
+
+    Phones are resolved from the phone index (one query per chunk for the
+    phones it doesn't know) and the ballots are written
+    with one multi-row INSERT ... ON CONFLICT DO NOTHING per chunk, so a
+    duplicate or an unknown phone only fails its own item. The tallies of the
+    stored ballots are bumped with one upsert per chunk.
+
+    Args:
+        db: The SQLAlchemy database session.
+        casts: (vote_id, VoteCast) pairs, in submission order.
+
+    Returns:
+        One entry per input item, in the same order: the stored VoteCastRead,
+        or the ValueError that the single-cast path would have raised.
+    """
+    insert_factory = upsert_insert(db.get_bind().dialect.name)
+    if insert_factory is None:
+        # No multi-row upsert here: fall back to one transaction per cast
+        results: list[VoteCastRead | ValueError] = []
+        for vote_id, vote_cast in casts:
+            try:
+                results.append(cast_vote(db, vote_id, vote_cast))
+            except ValueError as e:
+                results.append(e)
+        return results
+
+    results = [None] * len(casts)
+    for start in range(0, len(casts), _CAST_CHUNK_SIZE):
+        chunk = casts[start:start + _CAST_CHUNK_SIZE]
+
+        # 1. Resolve every phone in the chunk; at most one query for index misses
+        voters = phone_index.lookup_many(db, {vote_cast.voter_phone for _, vote_cast in chunk})
+
+        # 2. Build the rows; the first ballot per (voter, event) in the batch wins
+        pending: dict[tuple[int, int], int] = {}
+        groups: dict[int, int] = {}
+        rows = []
+        for offset, (vote_id, vote_cast) in enumerate(chunk):
+            index = start + offset
+            try:
+                _validate_cast(db, vote_id, vote_cast.candidate_id)
+            except ValueError as e:
+                results[index] = e
+                continue
+            voter = voters.get(vote_cast.voter_phone)
+            if voter is None:
+                results[index] = ValueError(VOTER_NOT_FOUND)
+                continue
+            voter_id, group_id = voter
+            if (voter_id, vote_id) in pending:
+                results[index] = ValueError(ALREADY_VOTED)
+            else:
+                pending[(voter_id, vote_id)] = index
+                groups[voter_id] = group_id
+                rows.append(
+                    {"voters_id": voter_id, "votes_id": vote_id, "candidates_id": vote_cast.candidate_id}
+                )
+        if not rows:
+            continue
+
+        # 3. Insert them all; rows already in the table are skipped by the constraint.
+        # Executed with a parameter list, the statement is compiled once and
+        # cached, and SQLAlchemy's insertmanyvalues still sends multi-row INSERTs.
+        stmt = (
+            insert_factory(voters_votes)
+            .on_conflict_do_nothing(index_elements=["voters_id", "votes_id"])
+            .returning(*_CAST_RETURNING)
+        )
+        stored = db.execute(stmt, rows).all()
+        reads = vote_cast_reads_adapter.validate_python([row._asdict() for row in stored])
+        for read in reads:
+            results[pending.pop((read.voters_id, read.votes_id))] = read
+        for index in pending.values():
+            results[index] = ValueError(ALREADY_VOTED)
+
+        # 4. Count the stored ballots, in the same transaction
+        tally_service.record_ballots(
+            db,
+            [(row.votes_id, groups[row.voters_id], row.candidates_id, row.voters_id) for row in stored],
+        )
+
+    db.commit()
+    stored_per_vote = Counter(r.votes_id for r in results if isinstance(r, VoteCastRead))
+    results_cache.bump(*stored_per_vote)
+    for vote_id, stored_count in stored_per_vote.items():
+        metrics.BALLOTS_CAST.labels(str(vote_id)).inc(stored_count)
+    _count_rejected([r for r in results if isinstance(r, ValueError)])
+    return results
+
+
+
+# Batch item status for each error cast_votes_many can report
+_BATCH_STATUS_BY_ERROR = {
+    ALREADY_VOTED: "duplicate",
+    VOTER_NOT_FOUND: "unknown_voter",
+}
+
+
+def _count_rejected(errors: list[ValueError]) -> None:
+    for reason, count in Counter(_BATCH_STATUS_BY_ERROR.get(str(e), "invalid") for e in errors).items():
+        metrics.BALLOTS_REJECTED.labels(reason).inc(count)
+
+
+def cast_vote_batch(db: Session, vote_id: int, casts: list[VoteCast]) -> VoteCastBatchResult:
+    """
+    Casts many ballots of one vote event, e.g. scanned paper ballots or IVR
+    calls replayed after an outage, through cast_votes_many.
+
+    A duplicate, an unknown phone or a candidate outside the event only fails
+    its own item; everything accepted is committed together.
+
+    Returns:
+        Per-item outcomes in submission order, with counts per status.
+
+    Raises:
+        ValueError: If the vote event is not found.
+    """
+    if vote_registry.get(db, vote_id) is None:
+        raise ValueError(VOTE_NOT_FOUND)
+
+    items = []
+    for outcome in cast_votes_many(db, [(vote_id, vote_cast) for vote_cast in casts]):
+        if isinstance(outcome, VoteCastRead):
+            items.append(VoteCastBatchItem(status="accepted", voters_votes_id=outcome.voters_votes_id))
+        else:
+            status = _BATCH_STATUS_BY_ERROR.get(str(outcome), "invalid")
+            items.append(VoteCastBatchItem(status=status, detail=str(outcome)))
+
+    counts = Counter(item.status for item in items)
+    return VoteCastBatchResult(
+        accepted=counts["accepted"],
+        duplicates=counts["duplicate"],
+        unknown_voters=counts["unknown_voter"],
+        invalid=counts["invalid"],
+        results=items,
+    )
 
 
 def get_vote_results(db: Session, vote_id: int, group_id: int | None = None) -> VoteResult:
     """
     Calculates the results for a single vote event, with an optional filter by group.
+
+    Served from the in-process results cache while no ballot has been cast
+    for the event since the results were last computed.
     """
-    # 1. Fetch the vote event to get its title
-    vote_event = db.get(Vote, vote_id)
+    cached = results_cache.get(((vote_id,), group_id or None))
+    if cached is not None:
+        return cached
+    return refresh_vote_results(db, vote_id, group_id)
+
+
+def refresh_vote_results(db: Session, vote_id: int, group_id: int | None = None) -> VoteResult:
+    """
+    Recomputes the results of a vote event, bypassing the results cache, and
+    stores the fresh result in it. Picks up ballots cast by other processes.
+    """
+    key = ((vote_id,), group_id or None)
+    versions = results_cache.versions(key[0])
+    result = _tally_vote_results(db, vote_id, group_id)
+    _cache_results(db, key, versions, result)
+    return result
+
+
+def _cache_results(db: Session, key, versions: tuple[int, ...], result) -> None:
+    # A replica may not have the latest ballots yet; caching what it returned
+    # under the current versions would serve the lag until the next ballot
+    if not reads_replica(db):
+        results_cache.put(key, versions, result)
+
+
+def _tally_vote_results(db: Session, vote_id: int, group_id: int | None) -> VoteResult:
+    # 1. Look up the vote event (for its title) in the registry
+    vote_event = vote_registry.get(db, vote_id)
     if not vote_event:
-        raise ValueError("Vote event not found.")
+        raise ValueError(VOTE_NOT_FOUND)
 
-    # 2. Build the base query for counting votes
+    # 2. Sum the maintained tallies; a few rows per candidate, not one per ballot
     query = (
         db.query(
             Candidate.candidates_id,
             Candidate.candidate_name,
-            func.count(VoterVote.voters_votes_id).label("vote_count"),
+            func.sum(VoteTally.vote_count).label("vote_count"),
         )
-        .join(VoterVote, VoterVote.candidates_id == Candidate.candidates_id)
-        .filter(VoterVote.votes_id == vote_id)
+        .join(VoteTally, VoteTally.candidates_id == Candidate.candidates_id)
+        .filter(VoteTally.votes_id == vote_id)
     )
 
     # 3. If a group_id is provided, add a filter for it
     if group_id:
-        query = query.join(Voter, Voter.voters_id == VoterVote.voters_id).filter(
-            Voter.groups_id == group_id
-        )
+        query = query.filter(VoteTally.groups_id == group_id)
 
     # 4. Group by candidate and order the results
     results = (
         query.group_by(Candidate.candidates_id, Candidate.candidate_name)
-        .order_by(func.count(VoterVote.voters_votes_id).desc())
+        .order_by(func.sum(VoteTally.vote_count).desc())
         .all()
     )
 
-    # 5. Structure the results using our Pydantic schemas
+    # 5. Structure the results using our Pydantic schemas, validated in one pass
     breakdown = [
-        CandidateResult(
-            candidate_id=cid, candidate_name=cname, vote_count=count
-        )
+        {"candidate_id": cid, "candidate_name": cname, "vote_count": count}
         for cid, cname, count in results
     ]
-    total_votes = sum(item.vote_count for item in breakdown)
+    total_votes = sum(count for _, _, count in results)
 
-    return VoteResult(
-        vote_id=vote_id,
-        vote_title=vote_event.vote_title,
-        total_votes=total_votes,
-        breakdown=breakdown,
-    )
+    return vote_result_adapter.validate_python({
+        "vote_id": vote_id,
+        "vote_title": vote_event.vote_title,
+        "total_votes": total_votes,
+        "breakdown": breakdown,
+    })
 
 
 def combine_vote_results(db: Session, vote_ids: list[int], group_id: int | None = None) -> VoteResult:
     """
     Calculates the combined results for a list of vote events, with an optional filter by group.
     Validates that all events share the exact same set of candidates.
+
+    Served from the in-process results cache while none of the events has
+    received a ballot since the results were last computed.
     """
     if not vote_ids or len(vote_ids) < 2:
         raise ValueError("At least two vote IDs are required to combine results.")
 
-    # 1. Validate that all vote events have the same candidates
-    votes = db.query(Vote).filter(Vote.votes_id.in_(vote_ids)).all()
-    if len(votes) != len(vote_ids):
+    key = (tuple(vote_ids), group_id or None)
+    cached = results_cache.get(key)
+    if cached is not None:
+        return cached
+
+    versions = results_cache.versions(key[0])
+    result = _tally_combined_results(db, vote_ids, group_id)
+    _cache_results(db, key, versions, result)
+    return result
+
+
+def _tally_combined_results(db: Session, vote_ids: list[int], group_id: int | None) -> VoteResult:
+    dialect_name = db.get_bind().dialect.name
+
+    # 1. Validate that all vote events have the same candidates, in one query:
+    # an event matches the first one if it has as many candidates and all of
+    # them are also candidates of the first event
+    reference = vote_candidates_association.alias("reference")
+    own = vote_candidates_association.alias("own")
+    events = db.execute(
+        select(
+            Vote.votes_id,
+            Vote.vote_title,
+            func.count(own.c.candidates_id),
+            func.count(reference.c.candidates_id),
+        )
+        .outerjoin(own, own.c.votes_id == Vote.votes_id)
+        .outerjoin(
+            reference,
+            (reference.c.votes_id == vote_ids[0])
+            & (reference.c.candidates_id == own.c.candidates_id),
+        )
+        .where(in_id_list(dialect_name, Vote.votes_id, vote_ids))
+        .group_by(Vote.votes_id, Vote.vote_title)
+    ).all()
+    if len(events) != len(vote_ids):
         raise ValueError("One or more vote IDs are invalid.")
-    
-    first_candidate_set = {c.candidates_id for c in votes[0].candidates}
-    for vote in votes[1:]:
-        candidate_set = {c.candidates_id for c in vote.candidates}
-        if first_candidate_set != candidate_set:
+
+    by_id = {votes_id: (title, total, shared) for votes_id, title, total, shared in events}
+    reference_size = by_id[vote_ids[0]][1]
+    for votes_id in vote_ids[1:]:
+        _, total, shared = by_id[votes_id]
+        if total != reference_size or shared != reference_size:
             raise ValueError(
-                f"Cannot combine events. Vote ID {vote.votes_id} has a different set of candidates."
+                f"Cannot combine events. Vote ID {votes_id} has a different set of candidates."
             )
 
     # 2. The query is very similar to get_vote_results, but filters for multiple IDs
@@ -137,43 +513,137 @@ def combine_vote_results(db: Session, vote_ids: list[int], group_id: int | None
         db.query(
             Candidate.candidates_id,
             Candidate.candidate_name,
-            func.count(VoterVote.voters_votes_id).label("vote_count"),
+            func.sum(VoteTally.vote_count).label("vote_count"),
         )
-        .join(VoterVote, VoterVote.candidates_id == Candidate.candidates_id)
-        .filter(VoterVote.votes_id.in_(vote_ids)) # Key difference is here
+        .join(VoteTally, VoteTally.candidates_id == Candidate.candidates_id)
+        .filter(in_id_list(dialect_name, VoteTally.votes_id, vote_ids)) # Key difference is here
     )
 
     if group_id:
-        query = query.join(Voter, Voter.voters_id == VoterVote.voters_id).filter(
-            Voter.groups_id == group_id
-        )
+        query = query.filter(VoteTally.groups_id == group_id)
 
     results = (
         query.group_by(Candidate.candidates_id, Candidate.candidate_name)
-        .order_by(func.count(VoterVote.voters_votes_id).desc())
+        .order_by(func.sum(VoteTally.vote_count).desc())
         .all()
     )
     
     # 3. Structure the results
     breakdown = [
-        CandidateResult(
-            candidate_id=cid, candidate_name=cname, vote_count=count
-        )
+        {"candidate_id": cid, "candidate_name": cname, "vote_count": count}
         for cid, cname, count in results
     ]
-    total_votes = sum(item.vote_count for item in breakdown)
+    total_votes = sum(count for _, _, count in results)
     
-    combined_title = "Combined Results: " + " & ".join([v.vote_title for v in votes])
+    combined_title = "Combined Results: " + " & ".join(by_id[v][0] for v in vote_ids)
+
+    return vote_result_adapter.validate_python({
+        "vote_title": combined_title,
+        "total_votes": total_votes,
+        "breakdown": breakdown,
+    })
+
+
+
+def get_results_matrix(db: Session, vote_ids: list[int]) -> VoteResultMatrix:
+    """
+    Counts the votes of one or more vote events per candidate and per group.
+
+    All groups are covered by a single aggregate over the tallies, instead of
+    one results query per group. Every candidate of the events gets a row,
+    even without votes; only groups that cast at least one ballot get a column.
+    Rows are ordered by total votes, columns by group id.
 
-    return VoteResult(
-        vote_title=combined_title,
-        total_votes=total_votes,
-        breakdown=breakdown,
+    Served from the in-process results cache like get_vote_results.
+
+    Raises:
+        ValueError: If no vote ID is given or one of them is not found.
+    """
+    if not vote_ids:
+        raise ValueError("At least one vote ID is required.")
+
+    key = (tuple(vote_ids), "matrix")
+    cached = results_cache.get(key)
+    if cached is not None:
+        return cached
+
+    versions = results_cache.versions(key[0])
+    result = _tally_results_matrix(db, vote_ids)
+    _cache_results(db, key, versions, result)
+    return result
+
+
+def _tally_results_matrix(db: Session, vote_ids: list[int]) -> VoteResultMatrix:
+    # 1. Resolve the events and their candidates from the registry
+    events = []
+    for vote_id in vote_ids:
+        vote_event = vote_registry.get(db, vote_id)
+        if not vote_event:
+            raise ValueError(f"Vote event {vote_id} not found.")
+        events.append(vote_event)
+    candidate_names = {
+        c.candidates_id: c.candidate_name for event in events for c in event.candidates
+    }
+
+    # 2. One pass over the tallies: a count per (group, candidate)
+    cells = db.execute(
+        select(
+            VoteTally.groups_id,
+            Group.group_name,
+            VoteTally.candidates_id,
+            Candidate.candidate_name,
+            func.sum(VoteTally.vote_count),
+        )
+        .join(Group, Group.groups_id == VoteTally.groups_id)
+        .join(Candidate, Candidate.candidates_id == VoteTally.candidates_id)
+        .where(in_id_list(db.get_bind().dialect.name, VoteTally.votes_id, vote_ids))
+        .group_by(
+            VoteTally.groups_id,
+            Group.group_name,
+            VoteTally.candidates_id,
+            Candidate.candidate_name,
+        )
+    ).all()
+
+    # 3. Pivot into candidate rows and group columns
+    group_names = dict(sorted((gid, gname) for gid, gname, *_ in cells))
+    column = {gid: i for i, gid in enumerate(group_names)}
+    counts: dict[int, list[int]] = {cid: [0] * len(column) for cid in candidate_names}
+    for gid, _, cid, cname, count in cells:
+        candidate_names.setdefault(cid, cname)
+        counts.setdefault(cid, [0] * len(column))[column[gid]] = count
+
+    rows = sorted(
+        (
+            {
+                "candidate_id": cid,
+                "candidate_name": candidate_names[cid],
+                "counts": row,
+                "total": sum(row),
+            }
+            for cid, row in counts.items()
+        ),
+        key=lambda row: row["total"],
+        reverse=True,
     )
+    group_totals = [sum(row["counts"][i] for row in rows) for i in range(len(column))]
+
+    if len(events) == 1:
+        title = events[0].vote_title
+    else:
+        title = "Combined Results: " + " & ".join(event.vote_title for event in events)
 
+    return vote_result_matrix_adapter.validate_python({
+        "vote_ids": vote_ids,
+        "vote_title": title,
+        "groups": [{"group_id": gid, "group_name": gname} for gid, gname in group_names.items()],
+        "rows": rows,
+        "group_totals": group_totals,
+        "total_votes": sum(group_totals),
+    })
 
 
-def get_candidates_for_vote(db: Session, vote_id: int) -> List[Candidate]:
+def get_candidates_for_vote(db: Session, vote_id: int) -> List[CandidateRead]:
     """
     Retrieves a list of all candidates participating in a specific vote event.
 
@@ -182,17 +652,85 @@ def get_candidates_for_vote(db: Session, vote_id: int) -> List[Candidate]:
         vote_id: The ID of the vote event.
 
     Returns:
-        A list of Candidate SQLAlchemy model instances.
+        A list of CandidateRead schemas, served from the vote registry.
     
     Raises:
         ValueError: If the vote event with the given ID is not found.
     """
-    # Use session.get for a simple primary key lookup
-    vote_event = db.get(Vote, vote_id)
+    vote_event = vote_registry.get(db, vote_id)
 
     if not vote_event:
-        raise ValueError("Vote event not found.")
+        raise ValueError(VOTE_NOT_FOUND)
+
+    return list(vote_event.candidates)
+
+
+# --- Async API ---
+
+async def create_vote_event_async(db: AsyncSession, vote_event: VoteEventCreate) -> Vote:
+    """
+    Async variant of create_vote_event.
+    """
+    return await db.run_sync(create_vote_event, vote_event)
+
+
+async def list_vote_events_async(
+    db: AsyncSession, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None
+) -> Page[VoteEventRead]:
+    """
+    Async variant of list_vote_events.
+    """
+    return await db.run_sync(list_vote_events, limit, cursor)
+
+
+async def cast_vote_async(db: AsyncSession, vote_id: int, vote_cast: VoteCast) -> VoteCastRead:
+    """
+    Async variant of cast_vote.
+    """
+    return await db.run_sync(cast_vote, vote_id, vote_cast)
+
+
+async def cast_votes_many_async(
+    db: AsyncSession, casts: list[tuple[int, VoteCast]]
+) -> list[VoteCastRead | ValueError]:
+    """
+    Async variant of cast_votes_many.
+    """
+    return await db.run_sync(cast_votes_many, casts)
+
+
+async def get_vote_results_async(db: AsyncSession, vote_id: int, group_id: int | None = None) -> VoteResult:
+    """
+    Async variant of get_vote_results.
+    """
+    return await db.run_sync(get_vote_results, vote_id, group_id)
+
+
+async def refresh_vote_results_async(db: AsyncSession, vote_id: int, group_id: int | None = None) -> VoteResult:
+    """
+    Async variant of refresh_vote_results.
+    """
+    return await db.run_sync(refresh_vote_results, vote_id, group_id)
+
 
-    # Thanks to SQLAlchemy relationships, the candidates are already linked.
-    # We can just return them directly.
-    return vote_event.candidates
\ No newline at end of file
+async def combine_vote_results_async(
+    db: AsyncSession, vote_ids: list[int], group_id: int | None = None
+) -> VoteResult:
+    """
+    Async variant of combine_vote_results.
+    """
+    return await db.run_sync(combine_vote_results, vote_ids, group_id)
+
+
+async def get_results_matrix_async(db: AsyncSession, vote_ids: list[int]) -> VoteResultMatrix:
+    """
+    Async variant of get_results_matrix.
+    """
+    return await db.run_sync(get_results_matrix, vote_ids)
+
+
+async def get_candidates_for_vote_async(db: AsyncSession, vote_id: int) -> List[CandidateRead]:
+    """
+    Async variant of get_candidates_for_vote.
+    """
+    return await db.run_sync(get_candidates_for_vote, vote_id)
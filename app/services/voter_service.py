@@ -2,81 +2,307 @@
 
 import csv
 import io
-from typing import List
+import psycopg
+from typing import Callable
+from sqlalchemy import Column, Integer, MetaData, String, Table, delete, insert, select, true
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.util import await_only
+from app.db.dialects import upsert_insert
+from app.models.group import Group
 from app.models.voter import Voter
-from app.schemas.voter import VoterCreate
+from app.schemas.page import Page
+from app.schemas.voter import VoterCreate, VoterImportReject, VoterImportReport, VoterRead
+from app.services.pagination import DEFAULT_PAGE_SIZE, keyset_page
+from app.services.phone_index import normalize_phone, phone_index
+
+voters = Voter.__table__
+
+INVALID_PHONE = "Phone number has no digits."
 
 def create_voter(db: Session, voter: VoterCreate) -> Voter:
     """
     Creates a single new voter in the database.
 
+    The phone is stored normalized (digits only), so "050-123 4567" and
+    "0501234567" are the same voter and the unique constraint rejects the second.
+
     Args:
         db: The SQLAlchemy database session.
         voter: The Pydantic schema containing the voter's data.
 
     Returns:
         The newly created Voter SQLAlchemy model instance.
+
+    Raises:
+        ValueError: If the phone has no digits.
     """
+    voter_phone = normalize_phone(voter.voter_phone)
+    if not voter_phone:
+        raise ValueError(INVALID_PHONE)
     # Create a SQLAlchemy Voter model instance from the schema data
     db_voter = Voter(
         voter_name=voter.voter_name,
-        voter_phone=voter.voter_phone,
+        voter_phone=voter_phone,
         groups_id=voter.groups_id
     )
     db.add(db_voter)
     db.commit()
-    db.refresh(db_voter)
+    phone_index.add(db_voter.voter_phone, db_voter.voters_id, db_voter.groups_id)
     return db_voter
 
-def bulk_create_voters_from_csv(db: Session, csv_file: io.BytesIO) -> int:
+# Rows validated, deduplicated and written per round trip
+IMPORT_CHUNK_SIZE = 5000
+
+# Rejected rows listed individually in the report; the count is always exact
+MAX_REPORTED_REJECTS = 1000
+
+# Per-connection staging table the chunks are copied into before the merge
+voters_import_staging = Table(
+    "voters_import_staging",
+    MetaData(),
+    Column("voter_name", String),
+    Column("voter_phone", String),
+    Column("groups_id", Integer),
+    prefixes=["TEMPORARY"],
+)
+
+
+def import_voters_from_csv(
+    db: Session,
+    csv_file: io.BytesIO,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    progress: Callable[[VoterImportReport], None] | None = None,
+) -> VoterImportReport:
     """
-    Parses a CSV file and creates multiple voters in the database.
-    Assumes CSV format: voter_name,voter_phone,groups_id
+    Streams a CSV file into the voters table, chunk by chunk.
+    Assumes CSV format: voter_name,voter_phone,groups_id (first row is a header).
+
+    Rows are read incrementally, so memory stays bounded by `chunk_size`.
+    Phones are normalized as in create_voter. Each chunk is validated,
+    deduplicated by normalized phone, copied into a staging table
+    (COPY on PostgreSQL, executemany elsewhere) and merged into voters with
+    ON CONFLICT DO NOTHING, then committed. A bad row or an existing phone
+    only affects that row.
 
     Args:
         db: The SQLAlchemy database session.
         csv_file: The uploaded CSV file as a byte stream.
+        chunk_size: Rows per staging/merge round.
+        progress: Called with the running report after each committed chunk.
 
     Returns:
-        The number of voters successfully created.
+        A report with the inserted, skipped and rejected counts, and the line
+        numbers of (the first MAX_REPORTED_REJECTS) rejected rows.
     """
+    report = VoterImportReport()
+    group_ids = set(db.scalars(select(Group.groups_id)))
+    voters_import_staging.create(bind=db.connection(), checkfirst=True)
+
     # Decode the byte stream into a text stream
-    stream = io.TextIOWrapper(csv_file, encoding="utf-8")
-    
-    # Use the csv module to read the data
+    stream = io.TextIOWrapper(csv_file, encoding="utf-8", newline="")
     reader = csv.reader(stream)
-    
+
     # Skip the header row if there is one
     next(reader, None)
-    
-    voters_to_create: List[Voter] = []
+
+    def reject(line: int, reason: str) -> None:
+        report.rejected += 1
+        if len(report.rejects) < MAX_REPORTED_REJECTS:
+            report.rejects.append(VoterImportReject(line=line, reason=reason))
+
+    chunk: dict[str, tuple[str, str, int]] = {}
     for row in reader:
-        # Basic validation
-        if not row or len(row) < 3:
+        line = reader.line_num
+        # Blank lines are not rows
+        if not row or not any(field.strip() for field in row):
+            continue
+        if len(row) != 3:
+            reject(line, f"Expected 3 columns, got {len(row)}.")
+            continue
+
+        voter_name, raw_phone, groups_id_str = (field.strip() for field in row)
+        if not raw_phone:
+            reject(line, "Missing phone number.")
+            continue
+        voter_phone = normalize_phone(raw_phone)
+        if not voter_phone:
+            reject(line, INVALID_PHONE)
             continue
-            
-        voter_name, voter_phone, groups_id_str = row
-        
-        # Create a Voter model instance for each row
-        voter = Voter(
-            voter_name=voter_name.strip(),
-            voter_phone=voter_phone.strip(),
-            groups_id=int(groups_id_str.strip())
+        try:
+            groups_id = int(groups_id_str)
+        except ValueError:
+            reject(line, f"Invalid group ID {groups_id_str!r}.")
+            continue
+        if groups_id not in group_ids:
+            reject(line, f"Group {groups_id} does not exist.")
+            continue
+
+        if voter_phone in chunk:
+            report.skipped += 1
+            continue
+        chunk[voter_phone] = (voter_name, voter_phone, groups_id)
+        if len(chunk) >= chunk_size:
+            _merge_chunk(db, list(chunk.values()), report)
+            chunk.clear()
+            if progress is not None:
+                progress(report)
+
+    if chunk:
+        _merge_chunk(db, list(chunk.values()), report)
+    if progress is not None:
+        progress(report)
+    return report
+
+
+def _merge_chunk(db: Session, rows: list[tuple[str, str, int]], report: VoterImportReport) -> None:
+    """
+    Stages one chunk and merges it into voters, skipping phones already present.
+    Phones must already be normalized, so the conflict check compares like with like.
+    """
+    # 1. Load the chunk into the staging table
+    if db.get_bind().dialect.name == "postgresql":
+        _copy_to_staging(db, rows)
+    else:
+        db.execute(
+            voters_import_staging.insert(),
+            [{"voter_name": n, "voter_phone": p, "groups_id": g} for n, p, g in rows],
+        )
+
+    # 2. Merge into voters; existing phones are skipped, not errors
+    staged = select(
+        voters_import_staging.c.voter_name,
+        voters_import_staging.c.voter_phone,
+        voters_import_staging.c.groups_id,
+    ).where(true())
+    insert_factory = upsert_insert(db.get_bind().dialect.name)
+    if insert_factory is not None:
+        merge = (
+            insert_factory(voters)
+            .from_select(["voter_name", "voter_phone", "groups_id"], staged)
+            .on_conflict_do_nothing(index_elements=["voter_phone"])
+            .returning(voters.c.voter_phone, voters.c.voters_id, voters.c.groups_id)
         )
-        voters_to_create.append(voter)
-
-    if not voters_to_create:
-        return 0
-
-    try:
-        # Use add_all for efficient bulk insertion
-        db.add_all(voters_to_create)
-        db.commit()
-    except Exception as e:
-        # If any voter fails (e.g., duplicate phone), rollback the whole transaction
-        db.rollback()
-        # Re-raise the exception to be handled by the endpoint
-        raise e
-        
-    return len(voters_to_create)
\ No newline at end of file
+    else:
+        merge = insert(voters).from_select(
+            ["voter_name", "voter_phone", "groups_id"],
+            staged.where(voters_import_staging.c.voter_phone.not_in(select(voters.c.voter_phone))),
+        ).returning(voters.c.voter_phone, voters.c.voters_id, voters.c.groups_id)
+    inserted = db.execute(merge).all()
+
+    # 3. Empty the staging table for the next chunk and make the chunk durable
+    db.execute(delete(voters_import_staging))
+    db.commit()
+    phone_index.add_many(inserted)
+
+    report.inserted += len(inserted)
+    report.skipped += len(rows) - len(inserted)
+
+
+def _copy_to_staging(db: Session, rows: list[tuple[str, str, int]]) -> None:
+    """
+    Loads rows into the staging table with PostgreSQL COPY, on the session's
+    connection and transaction. Works with both the sync and the async psycopg
+    driver (the latter when called through run_sync).
+    """
+    driver_connection = db.connection().connection.driver_connection
+    copy_sql = "COPY voters_import_staging (voter_name, voter_phone, groups_id) FROM STDIN"
+
+    if isinstance(driver_connection, psycopg.AsyncConnection):
+        async def copy_rows():
+            async with driver_connection.cursor() as cursor:
+                async with cursor.copy(copy_sql) as copy:
+                    for row in rows:
+                        await copy.write_row(row)
+
+        await_only(copy_rows())
+        return
+
+    with driver_connection.cursor() as cursor:
+        with cursor.copy(copy_sql) as copy:
+            for row in rows:
+                copy.write_row(row)
+
+
+def bulk_create_voters_from_csv(db: Session, csv_file: io.BytesIO) -> int:
+    """
+    Parses a CSV file and creates multiple voters in the database.
+    Assumes CSV format: voter_name,voter_phone,groups_id
+
+    Args:
+        db: The SQLAlchemy database session.
+        csv_file: The uploaded CSV file as a byte stream.
+
+    Returns:
+        The number of voters successfully created. Use import_voters_from_csv
+        for the full report of skipped and rejected rows.
+    """
+    return import_voters_from_csv(db, csv_file).inserted
+
+
+def list_voters(
+    db: Session,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+    groups_id: int | None = None,
+    phone_prefix: str | None = None,
+) -> Page[VoterRead]:
+    """
+    Lists voters by id, one keyset page at a time.
+
+    Args:
+        db: The SQLAlchemy database session.
+        limit: Page size.
+        cursor: next_cursor of the previous page.
+        groups_id: Only voters of this group.
+        phone_prefix: Only voters whose phone starts with these digits.
+
+    Raises:
+        ValueError: If the cursor is invalid.
+    """
+    stmt = select(Voter.voters_id, Voter.voter_name, Voter.voter_phone, Voter.groups_id)
+    if groups_id is not None:
+        stmt = stmt.where(Voter.groups_id == groups_id)
+    # Stored phones are digits only; so is the prefix once normalized
+    phone_prefix = normalize_phone(phone_prefix)
+    if phone_prefix:
+        stmt = stmt.where(Voter.voter_phone.startswith(phone_prefix))
+    return keyset_page(db, stmt, Voter.voters_id, VoterRead, limit, cursor)
+
+
+# --- Async API ---
+
+async def create_voter_async(db: AsyncSession, voter: VoterCreate) -> Voter:
+    """
+    Async variant of create_voter.
+    """
+    return await db.run_sync(create_voter, voter)
+
+
+async def import_voters_from_csv_async(
+    db: AsyncSession, csv_file: io.BytesIO, chunk_size: int = IMPORT_CHUNK_SIZE
+) -> VoterImportReport:
+    """
+    Async variant of import_voters_from_csv.
+    """
+    return await db.run_sync(import_voters_from_csv, csv_file, chunk_size)
+
+
+async def bulk_create_voters_from_csv_async(db: AsyncSession, csv_file: io.BytesIO) -> int:
+    """
+    Async variant of bulk_create_voters_from_csv.
+    """
+    return await db.run_sync(bulk_create_voters_from_csv, csv_file)
+
+
+async def list_voters_async(
+    db: AsyncSession,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+    groups_id: int | None = None,
+    phone_prefix: str | None = None,
+) -> Page[VoterRead]:
+    """
+    Async variant of list_voters.
+    """
+    return await db.run_sync(list_voters, limit, cursor, groups_id, phone_prefix)
@@ -0,0 +1,157 @@
+# benchmarks/datagen.py
+"""
+Deterministic synthetic election data for the load benchmarks.
+
+The same seed and sizes always produce the same rows. Voter ids run from 1
+to the number of voters and each voter's phone is derived from their id
+(phone_for), so the load driver can address millions of voters without
+holding them in memory. Group sizes are uneven, as in real voter rolls.
+
+Run with:  python -m benchmarks.datagen --database-url sqlite:////tmp/bench.db --voters 2000000
+"""
+
+import argparse
+import datetime
+import os
+import random
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import Engine, create_engine, func, insert, select, text
+
+# Rows per INSERT round trip
+_CHUNK_SIZE = 10_000
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    seed: int = 2026
+    groups: int = 40
+    candidates_per_group: int = 3
+    voters: int = 100_000
+    events: int = 3
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """
+    What the load driver needs to know about a generated database.
+    """
+    voters: int
+    group_ids: tuple[int, ...]
+    candidates_by_vote: dict[int, tuple[int, ...]]
+
+
+def phone_for(voters_id: int) -> str:
+    """
+    The phone of a generated voter. Ids past the roll give phones no voter has.
+    """
+    return f"05{voters_id:08d}"
+
+
+def generate(engine: Engine, spec: DatasetSpec) -> Dataset:
+    """
+    Creates the schema and fills it with the dataset described by `spec`.
+    The database must be empty.
+    """
+    from app.models import Base, Candidate, Group, Vote, Voter
+    from app.models.vote import vote_candidates_association
+
+    Base.metadata.create_all(engine)
+    rng = random.Random(spec.seed)
+    group_ids = list(range(1, spec.groups + 1))
+    # Zipf-like group sizes: a few large groups, a long tail of small ones
+    weights = [1 / rank for rank in group_ids]
+
+    with engine.begin() as conn:
+        conn.execute(insert(Group), [
+            {"groups_id": g, "group_name": f"Group {g}"} for g in group_ids
+        ])
+        candidates = [
+            {"candidates_id": (g - 1) * spec.candidates_per_group + c + 1,
+             "candidate_name": f"Candidate {g}-{c + 1}",
+             "groups_id": g}
+            for g in group_ids
+            for c in range(spec.candidates_per_group)
+        ]
+        conn.execute(insert(Candidate), candidates)
+
+        candidate_ids = [c["candidates_id"] for c in candidates]
+        candidates_by_vote = {}
+        for v in range(1, spec.events + 1):
+            conn.execute(insert(Vote), [{
+                "votes_id": v,
+                "vote_title": f"Election {v}",
+                "vote_date": datetime.datetime(2026, 11, 3, 7, 0),
+            }])
+            # Each event offers a random half of all candidates
+            ballot = sorted(rng.sample(candidate_ids, max(2, len(candidate_ids) // 2)))
+            conn.execute(insert(vote_candidates_association), [
+                {"votes_id": v, "candidates_id": c} for c in ballot
+            ])
+            candidates_by_vote[v] = tuple(ballot)
+
+        for start in range(1, spec.voters + 1, _CHUNK_SIZE):
+            stop = min(start + _CHUNK_SIZE, spec.voters + 1)
+            groups = rng.choices(group_ids, weights=weights, k=stop - start)
+            conn.execute(insert(Voter), [
+                {"voters_id": i, "voter_name": f"Voter {i}", "voter_phone": phone_for(i), "groups_id": g}
+                for i, g in zip(range(start, stop), groups)
+            ])
+
+        if engine.dialect.name == "postgresql":
+            # The ids above were explicit; move the sequences past them
+            for table, column in (("groups", "groups_id"), ("candidates", "candidates_id"),
+                                  ("votes", "votes_id"), ("voters", "voters_id")):
+                conn.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', '{column}'), "
+                    f"(SELECT max({column}) FROM {table}))"
+                ))
+
+    return Dataset(spec.voters, tuple(group_ids), candidates_by_vote)
+
+
+def describe(engine: Engine) -> Dataset | None:
+    """
+    Reads back the dataset of an already generated database, or None if it has no voters.
+    """
+    from app.models import Group, Voter
+    from app.models.vote import vote_candidates_association
+
+    with engine.connect() as conn:
+        voters = conn.scalar(select(func.max(Voter.voters_id)))
+        if not voters:
+            return None
+        group_ids = tuple(conn.scalars(select(Group.groups_id).order_by(Group.groups_id)))
+        candidates_by_vote: dict[int, list[int]] = {}
+        for vote_id, candidate_id in conn.execute(
+            select(vote_candidates_association.c.votes_id, vote_candidates_association.c.candidates_id)
+            .order_by(vote_candidates_association.c.votes_id, vote_candidates_association.c.candidates_id)
+        ):
+            candidates_by_vote.setdefault(vote_id, []).append(candidate_id)
+    return Dataset(voters, group_ids, {v: tuple(c) for v, c in candidates_by_vote.items()})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.datagen")
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--seed", type=int, default=DatasetSpec.seed)
+    parser.add_argument("--groups", type=int, default=DatasetSpec.groups)
+    parser.add_argument("--candidates-per-group", type=int, default=DatasetSpec.candidates_per_group)
+    parser.add_argument("--voters", type=int, default=DatasetSpec.voters)
+    parser.add_argument("--events", type=int, default=DatasetSpec.events)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DATABASE_URL", args.database_url)
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+    spec = DatasetSpec(args.seed, args.groups, args.candidates_per_group, args.voters, args.events)
+    started = time.perf_counter()
+    dataset = generate(create_engine(args.database_url), spec)
+    print(
+        f"Generated {dataset.voters} voters in {len(dataset.group_ids)} groups and "
+        f"{len(dataset.candidates_by_vote)} events in {time.perf_counter() - started:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,401 @@
+# benchmarks/load.py
+"""
+Election-night load benchmark.
+
+Replays a deterministic, open-loop schedule of IVR-like traffic against the
+API and reports latency percentiles and throughput per endpoint:
+
+  casts      Poisson arrivals at --cast-rate per second, multiplied by
+             --burst-factor for --burst-length seconds out of every
+             --burst-every (the rush after each broadcast reminder)
+  retries    a fraction of casts is sent again shortly after, as an IVR
+             does when a call drops before the confirmation; these are
+             answered 400 "already voted"
+  unknown    a fraction of casts comes from phones not on the roll
+  polling    --dashboards clients poll the results, some of them by group
+
+Latency is measured from each request's scheduled time, so time spent
+queued behind a slow server counts (no coordinated omission). The app runs
+in-process by default, or behind uvicorn with --uvicorn (or any running
+server with --target URL, sharing --database-url).
+
+The database is generated with benchmarks.datagen on first use and its
+ballots are cleared before each run. Results are written as JSON with
+--output and compared with a stored run with --baseline; the exit status is
+1 if an endpoint's p95/p99 latency or throughput regressed beyond
+--tolerance. Baselines are machine-specific: record one on the machine that
+compares against it.
+
+Run with:  python -m benchmarks.load --baseline benchmarks/baselines/smoke.json
+           python -m benchmarks.load --profile election-night --uvicorn --workers 4
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, replace
+from typing import NamedTuple
+
+import httpx
+from sqlalchemy import create_engine, delete
+
+from benchmarks.datagen import Dataset, DatasetSpec, describe, generate, phone_for
+
+CAST = "POST /votes/{vote_id}/cast/"
+RESULTS = "GET /votes/{vote_id}/results/"
+RESULTS_BY_GROUP = "GET /votes/{vote_id}/results/by-group/{group_id}/"
+
+
+@dataclass(frozen=True)
+class LoadProfile:
+    duration: float = 20.0
+    cast_rate: float = 100.0
+    burst_every: float = 10.0
+    burst_length: float = 2.0
+    burst_factor: float = 5.0
+    retry_rate: float = 0.05
+    unknown_rate: float = 0.01
+    dashboards: int = 20
+    poll_interval: float = 1.0
+    max_in_flight: int = 256
+
+
+PROFILES = {
+    # Within what in-process SQLite serves without lock waits, so the tail
+    # latencies reflect the code rather than SQLite's busy-timeout backoff
+    "smoke": (DatasetSpec(voters=20_000), LoadProfile(duration=60.0, cast_rate=10.0)),
+    "election-night": (
+        DatasetSpec(voters=2_000_000, groups=200, events=5),
+        LoadProfile(duration=300.0, cast_rate=1000.0, burst_every=60.0, burst_length=10.0,
+                    dashboards=200, max_in_flight=2048),
+    ),
+}
+
+
+class ScheduledRequest(NamedTuple):
+    at: float
+    label: str
+    method: str
+    path: str
+    body: dict | None = None
+
+
+# --- Schedule ---
+
+def _voter_order(voters: int, rng: random.Random):
+    # A full-cycle affine permutation of 1..voters: each voter calls once per
+    # event (until the roll is exhausted) without materializing a shuffle
+    step = rng.randrange(voters // 3 + 1, voters) if voters > 2 else 1
+    while math.gcd(step, voters) != 1:
+        step += 1
+    offset = rng.randrange(voters)
+    return lambda i: (offset + i * step) % voters + 1
+
+
+def build_schedule(dataset: Dataset, profile: LoadProfile, seed: int) -> list[ScheduledRequest]:
+    """
+    The requests of one run, sorted by their offset from the start in seconds.
+    The same dataset, profile and seed always give the same schedule.
+    """
+    rng = random.Random(seed)
+    vote_ids = sorted(dataset.candidates_by_vote)
+    orders = {v: _voter_order(dataset.voters, rng) for v in vote_ids}
+    calls = dict.fromkeys(vote_ids, 0)
+    unknown = 0
+    schedule = []
+
+    def rate(t: float) -> float:
+        in_burst = t % profile.burst_every < profile.burst_length
+        return profile.cast_rate * (profile.burst_factor if in_burst else 1)
+
+    # Non-homogeneous Poisson arrivals, by thinning the peak rate
+    peak = profile.cast_rate * max(profile.burst_factor, 1)
+    t = 0.0
+    while True:
+        t += rng.expovariate(peak)
+        if t >= profile.duration:
+            break
+        if rng.random() * peak > rate(t):
+            continue
+        vote_id = rng.choice(vote_ids)
+        if rng.random() < profile.unknown_rate:
+            unknown += 1
+            phone = phone_for(dataset.voters + unknown)
+        else:
+            phone = phone_for(orders[vote_id](calls[vote_id]))
+            calls[vote_id] += 1
+        cast = {"voter_phone": phone, "candidate_id": rng.choice(dataset.candidates_by_vote[vote_id])}
+        path = f"/api/v1/votes/{vote_id}/cast/"
+        schedule.append(ScheduledRequest(t, CAST, "POST", path, cast))
+        if rng.random() < profile.retry_rate:
+            schedule.append(ScheduledRequest(t + rng.uniform(0.05, 0.5), CAST, "POST", path, cast))
+
+    for _ in range(profile.dashboards):
+        t = rng.uniform(0, profile.poll_interval)
+        while t < profile.duration:
+            vote_id = rng.choice(vote_ids)
+            if rng.random() < 1 / 3:
+                group_id = rng.choice(dataset.group_ids)
+                path = f"/api/v1/votes/{vote_id}/results/by-group/{group_id}/"
+                schedule.append(ScheduledRequest(t, RESULTS_BY_GROUP, "GET", path))
+            else:
+                schedule.append(ScheduledRequest(t, RESULTS, "GET", f"/api/v1/votes/{vote_id}/results/"))
+            t += profile.poll_interval * rng.uniform(0.9, 1.1)
+
+    schedule.sort(key=lambda request: request.at)
+    return schedule
+
+
+# --- Replay ---
+
+async def replay(
+    client: httpx.AsyncClient, schedule: list[ScheduledRequest], max_in_flight: int
+) -> tuple[dict[str, list[tuple[float, int]]], float]:
+    """
+    Sends each request at its scheduled time. Returns (latency, status) samples
+    per endpoint label, status 0 meaning a transport error, and the wall time.
+    """
+    samples: dict[str, list[tuple[float, int]]] = defaultdict(list)
+    in_flight = asyncio.Semaphore(max_in_flight)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    async def send(request: ScheduledRequest) -> None:
+        due = start + request.at
+        async with in_flight:
+            try:
+                response = await client.request(request.method, request.path, json=request.body)
+                status = response.status_code
+            except httpx.HTTPError:
+                status = 0
+        samples[request.label].append((loop.time() - due, status))
+
+    tasks = []
+    for request in schedule:
+        delay = start + request.at - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(send(request)))
+    await asyncio.gather(*tasks)
+    return samples, loop.time() - start
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    # Nearest rank
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def summarize(samples: dict[str, list[tuple[float, int]]], wall_seconds: float) -> dict[str, dict]:
+    """
+    Latency percentiles (ms), throughput and status counts per endpoint.
+    Statuses below 500 are answers (a duplicate cast's 400 included); 5xx
+    and transport failures are counted as errors.
+    """
+    endpoints = {}
+    for label, entries in sorted(samples.items()):
+        latencies = sorted(latency for latency, _ in entries)
+        statuses: dict[str, int] = defaultdict(int)
+        for _, status in entries:
+            statuses[str(status)] += 1
+        endpoints[label] = {
+            "requests": len(entries),
+            "throughput_rps": round(len(entries) / wall_seconds, 2),
+            "p50_ms": round(_percentile(latencies, 0.50) * 1000, 2),
+            "p95_ms": round(_percentile(latencies, 0.95) * 1000, 2),
+            "p99_ms": round(_percentile(latencies, 0.99) * 1000, 2),
+            "max_ms": round(latencies[-1] * 1000, 2),
+            "errors": sum(1 for _, status in entries if status == 0 or status >= 500),
+            "statuses": dict(sorted(statuses.items())),
+        }
+    return endpoints
+
+
+def compare(current: dict, baseline: dict, tolerance: float, min_delta_ms: float = 10.0) -> list[str]:
+    """
+    Regressions of `current` against `baseline` (both as written by --output):
+    p95/p99 latency up by more than `tolerance` and `min_delta_ms`, throughput
+    down by more than `tolerance`, and any new errors.
+    """
+    regressions = []
+    for label, before in baseline["endpoints"].items():
+        after = current["endpoints"].get(label)
+        if after is None:
+            regressions.append(f"{label}: not measured")
+            continue
+        for metric in ("p95_ms", "p99_ms"):
+            limit = max(before[metric] * (1 + tolerance), before[metric] + min_delta_ms)
+            if after[metric] > limit:
+                regressions.append(f"{label}: {metric} {before[metric]} -> {after[metric]}")
+        if after["throughput_rps"] < before["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{label}: throughput_rps {before['throughput_rps']} -> {after['throughput_rps']}"
+            )
+        if after["errors"] > before["errors"]:
+            regressions.append(f"{label}: errors {before['errors']} -> {after['errors']}")
+    return regressions
+
+
+# --- Targets ---
+
+def prepare_database(database_url: str, spec: DatasetSpec) -> Dataset:
+    """
+    Generates the dataset if the database has none, and clears the ballots of
+    earlier runs.
+    """
+    from app.models import VoterVote, VoteTally
+
+    engine = create_engine(database_url)
+    dataset = describe(engine) if _has_schema(engine) else None
+    if dataset is None:
+        print(f"Generating {spec.voters} voters...", file=sys.stderr)
+        dataset = generate(engine, spec)
+    with engine.begin() as conn:
+        if engine.dialect.name == "sqlite":
+            # Persistent: lets the results reads run while a cast is writing
+            conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+        conn.execute(delete(VoteTally))
+        conn.execute(delete(VoterVote))
+    engine.dispose()
+    return dataset
+
+
+def _has_schema(engine) -> bool:
+    from sqlalchemy import inspect
+    return inspect(engine).has_table("voters")
+
+
+async def run_in_process(schedule: list[ScheduledRequest], max_in_flight: int):
+    from main import app
+
+    async with app.router.lifespan_context(app):
+        # Unhandled errors become 500s, as they would behind a server
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            return await replay(client, schedule, max_in_flight)
+
+
+async def run_against(url: str, schedule: list[ScheduledRequest], max_in_flight: int):
+    limits = httpx.Limits(max_connections=max_in_flight, max_keepalive_connections=max_in_flight)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        return await replay(client, schedule, max_in_flight)
+
+
+def start_uvicorn(port: int, workers: int) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        env=os.environ.copy(),
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/").status_code == 200:
+                return server
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("uvicorn didn't start within 60s")
+
+
+# --- CLI ---
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="smoke")
+    parser.add_argument("--database-url", help="defaults to a SQLite file per profile in the temp directory")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--duration", type=float, help="override the profile's duration (s)")
+    parser.add_argument("--cast-rate", type=float, help="override the profile's base casts per second")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--target", help="URL of a running server on the same database")
+    target.add_argument("--uvicorn", action="store_true", help="start uvicorn instead of running in-process")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--baseline", help="compare with results written by --output")
+    # p99 of the smoke profile varies by up to 40% between identical runs
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    parser.add_argument("--min-delta-ms", type=float, default=10.0)
+    args = parser.parse_args()
+
+    spec, profile = PROFILES[args.profile]
+    if args.duration is not None:
+        profile = replace(profile, duration=args.duration)
+    if args.cast_rate is not None:
+        profile = replace(profile, cast_rate=args.cast_rate)
+    database_url = args.database_url or (
+        f"sqlite:///{os.path.join(tempfile.gettempdir(), f'yemot-vote-bench-{args.profile}.db')}"
+    )
+    # Read by app.core.config when the app is imported or uvicorn starts
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+    os.environ.setdefault("PHONE_INDEX_WARM_ON_STARTUP", "true")
+
+    dataset = prepare_database(database_url, spec)
+    schedule = build_schedule(dataset, profile, args.seed)
+    print(f"Replaying {len(schedule)} requests over {profile.duration:.0f}s...", file=sys.stderr)
+
+    if args.uvicorn:
+        server = start_uvicorn(args.port, args.workers)
+        try:
+            samples, wall = asyncio.run(
+                run_against(f"http://127.0.0.1:{args.port}", schedule, profile.max_in_flight)
+            )
+        finally:
+            server.terminate()
+            server.wait()
+        target_name = f"uvicorn x{args.workers}"
+    elif args.target:
+        samples, wall = asyncio.run(run_against(args.target, schedule, profile.max_in_flight))
+        target_name = args.target
+    else:
+        samples, wall = asyncio.run(run_in_process(schedule, profile.max_in_flight))
+        target_name = "in-process"
+
+    results = {
+        "meta": {
+            "profile": args.profile,
+            "target": target_name,
+            "database": create_engine(database_url).dialect.name,
+            "seed": args.seed,
+            "dataset": asdict(spec),
+            "load": asdict(profile),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "wall_seconds": round(wall, 2),
+        },
+        "endpoints": summarize(samples, wall),
+    }
+
+    print(f"{'endpoint':<52}{'req':>7}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'err':>6}")
+    for label, stats in results["endpoints"].items():
+        print(
+            f"{label:<52}{stats['requests']:>7}{stats['throughput_rps']:>9.1f}"
+            f"{stats['p50_ms']:>7.1f}ms{stats['p95_ms']:>7.1f}ms{stats['p99_ms']:>7.1f}ms{stats['errors']:>6}"
+        )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance, args.min_delta_ms)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
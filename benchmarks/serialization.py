@@ -0,0 +1,132 @@
+# benchmarks/serialization.py
+"""
+Response serialization microbenchmark, per endpoint.
+
+Compares, on synthetic rows (no database), the time from query rows to
+response bytes:
+
+  before: one model per row, then FastAPI's response_model path
+          (re-validation + jsonable_encoder) and the stdlib JSONResponse
+  after:  plain dicts validated in one call by a prebuilt TypeAdapter, then
+          serialized in one pass (app.api.responses.json_response)
+
+Run with:  python -m benchmarks.serialization
+"""
+
+import os
+import timeit
+from collections import namedtuple
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.api.responses import json_response
+from app.schemas.adapters import type_adapter, vote_result_adapter, vote_result_matrix_adapter
+from app.schemas.page import Page
+from app.schemas.vote import (
+    CandidateResult, ResultMatrixGroup, ResultMatrixRow, VoteResult, VoteResultMatrix,
+)
+from app.schemas.voter import VoterRead
+
+VoterRow = namedtuple("VoterRow", "voters_id voter_name voter_phone groups_id")
+
+
+def _fastapi_path(response_model, content) -> bytes:
+    field = _FIELDS.setdefault(response_model, create_model_field("Response", response_model))
+    coro = serialize_response(field=field, response_content=content)
+    try:
+        coro.send(None)
+    except StopIteration as done:
+        return JSONResponse(done.value).body
+    raise RuntimeError("serialize_response awaited")
+
+
+_FIELDS = {}
+
+
+def results_case(candidates: int):
+    rows = [(i, f"Candidate {i}", 1000 - i) for i in range(candidates)]
+
+    def before():
+        breakdown = [CandidateResult(candidate_id=c, candidate_name=n, vote_count=v) for c, n, v in rows]
+        result = VoteResult(vote_id=1, vote_title="Vote", total_votes=0, breakdown=breakdown)
+        return _fastapi_path(VoteResult, result)
+
+    def after():
+        breakdown = [{"candidate_id": c, "candidate_name": n, "vote_count": v} for c, n, v in rows]
+        result = vote_result_adapter.validate_python(
+            {"vote_id": 1, "vote_title": "Vote", "total_votes": 0, "breakdown": breakdown}
+        )
+        return json_response(vote_result_adapter, result).body
+
+    return before, after
+
+
+def matrix_case(candidates: int, groups: int):
+    rows = [(i, f"Candidate {i}", [i + g for g in range(groups)]) for i in range(candidates)]
+    columns = [(g, f"Group {g}") for g in range(groups)]
+
+    def before():
+        matrix = VoteResultMatrix(
+            vote_ids=[1],
+            vote_title="Vote",
+            groups=[ResultMatrixGroup(group_id=g, group_name=n) for g, n in columns],
+            rows=[ResultMatrixRow(candidate_id=c, candidate_name=n, counts=k, total=sum(k)) for c, n, k in rows],
+            group_totals=[0] * groups,
+            total_votes=0,
+        )
+        return _fastapi_path(VoteResultMatrix, matrix)
+
+    def after():
+        matrix = vote_result_matrix_adapter.validate_python({
+            "vote_ids": [1],
+            "vote_title": "Vote",
+            "groups": [{"group_id": g, "group_name": n} for g, n in columns],
+            "rows": [{"candidate_id": c, "candidate_name": n, "counts": k, "total": sum(k)} for c, n, k in rows],
+            "group_totals": [0] * groups,
+            "total_votes": 0,
+        })
+        return json_response(vote_result_matrix_adapter, matrix).body
+
+    return before, after
+
+
+def voters_page_case(size: int):
+    rows = [VoterRow(i, f"Voter {i}", f"05{i:08d}", i % 40) for i in range(size)]
+    adapter = type_adapter(Page[VoterRead])
+
+    def before():
+        page = Page[VoterRead](items=[VoterRead.model_validate(row) for row in rows], next_cursor="x")
+        return _fastapi_path(Page[VoterRead], page)
+
+    def after():
+        page = adapter.validate_python({"items": [row._asdict() for row in rows], "next_cursor": "x"})
+        return json_response(adapter, page).body
+
+    return before, after
+
+
+CASES = {
+    "GET /votes/{id}/results/ (20 candidates)": results_case(20),
+    "GET /votes/{id}/results/ (2000 candidates)": results_case(2000),
+    "POST /votes/results/matrix/ (200 x 50)": matrix_case(200, 50),
+    "GET /voters/ (page of 500)": voters_page_case(500),
+}
+
+
+def main(repeat: int = 5) -> None:
+    print(f"{'endpoint':<46}{'before':>12}{'after':>12}{'speedup':>10}")
+    for name, (before, after) in CASES.items():
+        assert before() == after(), name  # same bytes either way
+        number = max(1, int(0.2 / (timeit.timeit(before, number=1) or 1e-6)))
+        slow = min(timeit.repeat(before, number=number, repeat=repeat)) / number
+        fast = min(timeit.repeat(after, number=number, repeat=repeat)) / number
+        print(f"{name:<46}{slow * 1e6:>10.0f}us{fast * 1e6:>10.0f}us{slow / fast:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
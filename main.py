@@ -1,12 +1,47 @@
 # main.py
+from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse, Response
 from app.api.v1.api import api_router
+from starlette.concurrency import run_in_threadpool
+from app.core.admission import AdmissionMiddleware, CAST_LANE, GENERAL_LANE, Lane
 from app.core.config import settings
+from app.core.logging_config import configure_logging
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.core.request_context import RequestContextMiddleware
+from app.db.session import SessionLocal
+from app.services.cast_buffer import cast_buffer
+from app.services.import_jobs import import_jobs
+from app.services.phone_index import phone_index
+
+configure_logging()
+
+
+def _warm_phone_index():
+    with SessionLocal() as db:
+        phone_index.warm(db)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the voter roll up front so the first casts don't pay for it
+    if settings.PHONE_INDEX_WARM_ON_STARTUP:
+        await run_in_threadpool(_warm_phone_index)
+    # Start the group-commit flusher before serving casts, and drain it on shutdown
+    if settings.CAST_BUFFER_ENABLED:
+        cast_buffer.start()
+    yield
+    cast_buffer.stop()
+    import_jobs.shutdown()
+
 
 app = FastAPI(
     title="Voting System API",
-    openapi_url="/api/v1/openapi.json"
+    openapi_url="/api/v1/openapi.json",
+    lifespan=lifespan,
+    # Responses that still go through response_model are encoded with orjson
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -17,6 +52,21 @@ origins = [
     "https://vote.hapitron.online", 
 ]
 
+# Innermost, so shed requests still get CORS headers and show up in the metrics
+if settings.ADMISSION_CONTROL_ENABLED:
+    max_wait = settings.ADMISSION_MAX_WAIT_MS / 1000
+    app.add_middleware(
+        AdmissionMiddleware,
+        lanes={
+            CAST_LANE: Lane(
+                CAST_LANE, settings.ADMISSION_CAST_CONCURRENCY, settings.ADMISSION_CAST_QUEUE, max_wait
+            ),
+            GENERAL_LANE: Lane(
+                GENERAL_LANE, settings.ADMISSION_GENERAL_CONCURRENCY, settings.ADMISSION_GENERAL_QUEUE, max_wait
+            ),
+        },
+        retry_after_seconds=settings.ADMISSION_RETRY_AFTER_SECONDS,
+    )
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,  # Allows specific origins
@@ -24,9 +74,23 @@ app.add_middleware(
     allow_methods=["*"],    # Allows all methods (GET, POST, etc.)
     allow_headers=["*"],    # Allows all headers
 )
+app.add_middleware(RequestContextMiddleware)
+# Outermost, so the latency includes the other middleware
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Include the main router with a global prefix
 app.include_router(api_router, prefix="/api/v1")
 
 @app.get("/")
 def read_root():
-    return {"message": "Welcome to the Voting API"}
\ No newline at end of file
+    return {"message": "Welcome to the Voting API"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """
+    Prometheus scrape endpoint.
+    """
+    payload, content_type = render_metrics()
+    return Response(payload, media_type=content_type)
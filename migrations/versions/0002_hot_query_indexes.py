@@ -0,0 +1,60 @@
+"""hot query indexes
+
+Indexes for the queries that grow with turnout: one event's ballots by
+candidate (tally rebuilds, exports) and one group's voters in id order.
+
+On PostgreSQL they are built CONCURRENTLY, outside the migration's
+transaction, so ballots keep being written while they build.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_voters_votes_votes_id_candidates_id',
+            'voters_votes',
+            ['votes_id', 'candidates_id'],
+            postgresql_include=['voters_id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_voters_groups_id_voters_id',
+            'voters',
+            ['groups_id', 'voters_id'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_voters_groups_id_voters_id',
+            table_name='voters',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            'ix_voters_votes_votes_id_candidates_id',
+            table_name='voters_votes',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
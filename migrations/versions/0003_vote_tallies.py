@@ -0,0 +1,76 @@
+"""vote tallies
+
+The sharded ballot counters read by the results endpoints and bumped by every
+cast, filled from the ballots already in voters_votes (the same aggregate as
+`python -m app.cli rebuild-tallies`). Run this before serving casts on a
+database that predates the table.
+
+Ballots are spread over the default 8 slots. Totals don't depend on the slot;
+run rebuild-tallies to respread them if VOTE_TALLY_SLOTS is set otherwise.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# VOTE_TALLY_SLOTS as of this revision
+_TALLY_SLOTS = 8
+
+# The tables as of this revision, not as the models describe them today
+voters = sa.table('voters', sa.column('voters_id'), sa.column('groups_id'))
+voters_votes = sa.table(
+    'voters_votes', sa.column('voters_id'), sa.column('votes_id'), sa.column('candidates_id')
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    vote_tallies = op.create_table('vote_tallies',
+    sa.Column('votes_id', sa.Integer(), nullable=False),
+    sa.Column('groups_id', sa.Integer(), nullable=False),
+    sa.Column('candidates_id', sa.Integer(), nullable=False),
+    sa.Column('slot', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('vote_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['candidates_id'], ['candidates.candidates_id'], ),
+    sa.ForeignKeyConstraint(['groups_id'], ['groups.groups_id'], ),
+    sa.ForeignKeyConstraint(['votes_id'], ['votes.votes_id'], ),
+    sa.PrimaryKeyConstraint('votes_id', 'groups_id', 'candidates_id', 'slot')
+    )
+
+    # Backfill: one counter row per (event, group, candidate, slot) of the
+    # existing ballots, slotted as the application slots new ones
+    slot = voters_votes.c.voters_id % _TALLY_SLOTS
+    source = (
+        sa.select(
+            voters_votes.c.votes_id,
+            voters.c.groups_id,
+            voters_votes.c.candidates_id,
+            slot,
+            sa.func.count(),
+        )
+        .join(voters, voters.c.voters_id == voters_votes.c.voters_id)
+        .where(voters_votes.c.candidates_id.is_not(None))
+        .group_by(voters_votes.c.votes_id, voters.c.groups_id, voters_votes.c.candidates_id, slot)
+    )
+    op.execute(
+        vote_tallies.insert().from_select(
+            ['votes_id', 'groups_id', 'candidates_id', 'slot', 'vote_count'], source
+        )
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('vote_tallies')
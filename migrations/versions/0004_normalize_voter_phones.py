@@ -0,0 +1,78 @@
+"""normalize voter phones
+
+Phones are now stored as digits only (see voter_service.create_voter), so the
+unique constraint on voters.voter_phone holds for the normalized number and
+every formatting of it finds the same voter. This rewrites the phones stored
+before that.
+
+If two voters' phones normalize to the same digits the migration stops and
+lists them: which one is the real voter is a decision for an operator, and
+both may already have ballots.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+voters = sa.table('voters', sa.column('voters_id'), sa.column('voter_phone'))
+
+# Phone normalization as of this revision: digits only
+_NON_DIGITS = re.compile(r"[^0-9]")
+
+# Collisions listed in the error
+_MAX_REPORTED = 20
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    owners: dict[str, list[int]] = {}
+    changes = []
+    for voters_id, phone in bind.execute(
+        sa.select(voters.c.voters_id, voters.c.voter_phone).order_by(voters.c.voters_id)
+    ):
+        digits = _NON_DIGITS.sub("", phone or "")
+        # A phone without digits is left as it is; no lookup can match it
+        if not digits:
+            continue
+        owners.setdefault(digits, []).append(voters_id)
+        if digits != phone:
+            changes.append({"id": voters_id, "phone": digits})
+
+    collisions = {digits: ids for digits, ids in owners.items() if len(ids) > 1}
+    if collisions:
+        listing = "; ".join(
+            f"{digits}: voters {', '.join(map(str, ids))}"
+            for digits, ids in list(collisions.items())[:_MAX_REPORTED]
+        )
+        raise RuntimeError(
+            f"{len(collisions)} phone numbers are registered to more than one voter "
+            f"once normalized. Merge or correct them, then rerun the upgrade. {listing}"
+        )
+
+    if changes:
+        bind.execute(
+            voters.update()
+            .where(voters.c.voters_id == sa.bindparam("id"))
+            .values(voter_phone=sa.bindparam("phone")),
+            changes,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The original formatting isn't kept; normalized phones stay valid
+    pass
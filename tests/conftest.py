@@ -0,0 +1,44 @@
+# tests/conftest.py
+
+import os
+import tempfile
+
+import pytest
+
+# app.core.config builds its Settings() at import time, so the required
+# variables must exist before any app module that reads them is imported.
+# A file rather than an in-memory database, so the app's sync and async
+# engines see the same data when a test drives the API.
+_DATABASE_DIR = tempfile.mkdtemp(prefix="yemot-vote-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_DATABASE_DIR, 'app.db')}")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+
+
+@pytest.fixture()
+def anyio_backend():
+    """
+    Runs the anyio-marked tests on asyncio only; the app's drivers need it.
+    """
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+def reset_service_caches():
+    """
+    Each test builds a fresh database whose ids restart at 1, so results, vote
+    events, voters and idempotent casts cached by an earlier test must not leak into the next one.
+    """
+    from app.services.idempotency import cast_idempotency
+    from app.services.phone_index import phone_index
+    from app.services.results_cache import results_cache
+    from app.services.vote_registry import vote_registry
+
+    results_cache.clear()
+    vote_registry.invalidate()
+    phone_index.clear()
+    cast_idempotency.clear()
+    yield
+    results_cache.clear()
+    vote_registry.invalidate()
+    phone_index.clear()
+    cast_idempotency.clear()
@@ -0,0 +1,66 @@
+# tests/query_budget.py
+
+"""
+Counts the SQL statements a request emits, for query-budget assertions.
+
+    recorder = StatementRecorder(app, engine, async_engine.sync_engine)
+    client = TestClient(recorder)
+    client.get("/api/v1/groups/")
+    assert_within_budget(recorder.statements, budget=1, route="GET /api/v1/groups/")
+
+Only statements issued while serving the request are counted: the recorder
+sets a context variable around each request, which its threadpool calls and
+AsyncSession greenlets inherit and background threads (import jobs, the cast
+buffer) don't.
+"""
+
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+_recording: ContextVar[list[str] | None] = ContextVar("recorded_statements", default=None)
+
+
+def _record(conn, cursor, statement, parameters, context, executemany):
+    statements = _recording.get()
+    if statements is not None:
+        statements.append(statement)
+
+
+class StatementRecorder:
+    """
+    ASGI wrapper that records the statements of the last request on `engines`.
+    """
+
+    def __init__(self, app, *engines):
+        self.app = app
+        self.statements: list[str] = []
+        self._engines = engines
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", _record)
+
+    def close(self) -> None:
+        for engine in self._engines:
+            event.remove(engine, "before_cursor_execute", _record)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        self.statements = []
+        token = _recording.set(self.statements)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _recording.reset(token)
+
+
+def assert_within_budget(statements: list[str], budget: int, route: str) -> None:
+    """
+    Fails with every statement listed when there are more than `budget`.
+    """
+    if len(statements) > budget:
+        listing = "\n".join(f"  {i}. {' '.join(s.split())}" for i, s in enumerate(statements, 1))
+        raise AssertionError(
+            f"{route} ran {len(statements)} SQL statements, over its budget of {budget}:\n{listing}"
+        )
@@ -0,0 +1,140 @@
+# tests/test_admission.py
+
+import asyncio
+
+import httpx
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.core.admission import AdmissionMiddleware, CAST_LANE, GENERAL_LANE, Lane, lane_of
+
+
+def test_requests_are_sorted_into_lanes():
+    assert lane_of("POST", "/api/v1/votes/3/cast/") == CAST_LANE
+    assert lane_of("POST", "/api/v1/votes/3/cast/batch/") == CAST_LANE
+    assert lane_of("GET", "/api/v1/ivr/3/") == CAST_LANE
+    assert lane_of("GET", "/api/v1/votes/3/results/") == GENERAL_LANE
+    assert lane_of("POST", "/api/v1/voters/") == GENERAL_LANE
+    assert lane_of("GET", "/api/v1/votes/3/results/stream") is None
+    assert lane_of("GET", "/api/v1/votes/3/ballots.csv") is None
+    assert lane_of("GET", "/api/v1/votes/3/ballots.jsonl") is None
+    assert lane_of("GET", "/metrics") is None
+
+
+def test_lane_queues_then_sheds():
+    """
+    GIVEN a lane with one slot and room for one waiter
+    WHEN the slot is taken
+    THEN the next request should wait for it, and the one after be shed at once
+    """
+    lane = Lane("test", limit=1, queue_size=1, max_wait=1)
+
+    async def scenario():
+        assert await lane.acquire() is None
+        waiter = asyncio.create_task(lane.acquire())
+        await asyncio.sleep(0)
+        assert lane.waiting == 1
+        assert await lane.acquire() == "queue_full"
+
+        lane.release()  # handed to the waiter, not freed
+        assert await waiter is None
+        assert (lane.active, lane.waiting) == (1, 0)
+        lane.release()
+        return lane.active
+
+    assert asyncio.run(scenario()) == 0
+
+
+def test_lane_sheds_requests_that_wait_too_long():
+    lane = Lane("test", limit=1, queue_size=5, max_wait=0.01)
+
+    async def scenario():
+        await lane.acquire()
+        shed = await lane.acquire()
+        lane.release()
+        return shed, lane.active, lane.waiting
+
+    assert asyncio.run(scenario()) == ("timeout", 0, 0)
+
+
+def test_saturated_cast_lane_returns_503_without_blocking_other_traffic():
+    release = asyncio.Event()
+
+    async def slow_cast(request):
+        await release.wait()
+        return PlainTextResponse("cast")
+
+    async def results(request):
+        return PlainTextResponse("results")
+
+    app = Starlette(routes=[
+        Route("/api/v1/votes/1/cast/", slow_cast, methods=["POST"]),
+        Route("/api/v1/votes/1/results/", results),
+    ])
+    wrapped = AdmissionMiddleware(
+        app,
+        lanes={
+            CAST_LANE: Lane(CAST_LANE, limit=1, queue_size=0, max_wait=1),
+            GENERAL_LANE: Lane(GENERAL_LANE, limit=1, queue_size=0, max_wait=1),
+        },
+        retry_after_seconds=2,
+    )
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=wrapped)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            running = asyncio.create_task(client.post("/api/v1/votes/1/cast/"))
+            await asyncio.sleep(0.01)
+            shed = await client.post("/api/v1/votes/1/cast/")
+            other = await client.get("/api/v1/votes/1/results/")
+            release.set()
+            return (await running), shed, other
+
+    running, shed, other = asyncio.run(scenario())
+    assert running.status_code == 200
+    assert shed.status_code == 503 and shed.headers["Retry-After"] == "2"
+    assert other.status_code == 200
+
+
+def test_held_ballot_export_does_not_block_results_reads():
+    """
+    GIVEN a general lane with one slot and no queue
+    WHEN a ballot export is still streaming
+    THEN a results read should still be admitted
+    """
+    release = asyncio.Event()
+
+    async def rows():
+        yield b"voters_votes_id,candidates_id\n"
+        await release.wait()
+
+    async def export(request):
+        return StreamingResponse(rows(), media_type="text/csv")
+
+    async def results(request):
+        return PlainTextResponse("results")
+
+    app = Starlette(routes=[
+        Route("/api/v1/votes/1/ballots.csv", export),
+        Route("/api/v1/votes/1/results/", results),
+    ])
+    wrapped = AdmissionMiddleware(
+        app,
+        lanes={GENERAL_LANE: Lane(GENERAL_LANE, limit=1, queue_size=0, max_wait=1)},
+        retry_after_seconds=1,
+    )
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=wrapped)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            downloading = asyncio.create_task(client.get("/api/v1/votes/1/ballots.csv"))
+            await asyncio.sleep(0.01)
+            read = await client.get("/api/v1/votes/1/results/")
+            release.set()
+            return (await downloading), read
+
+    downloaded, read = asyncio.run(scenario())
+    assert downloaded.status_code == 200
+    assert read.status_code == 200
+
@@ -0,0 +1,66 @@
+# tests/test_async_services.py
+
+import pytest
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models.base import Base
+from app.services import group_service, candidate_service, voter_service, vote_service
+from app.schemas.group import GroupCreate
+from app.schemas.candidate import CandidateCreate
+from app.schemas.voter import VoterCreate
+from app.schemas.vote import VoteEventCreate, VoteCast
+
+
+@pytest.fixture()
+async def async_db_session(tmp_path):
+    """
+    An AsyncSession on an aiosqlite database, with all tables created.
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'async.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    async with session_factory() as db:
+        yield db
+    await engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_async_services_match_sync_behaviour(async_db_session):
+    """
+    GIVEN the async service API on an aiosqlite session
+    WHEN an event is set up, a vote is cast twice and results are read
+    THEN it should behave exactly like the sync API
+    """
+    db = async_db_session
+    group = await group_service.create_group_async(db, GroupCreate(group_name="Async Group"))
+    candidate = await candidate_service.create_candidate_async(
+        db, CandidateCreate(candidate_name="Async Candidate", groups_id=group.groups_id)
+    )
+    voter = await voter_service.create_voter_async(
+        db, VoterCreate(voter_name="Async Voter", voter_phone="0507777777", groups_id=group.groups_id)
+    )
+    vote_event = await vote_service.create_vote_event_async(
+        db, VoteEventCreate(vote_title="Async Vote", candidate_ids=[candidate.candidates_id])
+    )
+
+    # A failed cast rolls back and expires loaded objects, so keep plain ids
+    vote_id, candidate_id, voter_id = vote_event.votes_id, candidate.candidates_id, voter.voters_id
+
+    cast = VoteCast(voter_phone="0507777777", candidate_id=candidate_id)
+    vote_record = await vote_service.cast_vote_async(db, vote_id, cast)
+    assert vote_record.voters_id == voter_id
+
+    with pytest.raises(ValueError, match="already voted"):
+        await vote_service.cast_vote_async(db, vote_id, cast)
+
+    results = await vote_service.get_vote_results_async(db, vote_id)
+    assert results.total_votes == 1
+    assert results.breakdown[0].candidate_name == "Async Candidate"
+
+    candidates = await vote_service.get_candidates_for_vote_async(db, vote_id)
+    assert [c.candidates_id for c in candidates] == [candidate_id]
+
+    with pytest.raises(ValueError, match="not found"):
+        await vote_service.get_vote_results_async(db, vote_id + 1)
@@ -0,0 +1,92 @@
+# tests/test_ballot_export.py
+
+import csv
+import gzip
+import io
+import json
+
+import pytest
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models.base import Base
+from app.schemas.candidate import CandidateCreate
+from app.schemas.group import GroupCreate
+from app.schemas.vote import VoteCast, VoteEventCreate
+from app.schemas.voter import VoterCreate
+from app.services import ballot_export, candidate_service, group_service, vote_service, voter_service
+
+
+@pytest.fixture()
+async def session_factory(tmp_path):
+    """
+    An aiosqlite database with one event and three ballots, from three voters.
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'export.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+    async with factory() as db:
+        group = await group_service.create_group_async(db, GroupCreate(group_name="Export Group"))
+        candidate = await candidate_service.create_candidate_async(
+            db, CandidateCreate(candidate_name="Export Candidate", groups_id=group.groups_id)
+        )
+        vote_event = await vote_service.create_vote_event_async(
+            db, VoteEventCreate(vote_title="Export Vote", candidate_ids=[candidate.candidates_id])
+        )
+        for i in range(3):
+            phone = f"050000000{i}"
+            await voter_service.create_voter_async(
+                db, VoterCreate(voter_name=f"Voter {i}", voter_phone=phone, groups_id=group.groups_id)
+            )
+            await vote_service.cast_vote_async(
+                db, vote_event.votes_id, VoteCast(voter_phone=phone, candidate_id=candidate.candidates_id)
+            )
+    yield factory
+    await engine.dispose()
+
+
+async def _export(factory, export_format, compress=False, vote_id=1) -> bytes:
+    async with factory() as db:
+        chunks = await ballot_export.export_ballots_async(
+            db, vote_id, export_format, compress=compress, session_factory=factory
+        )
+    return b"".join([chunk async for chunk in chunks])
+
+
+@pytest.mark.anyio
+async def test_csv_export_streams_in_partitions(session_factory, monkeypatch):
+    """
+    GIVEN an event with three ballots and a two-row partition size
+    WHEN its ballots are exported as CSV
+    THEN every ballot should be written once, with the joined names, after a header
+    """
+    monkeypatch.setattr(ballot_export, "_PARTITION_SIZE", 2)
+
+    rows = list(csv.reader(io.StringIO((await _export(session_factory, "csv")).decode())))
+
+    assert tuple(rows[0]) == ballot_export.EXPORT_COLUMNS
+    assert [(r[2], r[3], r[4], r[5]) for r in rows[1:]] == [
+        (f"Voter {i}", f"050000000{i}", "Export Group", "Export Candidate") for i in range(3)
+    ]
+
+
+@pytest.mark.anyio
+async def test_gzipped_jsonl_export(session_factory):
+    """
+    GIVEN an event with three ballots
+    WHEN its ballots are exported as gzipped JSON lines
+    THEN the stream should decompress to one object per ballot
+    """
+    lines = gzip.decompress(await _export(session_factory, "jsonl", compress=True)).splitlines()
+
+    ballots = [json.loads(line) for line in lines]
+    assert [b["voter_phone"] for b in ballots] == [f"050000000{i}" for i in range(3)]
+    assert set(ballots[0]) == set(ballot_export.EXPORT_COLUMNS)
+
+
+@pytest.mark.anyio
+async def test_export_of_unknown_event_is_rejected(session_factory):
+    with pytest.raises(ValueError, match="not found"):
+        await _export(session_factory, "csv", vote_id=99)
@@ -0,0 +1,107 @@
+# tests/test_cast_buffer.py
+
+import datetime
+import pytest
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.base import Base
+from app.models.group import Group
+from app.models.candidate import Candidate
+from app.models.voter import Voter
+from app.models.vote import Vote
+from app.models.voter_vote import VoterVote
+from app.schemas.vote import VoteCast
+from app.services.cast_buffer import CastBuffer, CastBufferFull
+
+
+@pytest.fixture()
+def session_factory(tmp_path):
+    """
+    A file-backed SQLite database, so the flusher thread sees the same data.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'buffer.db'}")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    db = factory()
+    group = Group(group_name="Buffer Group")
+    candidate = Candidate(candidate_name="Buffer Candidate", group=group)
+    voters = [Voter(voter_name=f"Voter {i}", voter_phone=f"05000000{i:02d}", group=group) for i in range(5)]
+    vote_event = Vote(
+        vote_title="Buffer Vote",
+        candidates=[candidate],
+        vote_date=datetime.datetime.now(datetime.UTC)
+    )
+    db.add_all([group, candidate, vote_event, *voters])
+    db.commit()
+    db.close()
+
+    yield factory
+    engine.dispose()
+
+
+def test_buffer_group_commits_and_routes_errors(session_factory):
+    """
+    GIVEN a running buffer with several queued casts
+    WHEN the flusher writes them as one batch
+    THEN each future should resolve with its own result or error
+    """
+    buffer = CastBuffer(session_factory, batch_size=100, max_latency_ms=50, queue_depth=100)
+    casts = [VoteCast(voter_phone=f"05000000{i:02d}", candidate_id=1) for i in range(5)]
+    casts.append(VoteCast(voter_phone="0500000000", candidate_id=1))  # duplicate of the first
+    casts.append(VoteCast(voter_phone="0599999999", candidate_id=1))  # not on the roll
+
+    futures = [buffer.submit(1, vote_cast) for vote_cast in casts]
+    buffer.start()
+    try:
+        results = [future.exception(timeout=5) or future.result() for future in futures]
+    finally:
+        buffer.stop(timeout=5)
+
+    assert [r.voters_id for r in results[:5]] == [1, 2, 3, 4, 5]
+    assert "already voted" in str(results[5])
+    assert "not found" in str(results[6])
+
+    db = session_factory()
+    assert db.query(VoterVote).count() == 5
+    db.close()
+
+
+def test_buffer_rejects_when_queue_is_full(session_factory):
+    """
+    GIVEN a buffer whose queue is at capacity
+    WHEN another cast is submitted
+    THEN it should be rejected immediately instead of waiting
+    """
+    buffer = CastBuffer(session_factory, batch_size=10, max_latency_ms=10, queue_depth=1)
+    buffer.submit(1, VoteCast(voter_phone="0500000000", candidate_id=1))
+
+    with pytest.raises(CastBufferFull):
+        buffer.submit(1, VoteCast(voter_phone="0500000001", candidate_id=1))
+
+
+def test_cancelled_cast_does_not_stop_the_flusher(session_factory):
+    """
+    GIVEN a queued cast whose caller gave up and cancelled its future
+    WHEN the flusher reaches it
+    THEN it should be dropped, and later casts should still be written
+    """
+    buffer = CastBuffer(session_factory, batch_size=10, max_latency_ms=10, queue_depth=10)
+    abandoned = buffer.submit(1, VoteCast(voter_phone="0500000000", candidate_id=1))
+    kept = buffer.submit(1, VoteCast(voter_phone="0500000001", candidate_id=1))
+    assert abandoned.cancel()
+
+    buffer.start()
+    try:
+        assert kept.result(timeout=5).voters_id == 2
+        later = buffer.submit(1, VoteCast(voter_phone="0500000002", candidate_id=1))
+        assert later.result(timeout=5).voters_id == 3
+        assert buffer.running
+    finally:
+        buffer.stop(timeout=5)
+
+    db = session_factory()
+    assert db.query(VoterVote).count() == 2
+    db.close()
@@ -0,0 +1,90 @@
+# tests/test_idempotency.py
+
+import asyncio
+import pytest
+
+from app.services.idempotency import IdempotencyKeyReused, IdempotencyStore
+
+
+def test_repeat_is_replayed_and_a_reused_key_is_refused():
+    store = IdempotencyStore(max_keys=10, ttl_seconds=60)
+    runs = []
+
+    async def request():
+        runs.append(1)
+        return "ballot"
+
+    async def scenario():
+        first = await store.run("key", ("0501", 1), request)
+        repeat = await store.run("key", ("0501", 1), request)
+        with pytest.raises(IdempotencyKeyReused):
+            await store.run("key", ("0501", 2), request)
+        return first, repeat
+
+    assert asyncio.run(scenario()) == ("ballot", "ballot")
+    assert len(runs) == 1
+
+
+def test_concurrent_repeats_wait_for_the_running_request():
+    """
+    GIVEN three requests with the same key arriving together
+    WHEN the first is still running
+    THEN the others should wait for it and get its result, and it should run once
+    """
+    store = IdempotencyStore(max_keys=10, ttl_seconds=60)
+    runs = []
+
+    async def request():
+        runs.append(1)
+        await asyncio.sleep(0.01)
+        return len(runs)
+
+    async def scenario():
+        return await asyncio.gather(*(store.run("key", "fp", request) for _ in range(3)))
+
+    assert asyncio.run(scenario()) == [1, 1, 1]
+
+
+def test_errors_are_not_stored_and_cancelled_requests_are_taken_over():
+    store = IdempotencyStore(max_keys=10, ttl_seconds=60)
+    outcomes = iter([ValueError("database down"), "ballot"])
+
+    async def request():
+        outcome = next(outcomes)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    async def hangs():
+        await asyncio.sleep(10)
+
+    async def scenario():
+        with pytest.raises(ValueError):
+            await store.run("key", "fp", request)
+        retried = await store.run("key", "fp", request)
+
+        # A waiter takes over when the request it waits on is cancelled
+        running = asyncio.create_task(store.run("other", "fp", hangs))
+        await asyncio.sleep(0)
+        waiting = asyncio.create_task(store.run("other", "fp", lambda: asyncio.sleep(0, "taken over")))
+        await asyncio.sleep(0)
+        running.cancel()
+        return retried, await waiting
+
+    assert asyncio.run(scenario()) == ("ballot", "taken over")
+
+
+def test_oldest_finished_keys_are_evicted_first():
+    store = IdempotencyStore(max_keys=2, ttl_seconds=60)
+
+    async def request():
+        return "ballot"
+
+    async def scenario():
+        for key in ("a", "b", "c"):
+            await store.run(key, "fp", request)
+        # "a" was evicted, so a different request may now use it
+        await store.run("a", "other fp", request)
+
+    asyncio.run(scenario())
+    assert len(store) == 2
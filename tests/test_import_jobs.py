@@ -0,0 +1,67 @@
+# tests/test_import_jobs.py
+
+import io
+import os
+import pytest
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.base import Base
+from app.models.group import Group
+from app.models.voter import Voter
+from app.services.import_jobs import ImportJobManager
+
+
+@pytest.fixture()
+def session_factory(tmp_path):
+    """
+    A file-backed SQLite database with one group, shared with the worker threads.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'imports.db'}")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = factory()
+    db.add(Group(group_name="Import Group"))
+    db.commit()
+    db.close()
+    yield factory
+    engine.dispose()
+
+
+def test_import_job_runs_in_background(session_factory, tmp_path):
+    """
+    GIVEN a CSV upload submitted as an import job
+    WHEN the job runs to completion
+    THEN its status should report the rows processed and the import report, and the spool file is removed
+    """
+    spool_dir = tmp_path / "spool"
+    manager = ImportJobManager(session_factory, max_workers=1, spool_dir=str(spool_dir))
+    csv_content = "voter_name,voter_phone,groups_id\n" + "".join(
+        f"Voter {i},05{i:08d},1\n" for i in range(50)
+    ) + "Broken,0599999999,7\n"
+
+    queued = manager.submit(io.BytesIO(csv_content.encode("utf-8")), "roll.csv")
+    assert queued.status in ("queued", "running")
+
+    job = manager.wait(queued.job_id, timeout=10)
+    manager.shutdown()
+
+    assert job.status == "completed"
+    assert job.rows_processed == 51
+    assert job.report.inserted == 50
+    assert job.report.rejected == 1
+    assert job.report.rejects[0].line == 52
+    assert job.rows_per_second is not None
+    assert os.listdir(spool_dir) == []
+
+    db = session_factory()
+    assert db.query(Voter).count() == 50
+    db.close()
+
+
+def test_unknown_import_job(session_factory, tmp_path):
+    manager = ImportJobManager(session_factory, max_workers=1, spool_dir=str(tmp_path))
+
+    with pytest.raises(ValueError, match="not found"):
+        manager.get("missing")
@@ -0,0 +1,82 @@
+# tests/test_ivr.py
+
+import pytest
+
+from fastapi.testclient import TestClient
+
+from app.db.session import SessionLocal, engine
+from app.models.base import Base
+from app.schemas.candidate import CandidateCreate
+from app.schemas.group import GroupCreate
+from app.schemas.vote import VoteEventCreate
+from app.schemas.voter import VoterCreate
+from app.services import candidate_service, group_service, ivr_service, vote_service, voter_service
+from main import app
+
+
+@pytest.fixture()
+def ivr_url():
+    """
+    A vote event with two candidates and one registered caller; returns its webhook URL.
+    """
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        group = group_service.create_group(db, GroupCreate(group_name="IVR Group"))
+        candidate_ids = [
+            candidate_service.create_candidate(
+                db, CandidateCreate(candidate_name=name, groups_id=group.groups_id)
+            ).candidates_id
+            for name in ("Alice", "Bob")
+        ]
+        voter_service.create_voter(
+            db, VoterCreate(voter_name="Caller", voter_phone="0502000001", groups_id=group.groups_id)
+        )
+        vote = vote_service.create_vote_event(
+            db, VoteEventCreate(vote_title="Council", candidate_ids=candidate_ids)
+        )
+        url = f"/api/v1/ivr/{vote.votes_id}/"
+    yield url
+    Base.metadata.drop_all(bind=engine)
+
+
+def test_call_plays_the_menu_and_casts_the_pressed_choice(ivr_url):
+    """
+    GIVEN a registered caller
+    WHEN they call, press an invalid digit, then a valid one, and Yemot retries
+    THEN they should hear the menu, the menu again, then their vote confirmed each time
+    """
+    client = TestClient(app)
+    call = {"ApiPhone": "0502000001", "ApiCallId": "call-1"}
+
+    menu = client.get(ivr_url, params=call)
+    assert menu.headers["content-type"].startswith("text/plain")
+    assert menu.text.startswith("read=t-Council.t-")
+    assert "Alice" in menu.text and menu.text.endswith("=candidate,no,1,1,7,No,yes,no")
+
+    invalid = client.get(ivr_url, params={**call, "candidate": "9"})
+    assert invalid.text.startswith(f"read=t-{ivr_service.PROMPT_INVALID_CHOICE}.")
+
+    bob = next(
+        digits for digits in ("1", "2")
+        if f"t-{ivr_service.PROMPT_CHOICE.format(name='Bob', digits=digits)}" in menu.text
+    )
+    accepted = client.post(ivr_url, data={**call, "candidate": bob})
+    expected = ivr_service.message_reply(ivr_service.PROMPT_ACCEPTED.format(name="Bob"))
+    assert accepted.text == expected
+    assert client.post(ivr_url, data={**call, "candidate": bob}).text == expected
+
+    # A new call from the same phone is a second ballot
+    again = client.post(ivr_url, data={**call, "ApiCallId": "call-2", "candidate": "1"})
+    assert again.text == ivr_service.message_reply(ivr_service.PROMPT_ALREADY_VOTED)
+
+
+def test_unknown_callers_and_events_are_told_and_hung_up_on(ivr_url):
+    client = TestClient(app)
+
+    unknown = client.get(ivr_url, params={"ApiPhone": "0509999999"})
+    withheld = client.get(ivr_url)
+    no_event = client.get("/api/v1/ivr/999/", params={"ApiPhone": "0502000001"})
+
+    assert unknown.text == withheld.text == ivr_service.message_reply(ivr_service.PROMPT_NOT_REGISTERED)
+    assert no_event.text == ivr_service.message_reply(ivr_service.PROMPT_VOTE_NOT_FOUND)
+    assert client.get(ivr_url, params={"hangup": "yes"}).text == ""
@@ -0,0 +1,43 @@
+# tests/test_load_benchmark.py
+
+from sqlalchemy import create_engine
+
+from benchmarks.datagen import DatasetSpec, describe, generate, phone_for
+from benchmarks.load import CAST, LoadProfile, build_schedule, compare, summarize
+
+
+def test_generated_dataset_is_deterministic(tmp_path):
+    spec = DatasetSpec(voters=500, groups=5, events=2)
+    first = generate(create_engine(f"sqlite:///{tmp_path / 'a.db'}"), spec)
+    second = generate(create_engine(f"sqlite:///{tmp_path / 'b.db'}"), spec)
+
+    assert first == second
+    assert describe(create_engine(f"sqlite:///{tmp_path / 'a.db'}")) == first
+
+
+def test_schedule_is_deterministic_and_casts_each_voter_once(tmp_path):
+    """
+    GIVEN a dataset and a profile without retries or unknown phones
+    WHEN the schedule is built twice with the same seed
+    THEN both should match, and no voter should cast twice in one event
+    """
+    dataset = generate(create_engine(f"sqlite:///{tmp_path / 'c.db'}"), DatasetSpec(voters=1000, events=2))
+    profile = LoadProfile(duration=3, cast_rate=50, retry_rate=0, unknown_rate=0, dashboards=2)
+
+    schedule = build_schedule(dataset, profile, seed=7)
+    assert schedule == build_schedule(dataset, profile, seed=7)
+
+    casts = [(r.path, r.body["voter_phone"]) for r in schedule if r.label == CAST]
+    assert casts and len(casts) == len(set(casts))
+    assert {phone for _, phone in casts} <= {phone_for(i) for i in range(1, 1001)}
+    assert [r.at for r in schedule] == sorted(r.at for r in schedule)
+
+
+def test_compare_flags_latency_and_throughput_regressions():
+    baseline = {"endpoints": summarize({CAST: [(0.010, 200)] * 100}, wall_seconds=1)}
+    slower = {"endpoints": summarize({CAST: [(0.030, 200)] * 100}, wall_seconds=1)}
+    fewer = {"endpoints": summarize({CAST: [(0.010, 200)] * 40}, wall_seconds=1)}
+
+    assert compare(baseline, baseline, tolerance=0.5) == []
+    assert any("p95_ms" in r for r in compare(slower, baseline, tolerance=0.5))
+    assert any("throughput_rps" in r for r in compare(fewer, baseline, tolerance=0.5))
@@ -0,0 +1,47 @@
+# tests/test_metrics.py
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+
+from app.core.metrics import MetricsMiddleware, instrument_engine
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_requests_are_timed_per_route_with_their_sql(tmp_path):
+    """
+    GIVEN an app behind MetricsMiddleware on an instrumented engine
+    WHEN a route running two statements is called
+    THEN its latency and statements should be recorded under the route template
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'metrics.db'}")
+    instrument_engine(engine, "test")
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT :id"), {"id": item_id})
+        return {"item_id": item_id}
+
+    route = {"method": "GET", "route": "/items/{item_id}"}
+    requests_before = _sample("http_request_duration_seconds_count", status="200", **route)
+    statements_before = _sample("http_request_db_statements_sum", **route)
+    checkouts_before = _sample("db_pool_checkout_wait_seconds_count", engine="test")
+
+    with TestClient(app) as client:
+        assert client.get("/items/7").status_code == 200
+        assert client.get("/nowhere").status_code == 404
+
+    assert _sample("http_request_duration_seconds_count", status="200", **route) == requests_before + 1
+    assert _sample("http_request_db_statements_sum", **route) == statements_before + 2
+    assert _sample("http_request_duration_seconds_count", method="GET", route="unmatched", status="404") >= 1
+    assert _sample("db_pool_checkout_wait_seconds_count", engine="test") == checkouts_before + 1
+    assert _sample("db_pool_size", engine="test") == engine.pool.size()
+    engine.dispose()
@@ -0,0 +1,77 @@
+# tests/test_migrations.py
+
+from pathlib import Path
+
+import pytest
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.orm import sessionmaker
+
+from app.models import VoteTally
+from app.services import vote_service
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+
+
+def _migrate(engine, revision: str) -> None:
+    with engine.connect() as connection:
+        config = Config(str(ALEMBIC_INI))
+        config.attributes["connection"] = connection
+        config.attributes["configure_logger"] = False
+        command.upgrade(config, revision)
+        connection.commit()
+
+
+def test_upgrading_a_pre_tally_database_backfills_the_tallies(tmp_path):
+    """
+    GIVEN a database with the schema from before migrations, and ballots in it
+    WHEN it is upgraded to head
+    THEN vote_tallies should be created and hold the existing ballots
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    _migrate(engine, "0001")
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO groups (groups_id, group_name) VALUES (1, 'North'), (2, 'South')"))
+        conn.execute(text("INSERT INTO candidates (candidates_id, candidate_name, groups_id) VALUES (1, 'A', 1)"))
+        conn.execute(text("INSERT INTO votes (votes_id, vote_title, vote_date) VALUES (1, 'Vote', '2026-01-01')"))
+        conn.execute(text("INSERT INTO vote_candidates (votes_id, candidates_id) VALUES (1, 1)"))
+        for voter_id in range(1, 6):
+            conn.execute(text(
+                f"INSERT INTO voters (voters_id, voter_phone, groups_id) VALUES ({voter_id}, '05000{voter_id}', {voter_id % 2 + 1})"
+            ))
+            conn.execute(text(
+                f"INSERT INTO voters_votes (voters_id, votes_id, candidates_id) VALUES ({voter_id}, 1, 1)"
+            ))
+
+    _migrate(engine, "head")
+
+    db = sessionmaker(bind=engine)()
+    assert db.scalar(select(func.sum(VoteTally.vote_count))) == 5
+    assert vote_service.get_vote_results(db, 1).breakdown[0].vote_count == 5
+    db.close()
+    engine.dispose()
+
+
+def test_upgrade_normalizes_stored_phones_and_stops_on_collisions(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'phones.db'}")
+    _migrate(engine, "0003")
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO groups (groups_id, group_name) VALUES (1, 'North')"))
+        conn.execute(text(
+            "INSERT INTO voters (voters_id, voter_phone, groups_id) "
+            "VALUES (1, '050-123 4567', 1), (2, '0529999999', 1), (3, '052 999-9999', 1)"
+        ))
+
+    with pytest.raises(RuntimeError, match="0529999999: voters 2, 3"):
+        _migrate(engine, "head")
+
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM voters WHERE voters_id = 3"))
+    _migrate(engine, "head")
+    with engine.connect() as conn:
+        phones = conn.execute(text("SELECT voter_phone FROM voters ORDER BY voters_id")).scalars().all()
+    assert phones == ["0501234567", "0529999999"]
+    engine.dispose()
+
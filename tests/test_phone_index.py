@@ -0,0 +1,169 @@
+# tests/test_phone_index.py
+
+import threading
+import time
+
+import pytest
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+
+from app.models.base import Base
+from app.models.group import Group
+from app.models.voter import Voter
+from app.schemas.voter import VoterCreate
+from app.services import voter_service
+from app.services.phone_index import PhoneIndex, normalize_phone
+
+
+@pytest.fixture()
+def db_session():
+    """
+    An in-memory database with two voters; the second has a formatted phone.
+    """
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(autoflush=False, bind=engine)()
+    group = Group(group_name="Index Group")
+    db.add_all([
+        group,
+        Voter(voter_name="First", voter_phone="0501234567", group=group),
+        Voter(voter_name="Second", voter_phone="052-765 4321", group=group),
+    ])
+    db.commit()
+    yield db
+    db.close()
+    engine.dispose()
+
+
+def _count_queries(db):
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+def test_normalize_phone_keeps_digits_only():
+    assert normalize_phone(" +972 (50) 123-4567 ") == "972501234567"
+    assert normalize_phone(None) == ""
+
+
+def test_warm_index_serves_lookups_without_queries(db_session):
+    index = PhoneIndex()
+    assert index.warm(db_session) == 2
+    statements = _count_queries(db_session)
+
+    first = index.lookup(db_session, "050-123-4567")
+    second = index.lookup(db_session, "0527654321")
+
+    assert statements == []
+    assert first[0] != second[0]
+    # A leading zero is significant
+    assert index._get("501234567") is None
+
+
+def test_miss_falls_back_to_one_query_and_is_indexed(db_session):
+    index = PhoneIndex()
+    index.warm(db_session)
+    group_id = db_session.query(Group).one().groups_id
+    late = Voter(voter_name="Late", voter_phone="0539999999", groups_id=group_id)
+    db_session.add(late)
+    db_session.commit()
+    late_ids = (late.voters_id, group_id)
+    statements = _count_queries(db_session)
+
+    found = index.lookup_many(db_session, ["0539999999", "0000000000"])
+    assert found == {"0539999999": late_ids}
+    assert len(statements) == 1
+
+    # The voter is now indexed; the unknown phone still isn't remembered
+    assert index.lookup(db_session, "0539999999") == late_ids
+    assert index.lookup(db_session, "0000000000") is None
+    assert len(statements) == 2
+
+
+def test_concurrent_cold_lookups_load_the_roll_once():
+    """
+    GIVEN a cold index
+    WHEN several lookups arrive together
+    THEN only the first should load the roll, and the others wait for it
+    """
+    index = PhoneIndex()
+    loads = []
+
+    def slow_load(db):
+        loads.append(db)
+        time.sleep(0.05)
+        index._warm = True
+        return 0
+
+    index._load = slow_load
+    threads = [threading.Thread(target=index.lookup_many, args=(None, [])) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(loads) == 1
+
+
+def test_added_voters_are_merged_into_the_sorted_arrays():
+    index = PhoneIndex(overlay_limit=3)
+    index.add_many([("0501111111", 1, 7), ("0502222222", 2, 7)])
+    assert len(index._overlay) == 2
+    index.add("0500000000", 3, 8)
+
+    assert index._overlay == {}
+    assert list(index._table[1]) == [3, 1, 2]
+    assert index._get("0500000000") == (3, 8)
+    assert len(index) == 3
+
+    # Merging splices into the arrays; a re-added phone replaces its entry
+    index.add_many([("0509999999", 4, 7), ("0501111111", 5, 8), ("0501500000", 6, 7)])
+    assert list(index._table[0]) == sorted(index._table[0])
+    assert list(index._table[1]) == [3, 5, 6, 2, 4]
+    assert index._get("0501111111") == (5, 8)
+
+
+def test_overlay_limit_grows_with_the_index():
+    index = PhoneIndex(overlay_limit=1)
+    index.add_many((f"05{i:08d}", i, 1) for i in range(64))
+    assert len(index._table[0]) == 64
+
+    # 64 indexed voters allow an overlay of 64 // 32 = 2 before merging
+    index.add("0599999998", 100, 1)
+    assert len(index._overlay) == 1
+    index.add("0599999999", 101, 1)
+    assert len(index._overlay) == 0
+    assert len(index._table[0]) == 66
+
+
+def test_one_number_in_two_formats_is_one_voter(db_session):
+    """
+    GIVEN a voter registered as "053-1234567"
+    WHEN the same number is registered again without the dash
+    THEN it should be refused, and both formats should find the first voter,
+    from a warm index and from a cold one's fallback query alike
+    """
+    group_id = db_session.query(Group).one().groups_id
+    first = voter_service.create_voter(
+        db_session, VoterCreate(voter_name="Dashed", voter_phone="053-1234567", groups_id=group_id)
+    )
+    first_ids = (first.voters_id, group_id)
+    assert first.voter_phone == "0531234567"
+    with pytest.raises(IntegrityError):
+        voter_service.create_voter(
+            db_session, VoterCreate(voter_name="Plain", voter_phone="0531234567", groups_id=group_id)
+        )
+    db_session.rollback()
+
+    warm = PhoneIndex()
+    warm.warm(db_session)
+    cold = PhoneIndex()
+    cold._warm = True  # skip warming, so every lookup takes the fallback query
+    for index in (warm, cold):
+        assert index.lookup_many(db_session, ["053-1234567", "0531234567"]) == {
+            "053-1234567": first_ids,
+            "0531234567": first_ids,
+        }
+
@@ -0,0 +1,181 @@
+# tests/test_query_budgets.py
+
+"""
+Every /api/v1 route declares how many SQL statements one request may run.
+An accidental lazy load or refresh shows up as a failure listing the
+statements. Budgets are for the steady state: the phone index and vote
+registry are warm, the results cache is cold.
+"""
+
+import pytest
+
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+
+from app.db.session import SessionLocal, async_engine, engine
+from app.models.base import Base
+from app.schemas.candidate import CandidateCreate
+from app.schemas.group import GroupCreate
+from app.schemas.vote import VoteCast, VoteEventCreate
+from app.schemas.voter import VoterCreate
+from app.services import candidate_service, group_service, vote_service, voter_service
+from app.services.phone_index import phone_index
+from app.services.results_cache import results_cache
+from app.services.results_stream import results_broadcaster
+from app.services.vote_registry import vote_registry
+from main import app
+from tests.query_budget import StatementRecorder, assert_within_budget
+
+# (method, route) -> (budget, request as (method, url, httpx kwargs) from the seeded ids)
+ROUTE_BUDGETS = {
+    # INSERT ... RETURNING
+    ("POST", "/api/v1/groups/"): (1, lambda ids: ("POST", "/api/v1/groups/", {"json": {"group_name": "New"}})),
+    # One keyset page
+    ("GET", "/api/v1/groups/"): (1, lambda ids: ("GET", "/api/v1/groups/", {})),
+    ("POST", "/api/v1/candidates/"): (1, lambda ids: (
+        "POST", "/api/v1/candidates/", {"json": {"candidate_name": "New", "groups_id": ids["group"]}},
+    )),
+    ("GET", "/api/v1/candidates/"): (1, lambda ids: (
+        "GET", "/api/v1/candidates/", {"params": {"groups_id": ids["group"]}},
+    )),
+    ("POST", "/api/v1/voters/"): (1, lambda ids: (
+        "POST", "/api/v1/voters/",
+        {"json": {"voter_name": "New", "voter_phone": "0509999999", "groups_id": ids["group"]}},
+    )),
+    # The import runs in the background, on its own connection
+    ("POST", "/api/v1/voters/upload-csv/"): (0, lambda ids: (
+        "POST", "/api/v1/voters/upload-csv/",
+        {"files": {"csv_file": ("voters.csv", b"voter_name,voter_phone,groups_id\n", "text/csv")}},
+    )),
+    ("GET", "/api/v1/voters/import-jobs/{job_id}"): (0, lambda ids: (
+        "GET", "/api/v1/voters/import-jobs/unknown", {},
+    )),
+    ("GET", "/api/v1/voters/"): (1, lambda ids: (
+        "GET", "/api/v1/voters/", {"params": {"groups_id": ids["group"]}},
+    )),
+    # The event, then its candidate links
+    ("POST", "/api/v1/votes/"): (3, lambda ids: (
+        "POST", "/api/v1/votes/", {"json": {"vote_title": "New", "candidate_ids": [ids["candidate"]]}},
+    )),
+    ("GET", "/api/v1/votes/"): (1, lambda ids: ("GET", "/api/v1/votes/", {})),
+    # The ballot INSERT ... RETURNING, then the tally upsert
+    ("POST", "/api/v1/votes/{vote_id}/cast/"): (2, lambda ids: (
+        "POST", f"/api/v1/votes/{ids['vote']}/cast/",
+        {"json": {"voter_phone": ids["fresh_phone"], "candidate_id": ids["candidate"]}},
+    )),
+    ("POST", "/api/v1/votes/{vote_id}/cast/batch/"): (2, lambda ids: (
+        "POST", f"/api/v1/votes/{ids['vote']}/cast/batch/",
+        {"json": {"items": [{"voter_phone": ids["fresh_phone"], "candidate_id": ids["candidate"]}]}},
+    )),
+    # One aggregate over the tallies
+    ("GET", "/api/v1/votes/{vote_id}/results/"): (1, lambda ids: (
+        "GET", f"/api/v1/votes/{ids['vote']}/results/", {},
+    )),
+    ("GET", "/api/v1/votes/{vote_id}/results/stream"): (1, lambda ids: (
+        "GET", f"/api/v1/votes/{ids['vote']}/results/stream", {},
+    )),
+    ("GET", "/api/v1/votes/{vote_id}/ballots.{export_format}"): (1, lambda ids: (
+        "GET", f"/api/v1/votes/{ids['vote']}/ballots.csv", {},
+    )),
+    ("GET", "/api/v1/votes/{vote_id}/results/by-group/{group_id}/"): (1, lambda ids: (
+        "GET", f"/api/v1/votes/{ids['vote']}/results/by-group/{ids['group']}/", {},
+    )),
+    ("GET", "/api/v1/votes/{vote_id}/results/matrix/"): (1, lambda ids: (
+        "GET", f"/api/v1/votes/{ids['vote']}/results/matrix/", {},
+    )),
+    ("POST", "/api/v1/votes/results/matrix/"): (1, lambda ids: (
+        "POST", "/api/v1/votes/results/matrix/", {"json": {"vote_ids": [ids["vote"], ids["other_vote"]]}},
+    )),
+    # The candidate-set check, then one aggregate
+    ("POST", "/api/v1/votes/results/combine/"): (2, lambda ids: (
+        "POST", "/api/v1/votes/results/combine/", {"json": {"vote_ids": [ids["vote"], ids["other_vote"]]}},
+    )),
+    # Served by the vote registry
+    ("GET", "/api/v1/votes/{vote_id}/candidates/"): (0, lambda ids: (
+        "GET", f"/api/v1/votes/{ids['vote']}/candidates/", {},
+    )),
+    # The menu, from the phone index and the rendered menus
+    ("GET", "/api/v1/ivr/{vote_id}/"): (0, lambda ids: (
+        "GET", f"/api/v1/ivr/{ids['vote']}/", {"params": {"ApiPhone": ids["fresh_phone"]}},
+    )),
+    # The pressed choice: the same statements as a cast
+    ("POST", "/api/v1/ivr/{vote_id}/"): (2, lambda ids: (
+        "POST", f"/api/v1/ivr/{ids['vote']}/",
+        {"data": {"ApiPhone": ids["fresh_phone"], "ApiCallId": "budget-call", "candidate": "1"}},
+    )),
+}
+
+
+@pytest.fixture()
+def api(monkeypatch):
+    """
+    The app on a seeded database: one group, candidate and two voters, two
+    events with the same candidate, and one ballot. Returns the recorder,
+    a client and the seeded ids.
+    """
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        group = group_service.create_group(db, GroupCreate(group_name="Budget Group"))
+        candidate = candidate_service.create_candidate(
+            db, CandidateCreate(candidate_name="Budget Candidate", groups_id=group.groups_id)
+        )
+        events = [
+            vote_service.create_vote_event(
+                db, VoteEventCreate(vote_title=title, candidate_ids=[candidate.candidates_id])
+            )
+            for title in ("Budget Vote", "Other Vote")
+        ]
+        for phone in ("0501000001", "0501000002"):
+            voter_service.create_voter(
+                db, VoterCreate(voter_name=phone, voter_phone=phone, groups_id=group.groups_id)
+            )
+        vote_service.cast_vote(
+            db, events[0].votes_id, VoteCast(voter_phone="0501000001", candidate_id=candidate.candidates_id)
+        )
+        ids = {
+            "group": group.groups_id,
+            "candidate": candidate.candidates_id,
+            "vote": events[0].votes_id,
+            "other_vote": events[1].votes_id,
+            "fresh_phone": "0501000002",
+        }
+        # Steady state: warm lookups, cold results
+        phone_index.warm(db)
+        for vote_id in (ids["vote"], ids["other_vote"]):
+            vote_registry.get(db, vote_id)
+        results_cache.clear()
+
+    async def no_updates(key, initial):
+        return
+        yield
+
+    # The live stream would never end; keep its initial read only
+    monkeypatch.setattr(results_broadcaster, "subscribe", no_updates)
+    recorder = StatementRecorder(app, engine, async_engine.sync_engine)
+    # Without the lifespan: its shutdown would stop the import-job executor
+    # for the tests that follow
+    yield recorder, TestClient(recorder), ids
+    recorder.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def test_every_api_route_declares_a_budget():
+    routes = {
+        (method, route.path)
+        for route in app.routes
+        if isinstance(route, APIRoute) and route.path.startswith("/api/v1")
+        for method in route.methods
+    }
+    assert routes == set(ROUTE_BUDGETS)
+
+
+@pytest.mark.parametrize("route", sorted(ROUTE_BUDGETS), ids=" ".join)
+def test_route_stays_within_its_query_budget(api, route):
+    recorder, client, ids = api
+    budget, build_request = ROUTE_BUDGETS[route]
+    method, url, kwargs = build_request(ids)
+
+    response = client.request(method, url, **kwargs)
+
+    assert response.status_code < 500, response.text
+    assert_within_budget(recorder.statements, budget, " ".join(route))
@@ -0,0 +1,111 @@
+# tests/test_query_plans.py
+
+"""
+Query-plan regression tests: the hot queries must keep using the indexes
+added by migration 0002. The statements are captured from the services as
+they run and explained with SQLite's EXPLAIN QUERY PLAN.
+"""
+
+import datetime
+from pathlib import Path
+
+import pytest
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Group, Vote, Voter, VoterVote
+from app.services import ballot_export, tally_service, voter_service
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+
+VOTES_BY_CANDIDATE = "ix_voters_votes_votes_id_candidates_id"
+VOTERS_BY_GROUP = "ix_voters_groups_id_voters_id"
+
+
+@pytest.fixture()
+def db_session(tmp_path):
+    """
+    A database built by the migrations, with two events and two groups of voters.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'plans.db'}")
+    with engine.connect() as connection:
+        config = Config(str(ALEMBIC_INI))
+        config.attributes["connection"] = connection
+        config.attributes["configure_logger"] = False
+        command.upgrade(config, "head")
+        connection.commit()
+
+    db = sessionmaker(autoflush=False, bind=engine)()
+    groups = [Group(group_name="North"), Group(group_name="South")]
+    voters = [Voter(voter_name=f"V{i}", voter_phone=f"050{i:07d}", group=groups[i % 2]) for i in range(20)]
+    votes = [Vote(vote_title=f"Vote {i}", vote_date=datetime.datetime(2026, 1, 1)) for i in range(2)]
+    db.add_all([*groups, *voters, *votes])
+    db.flush()
+    db.add_all(VoterVote(voter=voter, vote=votes[0]) for voter in voters)
+    db.commit()
+    yield db
+    db.close()
+    engine.dispose()
+
+
+def _plans(db, run) -> list[str]:
+    """
+    Runs `run()` and returns the EXPLAIN QUERY PLAN of every SELECT it issued.
+    """
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if "SELECT" in statement.upper() and not executemany:
+            statements.append((statement, parameters))
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        run()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    connection = db.connection().connection.dbapi_connection
+    return [
+        "\n".join(row[-1] for row in connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters))
+        for statement, parameters in statements
+    ]
+
+
+def test_migrations_create_the_hot_query_indexes(db_session):
+    indexes = {
+        row[0]
+        for row in db_session.connection().exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'index'"
+        )
+    }
+    assert {VOTES_BY_CANDIDATE, VOTERS_BY_GROUP} <= indexes
+
+
+def test_tally_rebuild_reads_ballots_through_the_event_index(db_session):
+    vote_id = db_session.query(Vote.votes_id).first()[0]
+
+    plans = _plans(db_session, lambda: tally_service.rebuild_vote_tallies(db_session, vote_id))
+
+    assert any(VOTES_BY_CANDIDATE in plan for plan in plans), plans
+    assert not any("SCAN voters_votes" in plan for plan in plans), plans
+
+
+def test_ballot_export_reads_ballots_through_the_event_index(db_session):
+    vote_id = db_session.query(Vote.votes_id).first()[0]
+
+    plans = _plans(db_session, lambda: db_session.execute(ballot_export.ballots_query(vote_id)).all())
+
+    assert any(VOTES_BY_CANDIDATE in plan for plan in plans), plans
+
+
+def test_group_voter_listing_uses_the_group_index(db_session):
+    group_id = db_session.query(Group.groups_id).first()[0]
+
+    plans = _plans(db_session, lambda: voter_service.list_voters(db_session, groups_id=group_id))
+
+    assert any(VOTERS_BY_GROUP in plan for plan in plans), plans
+    assert not any("SCAN voters" in plan for plan in plans), plans
@@ -0,0 +1,129 @@
+# tests/test_replicas.py
+
+import datetime
+import pytest
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from app.db.replicas import REPLICA_SESSION_INFO, ReplicaRouter, reads_replica, wants_read_your_writes
+from app.models import Candidate, Vote, Voter, VoteTally
+from app.models.base import Base
+from app.models.group import Group
+from app.schemas.vote import VoteCast
+from app.services import vote_service
+
+
+async def _database(path, group_name):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(Group.__table__.insert().values(group_name=group_name))
+    return engine
+
+
+@pytest.fixture()
+async def databases(tmp_path):
+    """
+    A primary and a replica told apart by their only group, and a replica
+    whose file can't be opened.
+    """
+    primary = await _database(tmp_path / "primary.db", "Primary")
+    replica = await _database(tmp_path / "replica.db", "Replica")
+    broken = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    yield async_sessionmaker(bind=primary), replica, broken
+    for engine in (primary, replica, broken):
+        await engine.dispose()
+
+
+async def _served_by(router, session_factory) -> str:
+    async with await router.open_session(session_factory) as db:
+        return (await db.execute(select(Group.group_name))).scalar_one()
+
+
+@pytest.mark.anyio
+async def test_reads_skip_an_unreachable_replica(databases):
+    """
+    GIVEN a healthy and an unreachable replica
+    WHEN sessions are opened in turn
+    THEN each should be served by the healthy replica, the other being put in cool-down
+    """
+    session_factory, replica, broken = databases
+    router = ReplicaRouter([replica, broken], cooldown_seconds=60)
+
+    assert await _served_by(router, session_factory) == "Replica"
+    assert await _served_by(router, session_factory) == "Replica"
+    assert router.available() == [replica]
+
+
+@pytest.mark.anyio
+async def test_reads_fall_back_to_the_primary(databases):
+    session_factory, _, broken = databases
+
+    assert await _served_by(ReplicaRouter([broken]), session_factory) == "Primary"
+    assert await _served_by(ReplicaRouter([]), session_factory) == "Primary"
+
+
+def test_read_your_writes_header():
+    assert wants_read_your_writes("true")
+    assert wants_read_your_writes(" 1 ")
+    assert not wants_read_your_writes("false")
+    assert not wants_read_your_writes(None)
+
+
+@pytest.mark.anyio
+async def test_sessions_opened_on_a_replica_are_marked(databases):
+    session_factory, replica, broken = databases
+
+    async with await ReplicaRouter([replica]).open_session(session_factory) as db:
+        assert reads_replica(db) and reads_replica(db.sync_session)
+    async with await ReplicaRouter([broken]).open_session(session_factory) as db:
+        assert not reads_replica(db)
+
+
+def test_results_read_from_a_lagging_replica_are_not_cached(tmp_path):
+    """
+    GIVEN a ballot on the primary that the replica hasn't received yet
+    WHEN the results are read from the replica, and then the replica catches up
+    THEN the next replica read and a primary read should both see the ballot
+    """
+    engines = {}
+    for name in ("primary", "replica"):
+        engines[name] = create_engine(f"sqlite:///{tmp_path / f'{name}.db'}")
+        Base.metadata.create_all(engines[name])
+        with Session(engines[name]) as db:
+            group = Group(group_name="North")
+            db.add_all([
+                Voter(voter_name="V", voter_phone="0501000001", group=group),
+                Vote(
+                    vote_title="Council",
+                    vote_date=datetime.datetime(2026, 1, 1),
+                    candidates=[Candidate(candidate_name="A", group=group)],
+                ),
+            ])
+            db.commit()
+
+    def primary():
+        return Session(engines["primary"])
+
+    def replica():
+        return Session(engines["replica"], info={REPLICA_SESSION_INFO: True})
+
+    with primary() as db:
+        vote_service.cast_vote(db, 1, VoteCast(voter_phone="0501000001", candidate_id=1))
+    with replica() as db:
+        assert vote_service.get_vote_results(db, 1).total_votes == 0
+
+    # Replication catches up
+    with engines["replica"].begin() as conn:
+        conn.execute(VoteTally.__table__.insert().values(
+            votes_id=1, groups_id=1, candidates_id=1, slot=1, vote_count=1
+        ))
+
+    with replica() as db:
+        assert vote_service.get_vote_results(db, 1).total_votes == 1
+    with primary() as db:
+        assert vote_service.get_vote_results(db, 1).total_votes == 1
+    for engine in engines.values():
+        engine.dispose()
@@ -0,0 +1,50 @@
+# tests/test_results_cache.py
+
+from app.schemas.vote import VoteResult
+from app.services.results_cache import ResultsCache
+
+
+def _result(title: str) -> VoteResult:
+    return VoteResult(vote_title=title, total_votes=0, breakdown=[])
+
+
+def test_entry_is_served_until_its_vote_is_bumped():
+    cache = ResultsCache(max_entries=10)
+    key = ((1, 2), None)
+    cache.put(key, cache.versions(key[0]), _result("both"))
+
+    assert cache.get(key).vote_title == "both"
+    cache.bump(3)
+    assert cache.get(key) is not None
+    cache.bump(2)
+    assert cache.get(key) is None
+    assert cache.stats() == {"entries": 0, "hits": 2, "misses": 1}
+
+
+def test_result_computed_before_a_bump_is_not_served():
+    cache = ResultsCache(max_entries=10)
+    key = ((1,), 5)
+    versions = cache.versions(key[0])
+    cache.bump(1)  # a ballot lands while the results are being computed
+    cache.put(key, versions, _result("stale"))
+
+    assert cache.get(key) is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResultsCache(max_entries=2)
+    for vote_id in (1, 2):
+        cache.put(((vote_id,), None), (0,), _result(str(vote_id)))
+    cache.get(((1,), None))
+    cache.put(((3,), None), (0,), _result("3"))
+
+    assert cache.get(((2,), None)) is None
+    assert cache.get(((1,), None)) is not None
+    assert cache.get(((3,), None)) is not None
+
+
+def test_ttl_bounds_staleness():
+    cache = ResultsCache(max_entries=10, ttl_seconds=0)
+    cache.put(((1,), None), (0,), _result("1"))
+
+    assert cache.get(((1,), None)) is None
@@ -0,0 +1,121 @@
+# tests/test_results_stream.py
+
+import asyncio
+import datetime
+import pytest
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models.base import Base
+from app.models.group import Group
+from app.models.candidate import Candidate
+from app.models.voter import Voter
+from app.models.vote import Vote
+from app.schemas.vote import CandidateResult, VoteCast, VoteResult, VoteResultDelta
+from app.services import vote_service
+from app.services.results_stream import ResultsBroadcaster, diff_results, needs_snapshot
+
+
+def _result(*counts: tuple[int, int]) -> VoteResult:
+    return VoteResult(
+        vote_id=1,
+        vote_title="Stream",
+        total_votes=sum(count for _, count in counts),
+        breakdown=[
+            CandidateResult(candidate_id=cid, candidate_name=f"C{cid}", vote_count=count)
+            for cid, count in counts
+        ],
+    )
+
+
+def test_diff_results_lists_changed_candidates_only():
+    delta = diff_results(_result((1, 5), (2, 3)), _result((1, 5), (2, 4), (3, 1)))
+
+    assert delta.total_votes == 10
+    assert [(c.candidate_id, c.vote_count) for c in delta.changed] == [(2, 4), (3, 1)]
+    assert diff_results(_result((1, 5)), _result((1, 5))) is None
+    assert needs_snapshot(_result((1, 5), (2, 3)), _result((1, 5)))
+
+
+async def _stream_database(path):
+    """
+    An aiosqlite database with one vote event, one candidate and one voter,
+    and the event's (empty) results.
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+    async with session_factory() as db:
+        group = Group(group_name="Stream Group")
+        candidate = Candidate(candidate_name="Streamed", group=group)
+        db.add_all([
+            group,
+            candidate,
+            Voter(voter_name="Viewer", voter_phone="0508888888", group=group),
+            Vote(vote_title="Stream Vote", candidates=[candidate], vote_date=datetime.datetime.now(datetime.UTC)),
+        ])
+        await db.commit()
+        initial = await vote_service.get_vote_results_async(db, 1)
+
+    return engine, session_factory, initial
+
+
+@pytest.mark.anyio
+async def test_broadcaster_fans_out_one_update_per_change(tmp_path):
+    """
+    GIVEN two viewers subscribed to the same vote event
+    WHEN a ballot is cast
+    THEN both should get the snapshot and then the same delta
+    """
+    engine, session_factory, initial = await _stream_database(tmp_path / "stream.db")
+    broadcaster = ResultsBroadcaster(session_factory, interval_ms=10, refresh_seconds=60)
+    viewers = [broadcaster.subscribe((1, None), initial) for _ in range(2)]
+    snapshots = [await anext(viewer) for viewer in viewers]
+    assert all(isinstance(s, VoteResult) and s.total_votes == 0 for s in snapshots)
+
+    async with session_factory() as db:
+        await vote_service.cast_vote_async(db, 1, VoteCast(voter_phone="0508888888", candidate_id=1))
+
+    deltas = await asyncio.wait_for(asyncio.gather(*(anext(viewer) for viewer in viewers)), timeout=5)
+    for delta in deltas:
+        assert isinstance(delta, VoteResultDelta)
+        assert delta.total_votes == 1
+        assert [(c.candidate_id, c.vote_count) for c in delta.changed] == [(1, 1)]
+
+    for viewer in viewers:
+        await viewer.aclose()
+    assert broadcaster._streams == {}
+    await engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_broadcaster_keeps_streaming_after_failed_updates(tmp_path):
+    """
+    GIVEN a stream whose first results queries fail
+    WHEN a ballot is cast
+    THEN the producer should keep retrying and still deliver the delta
+    """
+    engine, session_factory, initial = await _stream_database(tmp_path / "flaky.db")
+    failures = []
+
+    def flaky_session():
+        if len(failures) < 2:
+            failures.append(1)
+            raise RuntimeError("database unavailable")
+        return session_factory()
+
+    broadcaster = ResultsBroadcaster(flaky_session, interval_ms=10, refresh_seconds=0)
+    viewer = broadcaster.subscribe((1, None), initial)
+    assert (await anext(viewer)).total_votes == 0
+
+    async with session_factory() as db:
+        await vote_service.cast_vote_async(db, 1, VoteCast(voter_phone="0508888888", candidate_id=1))
+
+    delta = await asyncio.wait_for(anext(viewer), timeout=5)
+    assert len(failures) == 2
+    assert isinstance(delta, VoteResultDelta) and delta.total_votes == 1
+
+    await viewer.aclose()
+    await engine.dispose()
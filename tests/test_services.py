@@ -6,17 +6,18 @@ import datetime
 import pytest
 
 # SQLAlchemy imports
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 # App-specific imports
 # Base for DB creation
 from app.models.base import Base
 # All services we are testing
-from app.services import group_service, candidate_service, voter_service, vote_service
+from app.services import group_service, candidate_service, voter_service, vote_service, tally_service
 # All schemas needed for tests
 from app.schemas.group import GroupCreate
 from app.schemas.candidate import CandidateCreate
+from app.schemas.voter import VoterCreate
 from app.schemas.vote import VoteEventCreate, VoteCast
 # All models needed for test data setup
 from app.models.group import Group
@@ -24,6 +25,7 @@ from app.models.candidate import Candidate
 from app.models.voter import Voter
 from app.models.vote import Vote
 from app.models.voter_vote import VoterVote
+from app.models.vote_tally import VoteTally
 
 
 # --- Test Database Setup ---
@@ -108,6 +110,37 @@ def test_bulk_create_voters_from_csv(db_session):
     assert voters_in_db[0].voter_name == "Alice"
 
 
+def test_list_voters_pages_with_keyset_cursors(db_session):
+    """
+    GIVEN voters in two groups
+    WHEN they are listed two at a time, filtered by group and phone prefix
+    THEN the pages should follow each other without gaps and end with no cursor
+    """
+    group_a, group_b = Group(group_name="A"), Group(group_name="B")
+    db_session.add_all([group_a, group_b])
+    db_session.add_all(
+        Voter(voter_name=f"V{i}", voter_phone=f"05{i % 2}{i:07d}", group=group_a if i < 5 else group_b)
+        for i in range(8)
+    )
+    db_session.commit()
+
+    pages, cursor = [], None
+    while True:
+        page = voter_service.list_voters(db=db_session, limit=2, cursor=cursor, groups_id=group_a.groups_id)
+        pages.append([v.voter_name for v in page.items])
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert pages == [["V0", "V1"], ["V2", "V3"], ["V4"]]
+
+    by_prefix = voter_service.list_voters(db=db_session, phone_prefix="051")
+    assert [v.voter_name for v in by_prefix.items] == ["V1", "V3", "V5", "V7"]
+    assert by_prefix.next_cursor is None
+
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        voter_service.list_voters(db=db_session, cursor="not-a-cursor")
+
+
 def test_create_vote_event(db_session):
     """
     GIVEN a vote event schema with valid candidate IDs
@@ -178,4 +211,370 @@ def test_cast_vote_prevents_double_voting(db_session):
     vote_cast_schema = VoteCast(voter_phone="999888777", candidate_id=candidate.candidates_id)
 
     with pytest.raises(ValueError, match="already voted"):
-        vote_service.cast_vote(db=db_session, vote_id=vote_event.votes_id, vote_cast=vote_cast_schema)
\ No newline at end of file
+        vote_service.cast_vote(db=db_session, vote_id=vote_event.votes_id, vote_cast=vote_cast_schema)
+
+@pytest.fixture()
+def ballot_setup(db_session):
+    """
+    A group with one registered voter and a vote event with two candidates.
+    """
+    group = Group(group_name="Ballot Group")
+    voter = Voter(voter_name="Ballot Voter", voter_phone="0501234567", group=group)
+    candidate_a = Candidate(candidate_name="Candidate A", group=group)
+    candidate_b = Candidate(candidate_name="Candidate B", group=group)
+    vote_event = Vote(
+        vote_title="Ballot Vote",
+        candidates=[candidate_a, candidate_b],
+        vote_date=datetime.datetime.now(datetime.UTC)
+    )
+    db_session.add_all([group, voter, candidate_a, candidate_b, vote_event])
+    db_session.commit()
+    return voter, candidate_a, candidate_b, vote_event
+
+
+def test_cast_vote_returns_inserted_columns(db_session, ballot_setup):
+    """
+    GIVEN a registered voter and a vote event
+    WHEN cast_vote runs through the single-statement fast path
+    THEN the inserted row's columns should be returned and persisted
+    """
+    voter, candidate_a, _, vote_event = ballot_setup
+
+    vote_record = vote_service.cast_vote(
+        db=db_session,
+        vote_id=vote_event.votes_id,
+        vote_cast=VoteCast(voter_phone="0501234567", candidate_id=candidate_a.candidates_id),
+    )
+
+    assert vote_record.voters_votes_id is not None
+    assert vote_record.votes_id == vote_event.votes_id
+    assert vote_record.voters_id == voter.voters_id
+    assert vote_record.candidates_id == candidate_a.candidates_id
+    assert db_session.query(VoterVote).count() == 1
+
+
+def test_cast_vote_duplicate_detected_by_constraint(db_session, ballot_setup):
+    """
+    GIVEN a voter who already cast a ballot
+    WHEN they try to vote again for a different candidate
+    THEN the unique constraint should surface as "already voted" and the first ballot stands
+    """
+    _, candidate_a, candidate_b, vote_event = ballot_setup
+    vote_service.cast_vote(
+        db=db_session,
+        vote_id=vote_event.votes_id,
+        vote_cast=VoteCast(voter_phone="0501234567", candidate_id=candidate_a.candidates_id),
+    )
+
+    with pytest.raises(ValueError, match="already voted"):
+        vote_service.cast_vote(
+            db=db_session,
+            vote_id=vote_event.votes_id,
+            vote_cast=VoteCast(voter_phone="0501234567", candidate_id=candidate_b.candidates_id),
+        )
+
+    ballots = db_session.query(VoterVote).all()
+    assert len(ballots) == 1
+    assert ballots[0].candidates_id == candidate_a.candidates_id
+
+
+def test_cast_vote_unknown_phone(db_session, ballot_setup):
+    """
+    GIVEN a phone number that is not on the voter roll
+    WHEN cast_vote is called
+    THEN it should raise a "not found" ValueError and store nothing
+    """
+    _, candidate_a, _, vote_event = ballot_setup
+
+    with pytest.raises(ValueError, match="not found"):
+        vote_service.cast_vote(
+            db=db_session,
+            vote_id=vote_event.votes_id,
+            vote_cast=VoteCast(voter_phone="0000000000", candidate_id=candidate_a.candidates_id),
+        )
+
+    assert db_session.query(VoterVote).count() == 0
+
+
+def test_cast_votes_many_reports_per_item(db_session, ballot_setup):
+    """
+    GIVEN a batch with a valid cast, an in-batch duplicate and an unknown phone
+    WHEN cast_votes_many is called
+    THEN each item should get its own result and only the valid ballot is stored
+    """
+    voter, candidate_a, candidate_b, vote_event = ballot_setup
+    casts = [
+        (vote_event.votes_id, VoteCast(voter_phone="0501234567", candidate_id=candidate_a.candidates_id)),
+        (vote_event.votes_id, VoteCast(voter_phone="0501234567", candidate_id=candidate_b.candidates_id)),
+        (vote_event.votes_id, VoteCast(voter_phone="0000000000", candidate_id=candidate_a.candidates_id)),
+    ]
+
+    results = vote_service.cast_votes_many(db=db_session, casts=casts)
+
+    assert results[0].voters_id == voter.voters_id
+    assert results[0].candidates_id == candidate_a.candidates_id
+    assert isinstance(results[1], ValueError) and "already voted" in str(results[1])
+    assert isinstance(results[2], ValueError) and "not found" in str(results[2])
+    assert db_session.query(VoterVote).count() == 1
+
+    # A second batch hits the unique constraint instead of the in-batch check
+    again = vote_service.cast_votes_many(db=db_session, casts=casts[:1])
+    assert isinstance(again[0], ValueError) and "already voted" in str(again[0])
+
+
+def test_cast_vote_batch_reports_status_per_item(db_session, ballot_setup):
+    """
+    GIVEN a batch with a valid ballot, a repeat, an unknown phone and a foreign candidate
+    WHEN cast_vote_batch is called
+    THEN each item should get its status and the counts should add up
+    """
+    voter, candidate_a, candidate_b, vote_event = ballot_setup
+    casts = [
+        VoteCast(voter_phone="0501234567", candidate_id=candidate_a.candidates_id),
+        VoteCast(voter_phone="0501234567", candidate_id=candidate_b.candidates_id),
+        VoteCast(voter_phone="0000000000", candidate_id=candidate_a.candidates_id),
+        VoteCast(voter_phone="0501234567", candidate_id=999),
+    ]
+
+    batch = vote_service.cast_vote_batch(db=db_session, vote_id=vote_event.votes_id, casts=casts)
+
+    assert [item.status for item in batch.results] == ["accepted", "duplicate", "unknown_voter", "invalid"]
+    assert batch.results[0].voters_votes_id == db_session.query(VoterVote).one().voters_votes_id
+    assert (batch.accepted, batch.duplicates, batch.unknown_voters, batch.invalid) == (1, 1, 1, 1)
+
+    with pytest.raises(ValueError, match="Vote event not found"):
+        vote_service.cast_vote_batch(db=db_session, vote_id=vote_event.votes_id + 1, casts=casts)
+
+
+def test_vote_results_read_maintained_tallies(db_session, ballot_setup):
+    """
+    GIVEN ballots cast through both the single and the batch cast paths
+    WHEN results are requested, overall and by group
+    THEN they should come from vote_tallies and match a rebuild from voters_votes
+    """
+    _, candidate_a, candidate_b, vote_event = ballot_setup
+    other_group = Group(group_name="Other Group")
+    db_session.add_all([
+        other_group,
+        Voter(voter_name="Second", voter_phone="0502222222", group=other_group),
+        Voter(voter_name="Third", voter_phone="0503333333", group=other_group),
+    ])
+    db_session.commit()
+
+    vote_service.cast_vote(
+        db=db_session,
+        vote_id=vote_event.votes_id,
+        vote_cast=VoteCast(voter_phone="0501234567", candidate_id=candidate_a.candidates_id),
+    )
+    vote_service.cast_votes_many(db=db_session, casts=[
+        (vote_event.votes_id, VoteCast(voter_phone="0502222222", candidate_id=candidate_b.candidates_id)),
+        (vote_event.votes_id, VoteCast(voter_phone="0503333333", candidate_id=candidate_b.candidates_id)),
+    ])
+
+    results = vote_service.get_vote_results(db=db_session, vote_id=vote_event.votes_id)
+    assert results.total_votes == 3
+    assert [(r.candidate_id, r.vote_count) for r in results.breakdown] == [
+        (candidate_b.candidates_id, 2),
+        (candidate_a.candidates_id, 1),
+    ]
+
+    by_group = vote_service.get_vote_results(
+        db=db_session, vote_id=vote_event.votes_id, group_id=other_group.groups_id
+    )
+    assert by_group.total_votes == 2
+
+    counters = sorted(
+        (t.votes_id, t.groups_id, t.candidates_id, t.slot, t.vote_count)
+        for t in db_session.query(VoteTally).all()
+    )
+    assert tally_service.rebuild_vote_tallies(db=db_session) == len(counters)
+    assert counters == sorted(
+        (t.votes_id, t.groups_id, t.candidates_id, t.slot, t.vote_count)
+        for t in db_session.query(VoteTally).all()
+    )
+
+
+def test_repeated_result_polls_hit_the_cache(db_session, ballot_setup):
+    """
+    GIVEN results that were computed once
+    WHEN they are polled again with no new ballot, and then after a cast
+    THEN the repeat poll should run no SQL and the post-cast poll should see the ballot
+    """
+    _, candidate_a, _, vote_event = ballot_setup
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+
+    first = vote_service.get_vote_results(db=db_session, vote_id=vote_event.votes_id)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        again = vote_service.get_vote_results(db=db_session, vote_id=vote_event.votes_id)
+        assert statements == []
+        assert again is first
+
+        vote_service.cast_vote(
+            db=db_session,
+            vote_id=vote_event.votes_id,
+            vote_cast=VoteCast(voter_phone="0501234567", candidate_id=candidate_a.candidates_id),
+        )
+        after_cast = vote_service.get_vote_results(db=db_session, vote_id=vote_event.votes_id)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert first.total_votes == 0
+    assert after_cast.total_votes == 1
+
+
+def test_cast_vote_validated_against_vote_registry(db_session, ballot_setup):
+    """
+    GIVEN a vote event already loaded into the vote registry
+    WHEN a ballot names a candidate from outside the event, or an unknown event
+    THEN it should be rejected without querying the database
+    """
+    _, candidate_a, _, vote_event = ballot_setup
+    outsider = Candidate(candidate_name="Outsider", group=candidate_a.group)
+    db_session.add(outsider)
+    db_session.commit()
+    outsider_id, vote_id = outsider.candidates_id, vote_event.votes_id
+
+    candidates = vote_service.get_candidates_for_vote(db=db_session, vote_id=vote_id)
+    assert sorted(c.candidate_name for c in candidates) == ["Candidate A", "Candidate B"]
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        with pytest.raises(ValueError, match="not part of this vote event"):
+            vote_service.cast_vote(
+                db=db_session,
+                vote_id=vote_id,
+                vote_cast=VoteCast(voter_phone="0501234567", candidate_id=outsider_id),
+            )
+        assert statements == []
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    with pytest.raises(ValueError, match="Vote event not found"):
+        vote_service.cast_vote(
+            db=db_session,
+            vote_id=vote_id + 1,
+            vote_cast=VoteCast(voter_phone="0501234567", candidate_id=outsider_id),
+        )
+    assert db_session.query(VoterVote).count() == 0
+
+
+def test_results_matrix_covers_all_groups_in_one_query(db_session, ballot_setup):
+    """
+    GIVEN ballots from voters in two groups
+    WHEN the results matrix is requested
+    THEN one aggregate query should give per-group counts with row and column totals
+    """
+    voter, candidate_a, candidate_b, vote_event = ballot_setup
+    other_group = Group(group_name="Other Group")
+    db_session.add_all([
+        other_group,
+        Voter(voter_name="Second", voter_phone="0502222222", group=other_group),
+    ])
+    db_session.commit()
+    ids = (voter.groups_id, other_group.groups_id, candidate_a.candidates_id, candidate_b.candidates_id)
+    vote_id = vote_event.votes_id
+    vote_service.cast_votes_many(db=db_session, casts=[
+        (vote_id, VoteCast(voter_phone="0501234567", candidate_id=candidate_b.candidates_id)),
+        (vote_id, VoteCast(voter_phone="0502222222", candidate_id=candidate_b.candidates_id)),
+    ])
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        matrix = vote_service.get_results_matrix(db=db_session, vote_ids=[vote_id])
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    group_id, other_group_id, candidate_a_id, candidate_b_id = ids
+    assert len(statements) == 1
+    assert [g.group_id for g in matrix.groups] == [group_id, other_group_id]
+    assert [(r.candidate_id, r.counts, r.total) for r in matrix.rows] == [
+        (candidate_b_id, [1, 1], 2),
+        (candidate_a_id, [0, 0], 0),
+    ]
+    assert matrix.group_totals == [1, 1]
+    assert matrix.total_votes == 2
+
+    with pytest.raises(ValueError, match="not found"):
+        vote_service.get_results_matrix(db=db_session, vote_ids=[vote_id, vote_id + 1])
+
+
+def test_combine_vote_results_validates_candidates_in_sql(db_session, ballot_setup):
+    """
+    GIVEN two events with the same candidates and one with a different set
+    WHEN their results are combined
+    THEN matching events should be combined in two queries and a mismatch rejected
+    """
+    _, candidate_a, candidate_b, vote_event = ballot_setup
+    now = datetime.datetime.now(datetime.UTC)
+    twin = Vote(vote_title="Twin Vote", candidates=[candidate_b, candidate_a], vote_date=now)
+    partial = Vote(vote_title="Partial Vote", candidates=[candidate_a], vote_date=now)
+    db_session.add_all([twin, partial])
+    db_session.commit()
+    vote_ids = [vote_event.votes_id, twin.votes_id]
+    vote_service.cast_vote(
+        db=db_session,
+        vote_id=twin.votes_id,
+        vote_cast=VoteCast(voter_phone="0501234567", candidate_id=candidate_a.candidates_id),
+    )
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        combined = vote_service.combine_vote_results(db=db_session, vote_ids=vote_ids)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert len(statements) == 2
+    assert combined.vote_title == "Combined Results: Ballot Vote & Twin Vote"
+    assert combined.total_votes == 1
+
+    with pytest.raises(ValueError, match=f"Vote ID {partial.votes_id} has a different set"):
+        vote_service.combine_vote_results(db=db_session, vote_ids=[*vote_ids, partial.votes_id])
+    with pytest.raises(ValueError, match="invalid"):
+        vote_service.combine_vote_results(db=db_session, vote_ids=[*vote_ids, 999])
+
+
+def test_import_voters_from_csv_reports_per_row(db_session):
+    """
+    GIVEN a CSV with new voters, an already registered phone, a repeated phone and bad rows
+    WHEN import_voters_from_csv runs with a small chunk size
+    THEN good rows should be inserted and the rest skipped or rejected with their line numbers
+    """
+    group = Group(group_name="Import Group")
+    db_session.add(group)
+    db_session.commit()
+    group_id = group.groups_id
+    voter_service.create_voter(
+        db=db_session,
+        voter=VoterCreate(voter_name="Existing", voter_phone="0500000001", groups_id=group_id),
+    )
+
+    csv_content = (
+        "voter_name,voter_phone,groups_id\n"
+        f"Alice,0500000002,{group_id}\n"      # line 2: inserted
+        f"Existing,0500000001,{group_id}\n"   # line 3: already registered
+        f"Alice again,0500000002,{group_id}\n"  # line 4: repeated in the file (next chunk)
+        "Bob,0500000003,not-a-number\n"      # line 5: rejected
+        "Carol,0500000004,999\n"             # line 6: unknown group
+        "\n"
+        "Dan,0500000005\n"                   # line 8: missing column
+        f"Erin,0500000006,{group_id}\n"       # line 9: inserted
+    )
+
+    report = voter_service.import_voters_from_csv(
+        db=db_session, csv_file=io.BytesIO(csv_content.encode("utf-8")), chunk_size=2
+    )
+
+    assert report.inserted == 2
+    assert report.skipped == 2
+    assert report.rejected == 3
+    assert [reject.line for reject in report.rejects] == [5, 6, 8]
+    phones = {v.voter_phone for v in db_session.query(Voter).all()}
+    assert phones == {"0500000001", "0500000002", "0500000006"}
@@ -0,0 +1,77 @@
+# tests/test_slow_query_log.py
+
+import logging
+
+import pytest
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.request_context import current_request
+from app.db import slow_query_log
+from app.db.slow_query_log import SlowQueryLog, fingerprint
+from app.models.base import Base
+from app.schemas.group import GroupCreate
+from app.services import group_service
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture()
+def log_records():
+    # On the module's logger: the app's loggers don't propagate once
+    # LOGGING_CONFIG is applied
+    handler = _ListHandler()
+    slow_query_log.logger.addHandler(handler)
+    slow_query_log.logger.setLevel(logging.WARNING)
+    yield handler.records
+    slow_query_log.logger.removeHandler(handler)
+
+
+def test_fingerprint_ignores_values_and_list_lengths():
+    assert fingerprint("SELECT * FROM t WHERE id IN (?, ?, ?)") == fingerprint(
+        "SELECT *\n  FROM t WHERE id IN (?)"
+    )
+    assert fingerprint("SELECT a FROM t WHERE id = %(id_1)s") == fingerprint(
+        "SELECT a FROM t WHERE id = %(id_2)s"
+    )
+    assert fingerprint("SELECT a FROM t") != fingerprint("SELECT b FROM t")
+
+
+def test_slow_statements_are_logged_with_caller_request_and_plan(tmp_path, log_records):
+    """
+    GIVEN a slow-query log with a zero threshold and one EXPLAIN per fingerprint
+    WHEN a service lists groups twice during a request
+    THEN each listing should be logged with its caller and request, and explained once
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'slow.db'}")
+    Base.metadata.create_all(bind=engine)
+    SlowQueryLog(threshold_ms=0, explain_limit=1).install(engine)
+    db = sessionmaker(autoflush=False, bind=engine)()
+    group_service.create_group(db, GroupCreate(group_name="Slow Group"))
+    log_records.clear()
+
+    token = current_request.set("GET /api/v1/groups/")
+    try:
+        group_service.list_groups(db)
+        group_service.list_groups(db)
+    finally:
+        current_request.reset(token)
+        db.close()
+        engine.dispose()
+
+    slow = [r.getMessage() for r in log_records if r.getMessage().startswith("Slow query")]
+    plans = [r.getMessage() for r in log_records if r.getMessage().startswith("Plan of slow query")]
+    assert len(slow) == 2
+    assert "in group_service.list_groups" in slow[0]
+    assert "during GET /api/v1/groups/" in slow[0]
+    assert "parameters:" in slow[0]
+    assert len(plans) == 1
+    assert "groups" in plans[0]